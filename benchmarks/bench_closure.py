@@ -0,0 +1,92 @@
+"""
+Hierarchy closure benchmark for the competency-question queries.
+
+Runs the rdfs:subClassOf*/subPropertyOf* queries with and without
+``use_closure`` over an ontology plus a synthetic fleet of typed sensors and
+their observations, and reports the median latency in milliseconds.
+
+    python -m benchmarks.bench_closure --owl owl/orka-inferred.owl --sizes 100000 1000000
+"""
+
+import argparse
+import statistics
+import time
+
+from rdflib import Namespace
+
+from graph_manager.main import GraphManager
+from graph_manager.synthetic import FleetGenerator
+
+SOSA = Namespace("http://www.w3.org/ns/sosa/")
+
+QUERIES = {
+    # eval.ipynb CQ4, CQ5 and CQ6
+    "cq4": """
+        SELECT ?entity ?observedchar ?observeablechar WHERE {
+          ?entity a orka:PhysicalEntity .
+          ?entity orka:hasCharacteristic ?char .
+          ?char a ?observedchar .
+          ?observeablechar rdfs:subPropertyOf* orka:hasObservableCharacteristic
+        }""",
+    "cq5": """
+        SELECT ?sensor ?sensorcharacteristic ?value WHERE {
+          ?robot sosa:hosts ?sensor .
+          ?sensor ?sensorcharacteristic ?value .
+          ?sensorcharacteristic rdfs:subPropertyOf* orka:hasSensorCharacteristic .
+        }""",
+    "cq6": """
+        SELECT ?algorithm ?algorithmcharacteristic ?value WHERE {
+          ?algorithm orka:implementedOn ?robot .
+          ?algorithm ?algorithmcharacteristic ?value .
+          ?algorithmcharacteristic rdfs:subPropertyOf* orka:hasAlgorithmCharacteristic
+        }""",
+    # rpo-evaluation-cq.ipynb style sensor lookup by superclass
+    "sensors": """
+        SELECT ?sensor WHERE {
+          ?sensor rdf:type/rdfs:subClassOf* sosa:Sensor .
+        }""",
+    "sensor_obs": """
+        SELECT ?measurement WHERE {
+          ?measurement orka:madeBySensor ?sensor .
+          ?sensor rdf:type/rdfs:subClassOf+ sosa:Sensor .
+        }""",
+}
+
+
+def build(owl_path, observations, sensors=200, seed=0):
+    gm = GraphManager(owl_path=owl_path)
+    gm.graph.bind("sosa", SOSA)
+    FleetGenerator(gm, robots=1, sensors_per_robot=sensors, seed=seed).populate(observations)
+    return gm
+
+
+def time_query(gm, query, use_closure, repeat):
+    rows = len(gm.query(query, use_closure=use_closure))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(gm.query(query, use_closure=use_closure))
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--owl", default="owl/orka-inferred.owl")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'observations':>12} {'query':<14}{'rows':>8}{'plain ms':>12}{'closure ms':>12}{'speedup':>9}")
+    for size in args.sizes:
+        gm = build(args.owl, size)
+        for name, query in QUERIES.items():
+            plain, rows = time_query(gm, query, False, args.repeat)
+            closed, closure_rows = time_query(gm, query, True, args.repeat)
+            if rows != closure_rows:
+                print(f"Note: {name} returned {rows} rows without and {closure_rows} with the closure")
+            print(f"{size:>12} {name:<14}{rows:>8}{plain:>12.2f}{closed:>12.2f}{plain / closed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Per-instance color statistics benchmark.
+
+Times color_table and dominant_colors (histogram only and k-means refined)
+on the citrus example image split into a growing number of instances.
+
+    python -m benchmarks.bench_color_stats --repeat 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+USE_CASE = Path(__file__).resolve().parent.parent / "evaluation" / "use-case"
+sys.path.insert(0, str(USE_CASE))
+
+from color_stats import color_table, dominant_colors, label_map  # noqa: E402
+
+
+def make_labels(shape, instances):
+    """Label map splitting the frame into ``instances`` vertical stripes."""
+    h, w = shape
+    masks = np.zeros((instances, h, w), dtype=bool)
+    for i, cols in enumerate(np.array_split(np.arange(w), instances)):
+        masks[i, :, cols] = True
+    return label_map(masks)
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--image", type=Path, default=USE_CASE / "citrus.jpg")
+    args = parser.parse_args()
+
+    image = np.asarray(Image.open(args.image).convert("RGB"))
+    cases = [
+        ("color_table", lambda labels: color_table(image, labels=labels)),
+        ("dominant", lambda labels: dominant_colors(image, labels=labels, top_k=2)),
+        ("dominant+refine", lambda labels: dominant_colors(image, labels=labels, top_k=2, refine=True)),
+    ]
+    print(f"{image.shape[1]}x{image.shape[0]} image")
+    print(f"{'instances':<12}" + "".join(f"{name:>18}" for name, _ in cases) + "   (median ms)")
+    for instances in (3, 12, 48):
+        labels = make_labels(image.shape[:2], instances)
+        row = [_median_ms(lambda: fn(labels), args.repeat) for _, fn in cases]
+        print(f"{instances:<12}" + "".join(f"{ms:>18.3f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Competency-question benchmark suite.
+
+Runs the notebook CQs (see competency_questions) against the bundled
+ontologies and, for the ORKA suite, against generated observation graphs of
+increasing size.  Every query gets warm-up runs, then ``--repeat`` timed
+runs that consume the whole result, and one extra run under tracemalloc for
+its allocation peak.  Results are written as a JSON report so that two
+commits can be compared with ``--compare``.
+
+The notebooks time only the ``g.query()`` call, before the result is
+iterated, and print seconds divided by 1000 as "ms"; the numbers here are
+end-to-end milliseconds.
+
+    python -m benchmarks.bench_cq --sizes 0 10000 100000 --output cq.json
+    python -m benchmarks.bench_cq --output new.json --compare cq.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import rdflib
+
+from graph_manager.main import GraphManager
+
+from .bench_closure import build
+from .competency_questions import ORKA_CQS, ORKA_NAMESPACES, RPO_CQS, RPO_NAMESPACES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+ROOT = Path(__file__).resolve().parent.parent
+
+SUITES = {
+    "orka": {
+        "ontology": "owl/orka-inferred.owl",
+        "queries": ORKA_CQS,
+        "namespaces": ORKA_NAMESPACES,
+        "scaled": True,
+    },
+    "rpo": {
+        "ontology": "owl/depracated/rpo.rdf",
+        "queries": RPO_CQS,
+        "namespaces": RPO_NAMESPACES,
+        "scaled": False,
+    },
+}
+
+
+def percentile(samples, q):
+    """Linearly interpolated percentile (``q`` in 0-100) of a sample list."""
+    ordered = sorted(samples)
+    if not ordered:
+        raise ValueError("No samples")
+    position = (len(ordered) - 1) * q / 100.0
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(samples):
+    """Timing summary in milliseconds for samples in seconds."""
+    ms = [s * 1000 for s in samples]
+    return {
+        "min": min(ms),
+        "mean": sum(ms) / len(ms),
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99),
+        "max": max(ms),
+    }
+
+
+def max_rss_kb():
+    """Process memory high-water mark in KiB, or None where unavailable."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def load_suite_graph(suite, size, use_closure=False):
+    """
+    Graph and query function for one suite at one observation count.
+
+    Returns:
+        (run, triples) where ``run(query)`` returns a query result
+    """
+    spec = SUITES[suite]
+    owl_path = str(ROOT / spec["ontology"])
+    namespaces = spec["namespaces"]
+    if spec["scaled"]:
+        gm = build(owl_path, size) if size else GraphManager(owl_path=owl_path)
+        return (lambda q: gm.query(q, use_closure=use_closure, initNs=namespaces)), len(gm.graph) + len(gm.ontology)
+    g = rdflib.Graph()
+    g.parse(owl_path)
+    return (lambda q: g.query(q, initNs=namespaces)), len(g)
+
+
+def time_query(run, query, warmup=1, repeat=10):
+    """
+    Time one query.
+
+    Returns:
+        Dict with the row count, timing summary and tracemalloc peak in bytes
+    """
+    rows = 0
+    for _ in range(warmup):
+        rows = sum(1 for _ in run(query))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(1 for _ in run(query))
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        sum(1 for _ in run(query))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"rows": rows, "ms": summarize(samples), "peak_alloc_bytes": peak}
+
+
+def run_suites(suites, sizes, warmup=1, repeat=10, use_closure=False, log=print):
+    """Run the given suites and return the report dict."""
+    results = []
+    for suite in suites:
+        spec = SUITES[suite]
+        for size in sizes if spec["scaled"] else [0]:
+            start = time.perf_counter()
+            run, triples = load_suite_graph(suite, size, use_closure)
+            load_s = time.perf_counter() - start
+            for name, query in spec["queries"].items():
+                result = time_query(run, query, warmup, repeat)
+                result.update(suite=suite, query=name, observations=size, triples=triples, load_s=load_s)
+                results.append(result)
+                if log is not None:
+                    ms = result["ms"]
+                    log(f"{suite:<6}{name:<6}{size:>9}{result['rows']:>8}"
+                        f"{ms['p50']:>10.2f}{ms['p95']:>10.2f}{ms['p99']:>10.2f}{result['peak_alloc_bytes'] / 1024:>12.0f}")
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "rdflib": rdflib.__version__,
+        "platform": platform.platform(),
+        "settings": {"suites": list(suites), "sizes": list(sizes), "warmup": warmup, "repeat": repeat, "use_closure": use_closure},
+        "max_rss_kb": max_rss_kb(),
+        "results": results,
+    }
+
+
+def compare(base, new, metric="p50"):
+    """
+    Pair up the results of two reports.
+
+    Returns:
+        List of (suite, query, observations, base ms, new ms, new / base)
+    """
+    key = lambda r: (r["suite"], r["query"], r["observations"])
+    old = {key(r): r for r in base["results"]}
+    rows = []
+    for result in new["results"]:
+        previous = old.get(key(result))
+        if previous is None:
+            continue
+        before, after = previous["ms"][metric], result["ms"][metric]
+        rows.append(key(result) + (before, after, after / before if before else float("inf")))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--suites", nargs="+", choices=sorted(SUITES), default=sorted(SUITES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 10000])
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--closure", action="store_true", help="Run with GraphManager.query(use_closure=True)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to compare p50 latencies against")
+    args = parser.parse_args()
+
+    print(f"{'suite':<6}{'query':<6}{'obs':>9}{'rows':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>12}")
+    report = run_suites(args.suites, args.sizes, args.warmup, args.repeat, args.closure)
+    print(f"max RSS: {report['max_rss_kb']} KiB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        print(f"\n{'suite':<6}{'query':<6}{'obs':>9}{'base p50':>10}{'p50':>10}{'ratio':>8}")
+        for suite, name, size, before, after, ratio in compare(base, report):
+            print(f"{suite:<6}{name:<6}{size:>9}{before:>10.2f}{after:>10.2f}{ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
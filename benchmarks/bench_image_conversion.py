@@ -0,0 +1,70 @@
+"""
+ROS image conversion micro-benchmark.
+
+Compares the previous reshape-and-copy conversion against the strided
+NumPy view and the PIL conversion built on it.
+
+    python -m benchmarks.bench_image_conversion --repeat 200
+"""
+
+import argparse
+import statistics
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from orka_ros.image_conversion import ros_image_to_array, ros_image_to_pil
+
+
+def legacy_ros_image_to_pil(msg):
+    """The conversion vision_capture used before, without cv_bridge."""
+    enc = msg.encoding.lower()
+    data = np.frombuffer(msg.data, dtype=np.uint8)
+    if enc in ("bgra8", "rgba8"):
+        img = data.reshape((msg.height, msg.width, 4))[..., :3]
+    else:
+        img = data.reshape((msg.height, msg.width, 3))
+    if enc in ("bgr8", "bgra8"):
+        img = img[..., ::-1]
+    return Image.fromarray(img)
+
+
+def make_msg(width, height, encoding="bgr8"):
+    channels = 4 if encoding.endswith("a8") else 3
+    data = np.random.default_rng(0).integers(0, 256, height * width * channels, dtype=np.uint8)
+    return SimpleNamespace(
+        height=height, width=width, encoding=encoding, step=width * channels, is_bigendian=False, data=data.tobytes()
+    )
+
+
+def _median_ms(fn, msg, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(msg)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--encoding", default="bgr8")
+    args = parser.parse_args()
+
+    cases = [
+        ("legacy -> PIL", legacy_ros_image_to_pil),
+        ("view -> ndarray", ros_image_to_array),
+        ("view -> PIL", ros_image_to_pil),
+    ]
+    print(f"{'size':<12}" + "".join(f"{name:>18}" for name, _ in cases) + "   (median ms)")
+    for width, height in ((640, 480), (1920, 1080)):
+        msg = make_msg(width, height, args.encoding)
+        row = [_median_ms(fn, msg, args.repeat) for _, fn in cases]
+        print(f"{f'{width}x{height}':<12}" + "".join(f"{ms:>18.3f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Sustained-rate image capture benchmark.
+
+Feeds frames into add_vision_sensor_observation at a fixed rate and reports
+how long each call blocks the caller, with synchronous writes and with an
+AsyncImageWriter, plus how long the writer needs to drain afterwards.
+
+    python -m benchmarks.bench_image_writer --rate 30 --seconds 5
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from graph_manager.main import GraphManager
+from orka_ros.image_writer import AsyncImageWriter
+from orka_ros.vision_sensor import add_vision_sensor_observation, initiate_sensor
+
+
+def run(frames, rate, image_dir, writer=None):
+    gm = GraphManager()
+    initiate_sensor(gm, "vision_sensor", "/camera/image")
+    period = 1.0 / rate
+    latencies = []
+    behind = 0
+    next_tick = time.perf_counter()
+    start = next_tick
+    for i, frame in enumerate(frames):
+        call = time.perf_counter()
+        add_vision_sensor_observation(
+            gm, "vision_sensor", f"obs_{i}", f"meas_{i}", f"res_{i}",
+            image=frame, image_dir=image_dir, writer=writer,
+        )
+        latencies.append(time.perf_counter() - call)
+        next_tick += period
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            behind += 1
+    produced = time.perf_counter()
+    if writer is not None:
+        writer.flush()
+    drained = time.perf_counter()
+    return latencies, behind, produced - start, drained - produced
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    count = int(args.rate * args.seconds)
+    frames = [
+        Image.fromarray(rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8))
+        for _ in range(min(count, 16))
+    ]
+    frames = [frames[i % len(frames)] for i in range(count)]
+
+    print(f"{count} frames of {args.width}x{args.height} at {args.rate:g} Hz")
+    print(f"{'mode':<10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'late ticks':>12}{'achieved Hz':>13}{'drain s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [("sync", None), ("async", AsyncImageWriter(max_workers=args.workers))]
+        for name, writer in cases:
+            latencies, behind, produce_s, drain_s = run(frames, args.rate, tmp, writer)
+            if writer is not None:
+                writer.close()
+            ms = sorted(l * 1e3 for l in latencies)
+            print(
+                f"{name:<10}{statistics.median(ms):>10.2f}{ms[int(0.95 * (len(ms) - 1))]:>10.2f}{ms[-1]:>10.2f}"
+                f"{behind:>12}{count / (produce_s + drain_s):>13.1f}{drain_s:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Observation ingest throughput benchmark.
+
+Reports observations/sec for per-call update_graph_with_observation and for
+add_observations at increasing batch sizes.
+
+    python -m benchmarks.bench_ingest --total 20000
+"""
+
+import argparse
+import time
+
+from graph_manager.main import GraphManager
+
+
+def make_records(start, count, sensor="lidar_1"):
+    return [
+        {
+            "observation_name": f"obs_{i}",
+            "measurement_name": f"meas_{i}",
+            "sensor": sensor,
+            "result": f"res_{i}",
+            "procedure_name": "synthetic_procedure",
+            "entity_name": f"entity_{i % 50}",
+            "characteristic_name": "distance",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def bench_single(total):
+    gm = GraphManager()
+    records = make_records(0, total)
+    sensor = gm.add_sensor("lidar_1", gm.ORKA.Lidar)
+    start = time.perf_counter()
+    for record in records:
+        record["sensor"] = sensor
+        gm.update_graph_with_observation(**record)
+    return total / (time.perf_counter() - start)
+
+
+def bench_batch(total, batch_size):
+    gm = GraphManager()
+    batches = [make_records(i, min(batch_size, total - i)) for i in range(0, total, batch_size)]
+    start = time.perf_counter()
+    for batch in batches:
+        gm.add_observations(batch)
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=int, default=20000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'mode':<28}{'obs/sec':>12}")
+    print(f"{'update_graph_with_observation':<28}{bench_single(args.total):>12.0f}")
+    for batch_size in args.batch_sizes:
+        rate = bench_batch(args.total, batch_size)
+        print(f"{'add_observations x' + str(batch_size):<28}{rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Persistence latency versus session length.
+
+At each session length, times one full save_graph rewrite against appending
+one observation to the journal (including a forced fsync).
+
+    python -m benchmarks.bench_persistence --lengths 100 1000 10000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_ingest import make_records
+from graph_manager.main import GraphManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--appends", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        gm = GraphManager()
+        journal = gm.enable_journal(tmp / "session.nq", fsync_every=0)
+        added = 0
+
+        print(f"{'observations':>12}{'triples':>10}{'save_graph ms':>16}{'journal ms':>12}{'journal+fsync ms':>18}")
+        for length in sorted(args.lengths):
+            if length > added:
+                gm.add_observations(make_records(added, length - added))
+                added = length
+
+            start = time.perf_counter()
+            gm.save_graph(str(tmp / "session.ttl"))
+            save_ms = (time.perf_counter() - start) * 1e3
+
+            start = time.perf_counter()
+            for record in make_records(added, args.appends):
+                gm.add_observations([record])
+            journal_ms = (time.perf_counter() - start) * 1e3 / args.appends
+            added += args.appends
+
+            start = time.perf_counter()
+            for record in make_records(added, args.appends):
+                gm.add_observations([record])
+                journal.sync()
+            synced_ms = (time.perf_counter() - start) * 1e3 / args.appends
+            added += args.appends
+
+            print(f"{length:>12}{len(gm.graph):>10}{save_ms:>16.2f}{journal_ms:>12.3f}{synced_ms:>18.3f}")
+        gm.close_journal()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Per-observation cost of keeping inferences current.
+
+Streams a synthetic fleet into a GraphManager in batches and compares no
+reasoning, incremental materialization (enable_reasoning) and re-running
+the materializer over the whole graph after every batch, which is what a
+from-scratch reasoner run amounts to.
+
+    python -m benchmarks.bench_reasoning --observations 20000 --batch-size 1000
+"""
+
+import argparse
+import time
+
+import rdflib
+
+from graph_manager.main import GraphManager
+from graph_manager.materializer import Materializer
+from graph_manager.synthetic import FleetGenerator
+
+
+def run(mode, observations, batch_size):
+    gm = GraphManager()
+    if mode == "incremental":
+        gm.enable_reasoning()
+    generator = FleetGenerator(gm)
+    gm.graph.addN((s, p, o, gm.graph) for s, p, o in generator.static_triples())
+    inferred = 0
+    start = time.perf_counter()
+    for batch in generator.batches(observations, batch_size):
+        gm.add_observations(batch)
+        if mode == "full":
+            materializer = Materializer([gm.ontology], gm.graph, rdflib.Graph())
+            inferred = materializer.materialize(list(gm.graph))
+    elapsed = time.perf_counter() - start
+    if mode == "incremental":
+        inferred = len(gm.inferred)
+    return elapsed, inferred
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--observations", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--modes", nargs="+", default=["none", "incremental", "full"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'seconds':>10}{'us/obs':>10}{'overhead us/obs':>17}{'inferred':>10}")
+    baseline = None
+    for mode in args.modes:
+        elapsed, inferred = run(mode, args.observations, args.batch_size)
+        per_obs = elapsed / args.observations * 1e6
+        if mode == "none":
+            baseline = per_obs
+        overhead = f"{per_obs - baseline:>17.1f}" if baseline is not None else f"{'':>17}"
+        print(f"{mode:<12}{elapsed:>10.2f}{per_obs:>10.1f}{overhead}{inferred:>10}")
+
+
+if __name__ == "__main__":
+    main()
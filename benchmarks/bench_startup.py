@@ -0,0 +1,69 @@
+"""
+GraphManager start-up benchmark.
+
+Compares a cold RDF/XML parse, a warm load from the on-disk snapshot and
+reuse of the in-process ontology.
+
+    python -m benchmarks.bench_startup --repeat 10
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from graph_manager import ontology
+from graph_manager.main import GraphManager
+
+
+def _time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--owl", default=str(ontology.DEFAULT_ONTOLOGY_PATH))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_dir = Path(cache_dir)
+
+        def cold():
+            ontology.clear_loaded_ontologies()
+            ontology.load_ontology(args.owl, cache_dir=cache_dir, use_snapshot=False)
+
+        def warm():
+            ontology.clear_loaded_ontologies()
+            ontology.load_ontology(args.owl, cache_dir=cache_dir)
+
+        def reuse():
+            ontology.load_ontology(args.owl, cache_dir=cache_dir)
+
+        def manager():
+            GraphManager(owl_path=args.owl)
+
+        # Prime the snapshot and the in-process copy
+        warm()
+        results = {
+            "cold parse": _time(cold, args.repeat),
+            "warm snapshot": _time(warm, args.repeat),
+            "in-process reuse": _time(reuse, args.repeat),
+        }
+        ontology.clear_loaded_ontologies()
+        ontology.load_ontology(args.owl, cache_dir=cache_dir)
+        results["GraphManager()"] = _time(manager, args.repeat)
+
+    print(f"{'case':<20}{'median ms':>12}{'min ms':>12}")
+    for name, samples in results.items():
+        print(f"{name:<20}{statistics.median(samples) * 1e3:>12.2f}{min(samples) * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
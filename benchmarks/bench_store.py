@@ -0,0 +1,117 @@
+"""
+In-memory vs. SQLite observation store benchmark.
+
+Each backend runs in its own subprocess so that the reported max RSS belongs
+to that backend alone.  For each it measures ingest of a synthetic fleet,
+the time to get the graph back in a fresh process (Turtle parse for the
+in-memory store, reopening the file for SQLite) and the p50 latency of a
+few queries after reopening.
+
+    python -m benchmarks.bench_store --observations 100000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from graph_manager.main import GraphManager
+from graph_manager.synthetic import FleetGenerator
+
+from .bench_cq import max_rss_kb, time_query
+from .competency_questions import ORKA_CQS, ORKA_NAMESPACES
+
+QUERIES = {
+    "cq1a": ORKA_CQS["cq1a"],
+    "cq5": ORKA_CQS["cq5"],
+    "one_obs": """
+        SELECT ?value WHERE {
+          <http://example.org/orka/observation_graph/syn_obs_42> orka:hasMeasurement/orka:hasResult/orka:hasValue ?value
+        }""",
+    "sensor_obs": """
+        SELECT (COUNT(?m) AS ?n) WHERE {
+          ?m orka:madeBySensor <http://example.org/orka/observation_graph/syn_sensor_0_0>
+        }""",
+}
+
+BACKENDS = ("memory", "sqlite")
+
+
+def _open(backend, workdir):
+    if backend == "sqlite":
+        return GraphManager(store="SQLite", store_path=workdir / "observations.sqlite")
+    return GraphManager()
+
+
+def build(backend, workdir, observations):
+    """Ingest and persist; returns seconds spent ingesting."""
+    gm = _open(backend, workdir)
+    start = time.perf_counter()
+    FleetGenerator(gm).populate(observations)
+    elapsed = time.perf_counter() - start
+    if backend == "memory":
+        gm.save_graph(workdir / "observations.ttl")
+    gm.close()
+    return elapsed
+
+
+def reopen_and_query(backend, workdir, repeat):
+    start = time.perf_counter()
+    gm = _open(backend, workdir)
+    if backend == "memory":
+        gm.graph.parse(workdir / "observations.ttl", format="turtle")
+    reopen = time.perf_counter() - start
+    run = lambda q: gm.query(q, initNs=ORKA_NAMESPACES)
+    queries = {name: time_query(run, q, warmup=1, repeat=repeat)["ms"]["p50"] for name, q in QUERIES.items()}
+    return reopen, queries
+
+
+def child(args):
+    workdir = Path(args.workdir)
+    if args.phase == "build":
+        result = {"ingest_s": build(args.backend, workdir, args.observations)}
+    else:
+        reopen, queries = reopen_and_query(args.backend, workdir, args.repeat)
+        result = {"reopen_s": reopen, "query_p50_ms": queries}
+    result["max_rss_kb"] = max_rss_kb()
+    print(json.dumps(result))
+
+
+def _run_child(backend, phase, workdir, args):
+    cmd = [sys.executable, "-m", "benchmarks.bench_store", "--child", "--backend", backend, "--phase", phase,
+           "--workdir", str(workdir), "--observations", str(args.observations), "--repeat", str(args.repeat)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--observations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--backend", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--phase", choices=("build", "query"), help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    print(f"{'backend':<8}{'ingest s':>10}{'build RSS MiB':>15}{'reopen s':>10}{'open RSS MiB':>14}{'disk MiB':>10}  query p50 ms")
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as workdir:
+            workdir = Path(workdir)
+            built = _run_child(backend, "build", workdir, args)
+            queried = _run_child(backend, "query", workdir, args)
+            disk = sum(f.stat().st_size for f in workdir.iterdir()) / 2**20
+        queries = " ".join(f"{name}={ms:.2f}" for name, ms in queried["query_p50_ms"].items())
+        print(f"{backend:<8}{built['ingest_s']:>10.2f}{built['max_rss_kb'] / 1024:>15.0f}"
+              f"{queried['reopen_s']:>10.2f}{queried['max_rss_kb'] / 1024:>14.0f}{disk:>10.1f}  {queries}")
+
+
+if __name__ == "__main__":
+    main()
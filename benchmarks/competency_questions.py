@@ -0,0 +1,133 @@
+"""
+Competency questions from the evaluation notebooks.
+
+ORKA_CQS are CQ1-CQ7 of ``evaluation/eval.ipynb``; CQ8 and CQ9 are left out
+as the first only lists external links and the second calls the Wikidata
+endpoint.  The notebook binds ``orka:`` to ``https://w3id.org/def/orka/``,
+but the ontology declares its terms under ``https://w3id.org/def/orka#``,
+so here the prefix follows the ontology.
+
+RPO_CQS are CQ1-CQ8 of ``evaluation/rpo-evaluation-cq.ipynb`` against the
+robot perception ontology, now kept under ``owl/depracated/rpo.rdf``.
+"""
+
+from rdflib.namespace import RDF, RDFS
+
+ORKA_NAMESPACES = {
+    "rdf": RDF,
+    "rdfs": RDFS,
+    "sosa": "http://www.w3.org/ns/sosa/",
+    "ssn": "http://www.w3.org/ns/ssn/",
+    "orka": "https://w3id.org/def/orka#",
+    "oboe-core": "http://ecoinformatics.org/oboe/oboe.1.2/oboe-core.owl#",
+}
+
+RPO_NAMESPACES = {
+    "rdf": RDF,
+    "rdfs": RDFS,
+    "": "http://www.semanticweb.org/dorte/orka-core#",
+}
+
+ORKA_CQS = {
+    "cq1a": """
+SELECT ?sensor ?robot
+WHERE {
+  ?robot sosa:hosts ?sensor
+}""",
+    "cq1b": """
+SELECT ?perceptionalgorithm ?robot
+WHERE {
+  ?perceptionalgorithm orka:implementedOn ?robot
+}""",
+    "cq2a": """
+SELECT ?sensor ?charType
+WHERE {
+  ?robot sosa:hosts ?sensor .
+  ?sensor orka:observesCharacteristic ?characteristic .
+  ?characteristic a ?charType
+}""",
+    "cq2b": """
+SELECT ?chartype
+WHERE {
+  ?perceptionalgorithm orka:implementedOn ?robot .
+  ?perceptionalgorithm orka:observesCharacteristic ?characteristic .
+  ?characteristic a ?chartype
+}""",
+    "cq3": """
+SELECT ?standard
+WHERE {
+  ?measurement oboe-core:usesStandard ?inst_standard .
+  ?inst_standard a ?standard
+}""",
+    "cq4": """
+SELECT ?entity ?observedchar ?observeablechar
+WHERE {
+  ?entity a orka:PhysicalEntity .
+  ?entity orka:hasCharacteristic ?char .
+  ?char a ?observedchar .
+  ?observeablechar rdfs:subPropertyOf* orka:hasObservableCharacteristic
+}""",
+    "cq5": """
+SELECT ?sensor ?sensorcharacteristic ?value
+WHERE {
+  ?robot sosa:hosts ?sensor .
+  ?sensor ?sensorcharacteristic ?value.
+  ?sensorcharacteristic rdfs:subPropertyOf* orka:hasSensorCharacteristic .
+}""",
+    "cq6": """
+SELECT ?algorithm ?algorithmcharacteristic ?value
+WHERE {
+  ?algorithm orka:implementedOn ?robot .
+  ?algorithm ?algorithmcharacteristic ?value .
+  ?algorithmcharacteristic rdfs:subPropertyOf* orka:hasAlgorithmCharacteristic
+}""",
+    "cq7": """
+SELECT ?context ?entity (COALESCE(?algorithm, "None") as ?alg)
+WHERE {
+  ?context orka:hasRequiredEntity ?entity .
+  OPTIONAL {
+    ?algorithm orka:implementedOn ?robot .
+    ?algorithm orka:canDetect ?entity .
+   }
+}""",
+}
+
+_RPO_SELF_SENSOR = """
+    ?sensor rdf:type/rdfs:subClassOf* :Sensor .
+    ?sensor :isPoweredOn true .
+    ?sensor :isHostedBy ?agent .
+    ?agent a :Self"""
+
+RPO_CQS = {
+    "cq1": "SELECT ?sensor ?agent WHERE{" + _RPO_SELF_SENSOR + "\n}",
+    "cq2": "SELECT ?sensor ?agent ?sc ?value ?unit WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?sensor :hasSensorCharacteristics ?sc .
+    ?sc :hasUnitofMeasure ?unit .
+    ?sc :hasNumericalValue ?value
+}""",
+    "cq3": "SELECT ?unit ?sensor ?agent WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?sensor :hasOutputUnitOfMeasure ?unit.
+}""",
+    "cq4": "SELECT ?prop ?sensor ?agent WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?sensor :enablesObservationOf ?prop.
+}""",
+    "cq5": "SELECT ?sensor ?agent ?alg ?output WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?alg rdf:type/rdfs:subClassOf* :Algorithm .
+    ?sensor :hasOutput ?output .
+    ?alg :hasInput ?output
+}""",
+    "cq6": "SELECT ?sensor ?agent ?alg ?char ?property WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?alg rdf:type/rdfs:subClassOf* :Algorithm .
+    ?alg ?property ?char .
+    ?property rdfs:subPropertyOf* :algorithmCharacteristicProperty
+}""",
+    "cq7": "SELECT ?sensor ?agent ?alg ?unit WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?alg rdf:type/rdfs:subClassOf* :Algorithm.
+    ?alg :hasOutputUnitOfMeasure ?unit.
+}""",
+    "cq8": "SELECT ?sensor ?agent ?alg ?prop WHERE{" + _RPO_SELF_SENSOR + """ .
+    ?alg rdf:type/rdfs:subClassOf* :Algorithm.
+    ?sensor :hasOutput ?output .
+    ?alg :capableOfObservationOf ?prop.
+}""",
+}
@@ -1,53 +1,33 @@
-from SPARQLWrapper import SPARQLWrapper, JSON
+import sys
+
 import networkx as nx
 import matplotlib.pyplot as plt
 import rdflib
 from rdflib.namespace import Namespace
 
+from color_palette import load_palette
+
 color_graph = rdflib.Graph()
 orka_full = Namespace("http://www.semanticweb.org/dorte/orka-full#")
 
 
-# Set up the SPARQL endpoint
-sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
-sparql.setQuery("""
-    SELECT ?color ?colorLabel ?colorValue ?superclass ?superclassLabel
-    WHERE {
-      ?color wdt:P31 wd:Q1075;  # Instance of color
-             wdt:P465 ?colorValue.  # Color value property
-
-      OPTIONAL {
-        ?color wdt:P279 ?superclass.  # Superclass property
-        FILTER(EXISTS { ?superclass wdt:P31 wd:Q1075 }).  # Filter to only include superclasses that are colors
-      }
-
-      SERVICE wikibase:label { bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en". }
-    }
-    LIMIT 100
-""")
-
-sparql.setReturnFormat(JSON)
-results = sparql.query().convert()
+# Colors come from the local palette snapshot; --refresh queries Wikidata again
+palette = load_palette(refresh="--refresh" in sys.argv)
 # Create a directed graph using networkx
 G = nx.DiGraph()
 color_graphs = {}
 color_dict = {}
+color_uris = {}
 # Add nodes and edges to the graph
-for result in results["results"]["bindings"]:
-    color = result["color"]["value"]
-    color_label = result["colorLabel"]["value"].replace(' ', '_')
-    color_value = result["colorValue"]["value"]
-    superclass = result.get("superclass", {}).get("value", None)
-    superclass_label = result.get("superclassLabel", {}).get("value", None)
-    R,G,B = [color_value[0:2], color_value[2:4],color_value[4:6]]
-    color_code = [int(x,16) for x in [R,G,B]]
+for entry in palette:
+    color = entry.uri
+    color_label = entry.name.replace(' ', '_')
+    color_value = entry.hex
+    color_code = entry.rgb
     color_graph.add((orka_full[color_label], orka_full["hasValue"], rdflib.Literal(color_value)))
     color_dict[color_label] = color_code
+    color_uris[color_label] = color
     # G.add_node(color, label=f"{color_label}\n{color_value}", node_color='#fff4d9')
-    
-    # if superclass:
-    #     G.add_node(superclass, label=f"{superclass_label}", node_color='#fff4d9')
-    #     G.add_edge(color, superclass)  # Reverse the direction to correctly represent subclass relationship
 
 # print(color_graphs)
 # Draw the graph with labels
@@ -65,6 +45,8 @@ for s,p,o in color_graph:
 
 import numpy as np
 
+from named_colors import NamedColorIndex
+
 print(list(color_dict.values()))
 list_of_colors = [[255,0,0],[150,33,77],[75,99,23],[45,88,250],[250,0,255]]
 color = [155,155,155]
@@ -72,25 +54,13 @@ color = [155,155,155]
 # Example colours from the use-case
 colours = [[202, 128, 35], [179, 95, 53], [190, 186, 76]]
 
-def closest(colors,color):
-    colors = np.array(colors)
-    color = np.array(color)
-    distances = np.sqrt(np.sum((colors-color)**2,axis=1))
-    index_of_smallest = np.where(distances==np.amin(distances))
-    smallest_distance = colors[index_of_smallest]
-    return smallest_distance 
-
-def find_key_by_value(dictionary, target_value):
-    for key, value in dictionary.items():
-        if np.array_equal(value, target_value):
-            return key
-    return None
-
-for color in colours:
-  closest_color = closest(list(color_dict.values()), color)
-  print(color, closest_color[0], find_key_by_value(color_dict, closest_color[0]))
+# Palette converted to CIELAB once; all colours are named in one call
+color_index = NamedColorIndex.from_mapping(color_dict, color_uris)
+matches = color_index.query(colours)
+for color, name, uri, distance in zip(colours, matches.names, matches.uris, matches.distances):
+  print(color, color_dict[name], name, uri, round(float(distance), 1))
 
 
-# [201, 127, 34] [204 119  34] ochre
-# [179, 96, 53] [184 115  51] copper
-# [190, 186, 76] [188 147  55] honey
\ No newline at end of file
+# [202, 128, 35] [204, 119, 34] ochre http://www.wikidata.org/entity/Q1426482 6.1
+# [179, 95, 53] [184, 115, 51] copper http://www.wikidata.org/entity/Q1105656 12.4
+# [190, 186, 76] [188, 147, 55] honey http://www.wikidata.org/entity/Q5894312 21.5
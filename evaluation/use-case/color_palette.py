@@ -0,0 +1,254 @@
+"""
+Versioned local snapshot of the Wikidata color palette.
+
+color-extractor-wikidata.py and the ontology builders used to query the
+Wikidata SPARQL endpoint on every run, so nothing could start without
+network.  ``build_palette`` fetches the colors once (or takes SPARQL JSON
+results it is fed) and writes a snapshot with the name, hex/RGB value,
+Wikidata ID and parents of every color; ``load_palette`` reads it back in
+a few milliseconds and only goes to Wikidata when there is no snapshot
+yet or ``refresh`` is asked for.
+
+    palette = load_palette()                     # snapshot, or build it once
+    index = palette.index()                      # NamedColorIndex
+
+    python color_palette.py --refresh            # rebuild from Wikidata
+    python color_palette.py --from results.json  # rebuild from saved SPARQL JSON
+
+The snapshot lives in ``~/.cache/orka/palette`` (ORKA_CACHE_DIR moves the
+cache root, ORKA_PALETTE points at one file); with ORKA_OFFLINE=1 a missing
+snapshot is an error instead of a query.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+PALETTE_VERSION = 1
+PALETTE_FILE = "wikidata-colors.json"
+WIKIDATA_ENDPOINT = "https://query.wikidata.org/sparql"
+WIKIDATA_ENTITY = "http://www.wikidata.org/entity/"
+
+# Colors (instances or subclasses of wd:Q1075) with an sRGB hex triplet and their parents
+COLOR_QUERY = """
+SELECT ?color ?colorLabel ?hex ?parent WHERE {
+  ?color (wdt:P279|wdt:P31) wd:Q1075.
+  ?color wdt:P465 ?hex.
+  ?color rdfs:label ?colorLabel.
+  OPTIONAL { ?color wdt:P279 ?parent. }
+  FILTER(LANG(?colorLabel) = "en")
+}
+"""
+
+
+def default_palette_path() -> Path:
+    env = os.environ.get("ORKA_PALETTE")
+    if env:
+        return Path(env)
+    root = os.environ.get("ORKA_CACHE_DIR")
+    return (Path(root) if root else Path.home() / ".cache" / "orka") / "palette" / PALETTE_FILE
+
+
+def offline() -> bool:
+    return os.environ.get("ORKA_OFFLINE", "") not in ("", "0")
+
+
+class PaletteColor(NamedTuple):
+    id: str  # Wikidata ID, e.g. "Q1426482"
+    name: str
+    hex: str  # upper-case, without "#"
+    rgb: List[int]
+    parents: List[str]  # Wikidata IDs of parent colors in the palette
+
+    @property
+    def uri(self) -> str:
+        return WIKIDATA_ENTITY + self.id
+
+
+class Palette:
+    """
+    Colors of one snapshot, in snapshot order.
+
+    Args:
+        colors: PaletteColor entries
+        created: Snapshot time, seconds since the epoch
+        source: Endpoint or file the snapshot was built from
+    """
+
+    def __init__(self, colors: Iterable[PaletteColor], created: float = 0.0, source: str = ""):
+        self.colors = list(colors)
+        self.created = created
+        self.source = source
+        self.by_id = {color.id: color for color in self.colors}
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def __iter__(self):
+        return iter(self.colors)
+
+    def __getitem__(self, color_id: str) -> PaletteColor:
+        return self.by_id[color_id]
+
+    def mapping(self) -> Dict[str, List[int]]:
+        """``{name: [r, g, b]}``; the first color wins where names repeat."""
+        colors = {}
+        for color in self.colors:
+            colors.setdefault(color.name, color.rgb)
+        return colors
+
+    def uris(self) -> Dict[str, str]:
+        """``{name: Wikidata URI}`` matching ``mapping``."""
+        uris = {}
+        for color in self.colors:
+            uris.setdefault(color.name, color.uri)
+        return uris
+
+    def index(self, **kwargs):
+        """NamedColorIndex over the palette."""
+        from named_colors import NamedColorIndex
+
+        return NamedColorIndex.from_mapping(self.mapping(), self.uris(), **kwargs)
+
+    def to_json(self) -> dict:
+        return {
+            "version": PALETTE_VERSION,
+            "created": self.created,
+            "source": self.source,
+            "colors": [color._asdict() for color in self.colors],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Palette":
+        if data.get("version") != PALETTE_VERSION:
+            raise ValueError(
+                f"Palette snapshot version {data.get('version')} is not {PALETTE_VERSION}; "
+                "rebuild it with `python color_palette.py --refresh`"
+            )
+        return cls((PaletteColor(**color) for color in data["colors"]), data.get("created", 0.0), data.get("source", ""))
+
+
+def _entity_id(uri: str) -> str:
+    return uri.rstrip("/").split("/")[-1]
+
+
+def palette_from_bindings(bindings: Iterable[dict], source: str = "") -> Palette:
+    """
+    Palette from SPARQL JSON result bindings of COLOR_QUERY.
+
+    A color with several parents comes back as several rows; they are
+    merged, and parents that are not in the palette themselves are dropped.
+    Rows whose hex value is not a 6-digit triplet are skipped.
+    """
+    colors: Dict[str, dict] = {}
+    for row in bindings:
+        color_id = _entity_id(row["color"]["value"])
+        hex_value = row["hex"]["value"].strip().lstrip("#").upper()
+        if len(hex_value) != 6:
+            continue
+        try:
+            rgb = [int(hex_value[i:i + 2], 16) for i in (0, 2, 4)]
+        except ValueError:
+            continue
+        color = colors.setdefault(color_id, {
+            "id": color_id, "name": row["colorLabel"]["value"], "hex": hex_value, "rgb": rgb, "parents": [],
+        })
+        if "parent" in row:
+            parent = _entity_id(row["parent"]["value"])
+            if parent not in color["parents"]:
+                color["parents"].append(parent)
+    for color in colors.values():
+        color["parents"] = [parent for parent in color["parents"] if parent in colors]
+    return Palette((PaletteColor(**color) for color in colors.values()), time.time(), source)
+
+
+def fetch_bindings(query: str = COLOR_QUERY, endpoint: str = WIKIDATA_ENDPOINT, timeout: float = 60.0) -> List[dict]:
+    """Run a query against the Wikidata endpoint, bypassing the response cache, and return the bindings."""
+    from sparql_client import SparqlClient
+
+    with SparqlClient(endpoint, timeout=timeout) as client:
+        return client.bindings(query, refresh=True)
+
+
+def save_palette(palette: Palette, path: Optional[Path] = None) -> Path:
+    """Write a snapshot atomically."""
+    path = Path(path) if path is not None else default_palette_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(palette.to_json(), f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+def build_palette(
+    path: Optional[Path] = None,
+    bindings: Optional[Iterable[dict]] = None,
+    fetch: Callable[[str], List[dict]] = fetch_bindings,
+    source: str = WIKIDATA_ENDPOINT,
+) -> Palette:
+    """
+    Build and save a snapshot.
+
+    Args:
+        path: Snapshot file, default_palette_path() by default
+        bindings: SPARQL JSON bindings to use instead of querying
+        fetch: Called with COLOR_QUERY when no bindings are given
+        source: Recorded in the snapshot
+
+    Returns:
+        The new Palette
+    """
+    if bindings is None:
+        if offline():
+            raise RuntimeError("ORKA_OFFLINE is set; cannot query Wikidata for the palette")
+        bindings = fetch(COLOR_QUERY)
+    palette = palette_from_bindings(bindings, source)
+    save_palette(palette, path)
+    return palette
+
+
+_loaded: Dict[Path, tuple] = {}
+
+
+def load_palette(path: Optional[Path] = None, refresh: bool = False, fetch: Callable[[str], List[dict]] = fetch_bindings) -> Palette:
+    """
+    Read the palette snapshot, building it first if it is missing or ``refresh`` is set.
+
+    Snapshots are cached per path and file modification time.
+    """
+    path = Path(path) if path is not None else default_palette_path()
+    if refresh or not path.is_file():
+        if offline() and not refresh:
+            raise FileNotFoundError(f"{path} not found and ORKA_OFFLINE is set; build the palette snapshot first")
+        build_palette(path, fetch=fetch)
+    mtime = path.stat().st_mtime_ns
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, encoding="utf-8") as f:
+        palette = Palette.from_json(json.load(f))
+    _loaded[path] = (mtime, palette)
+    return palette
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Build the local Wikidata color palette snapshot")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot file")
+    parser.add_argument("--refresh", action="store_true", help="Query Wikidata even if a snapshot exists")
+    parser.add_argument("--from", dest="results", type=Path, help="Build from saved SPARQL JSON results")
+    args = parser.parse_args(argv)
+
+    if args.results:
+        with open(args.results, encoding="utf-8") as f:
+            palette = build_palette(args.output, json.load(f)["results"]["bindings"], source=str(args.results))
+    else:
+        palette = load_palette(args.output, refresh=args.refresh)
+    print(f"{len(palette)} colors in {args.output or default_palette_path()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Per-instance color statistics in one vectorized pass.
+
+``get_color`` used to AND the full frame with each mask and average the
+result, once per instance.  Here the masked pixels of all instances are
+gathered with one ``np.nonzero`` over the mask stack, tagged with their
+instance index, and every statistic is a ``np.bincount`` over them, so
+the cost is one pass over the masked pixels no matter how many instances
+a frame holds:
+
+    mean        per-label 256-bin histogram per channel, weighted by the
+                bin values and divided by the pixel count
+    median      first bin of the same histogram whose cumulative count
+                reaches half the pixels
+    dominant    per-label 3-D histogram with ``bits`` bits per channel;
+                the mean color of the fullest bin
+
+``dominant_colors`` extends the last one to the top-k bins per instance,
+optionally refined by a small k-means on a pixel subsample.
+
+Where masks overlap, a pixel counts toward every instance whose mask
+covers it, as it did with the per-mask loop.  With ``exclusive=True``, or
+when a label map is passed instead of masks, it belongs to the first
+(highest-scoring) mask only.
+"""
+
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+COLOR_TABLE_DTYPE = np.dtype([
+    ("pixels", np.int64),
+    ("mean", np.float32, (3,)),
+    ("median", np.uint8, (3,)),
+    ("dominant", np.uint8, (3,)),
+])
+
+
+def label_map(masks: np.ndarray) -> np.ndarray:
+    """
+    Fold N x H x W boolean masks into an H x W map of 1-based instance ids, 0 for background.
+
+    Where masks overlap, the first one wins.
+    """
+    masks = np.asarray(masks, dtype=bool)
+    if masks.ndim == 2:
+        masks = masks[None]
+    if not len(masks):
+        return np.zeros(masks.shape[1:], dtype=np.int32)
+    # argmax finds the first True along the instance axis in one pass
+    first = masks.argmax(axis=0).astype(np.int32) + 1
+    first[~masks.any(axis=0)] = 0
+    return first
+
+
+def _mean_median(labels, pixels, count, sizes):
+    """Per-label, per-channel mean and median of uint8 values from 256-bin histograms."""
+    means = np.zeros((count, 3), dtype=np.float32)
+    medians = np.zeros((count, 3), dtype=np.uint8)
+    half = (sizes + 1) // 2
+    nonempty = np.maximum(sizes, 1)
+    levels = np.arange(256)
+    offsets = labels.astype(np.int64) * 256
+    for c in range(3):
+        hist = np.bincount(offsets + pixels[:, c], minlength=count * 256).reshape(count, 256)
+        means[:, c] = hist @ levels / nonempty
+        medians[:, c] = np.argmax(hist.cumsum(axis=1) >= half[:, None], axis=1)
+    return means, medians
+
+
+def _top_bins(labels, pixels, count, bits, top_k):
+    """
+    Mean color and size of the ``top_k`` fullest 3-D histogram bins of each label.
+
+    Ties go to the lower bin index; missing bins have size 0.
+    """
+    shift = 8 - bits
+    q = (pixels >> shift).astype(np.int64)
+    bins = 1 << (3 * bits)
+    keys = labels.astype(np.int64) * bins + ((q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2])
+    hist = np.bincount(keys, minlength=count * bins).reshape(count, bins)
+    if top_k == 1:
+        best = hist.argmax(axis=1)[:, None]
+    else:
+        best = np.argsort(-hist, axis=1, kind="stable")[:, :top_k]
+    sizes = np.take_along_axis(hist, best, axis=1)
+
+    # Rank of each pixel's bin among its label's top bins, -1 if not among them
+    rank = np.full(count * bins, -1, dtype=np.int64)
+    rank[(np.arange(count)[:, None] * bins + best).reshape(-1)] = np.tile(np.arange(best.shape[1]), count)
+    pixel_rank = rank[keys]
+    selected = pixel_rank >= 0
+    slots = labels[selected].astype(np.int64) * best.shape[1] + pixel_rank[selected]
+    colors = np.zeros((count * best.shape[1], 3), dtype=np.float64)
+    for c in range(3):
+        colors[:, c] = np.bincount(slots, weights=pixels[selected, c], minlength=len(colors))
+    colors /= np.maximum(sizes.reshape(-1, 1), 1)
+    return colors.reshape(count, best.shape[1], 3), sizes
+
+
+def _kmeans(labels, pixels, centers, sizes, sample, iterations, seed):
+    """
+    Refine per-label cluster centers with a few Lloyd steps on a pixel subsample.
+
+    All labels are clustered at once: each sampled pixel is only compared
+    with the ``k`` centers of its own label.
+    """
+    count, k, _ = centers.shape
+    rng = np.random.default_rng(seed)
+    label_sizes = np.bincount(labels, minlength=count)
+    keep = rng.random(len(labels)) < (sample / np.maximum(label_sizes, 1))[labels]
+    ids = labels[keep].astype(np.int64)
+    points = pixels[keep].astype(np.float64)
+    centers = centers.reshape(-1, 3).copy()
+    # Empty bins have no center to refine and attract no pixels
+    valid = (sizes > 0).reshape(-1)
+    candidates = ids[:, None] * k + np.arange(k)
+    members = sizes.reshape(-1)
+    for _ in range(iterations):
+        distances = ((points[:, None, :] - centers[candidates]) ** 2).sum(axis=2)
+        distances[~valid[candidates]] = np.inf
+        slots = candidates[np.arange(len(ids)), distances.argmin(axis=1)]
+        members = np.bincount(slots, minlength=count * k)
+        moved = members > 0
+        for c in range(3):
+            total = np.bincount(slots, weights=points[:, c], minlength=count * k)
+            centers[moved, c] = total[moved] / members[moved]
+    totals = members.reshape(count, k).sum(axis=1, keepdims=True)
+    return centers.reshape(count, k, 3), members.reshape(count, k) / np.maximum(totals, 1)
+
+
+class DominantColors(NamedTuple):
+    """Dominant colors per instance, most common first."""
+
+    colors: np.ndarray  # N x k x 3 uint8
+    shares: np.ndarray  # N x k, fraction of the instance's pixels
+    pixels: np.ndarray  # N, pixels per instance
+
+
+def dominant_colors(
+    image: np.ndarray,
+    masks=None,
+    labels: Optional[np.ndarray] = None,
+    exclusive: bool = False,
+    bits: int = 4,
+    top_k: int = 3,
+    refine: bool = False,
+    sample: int = 2000,
+    iterations: int = 5,
+    seed: int = 0,
+) -> DominantColors:
+    """
+    Most common colors of every instance.
+
+    Pixels are quantized into a 3-D histogram with ``bits`` bits per
+    channel; the ``top_k`` fullest bins of each instance, represented by
+    the mean color of their pixels, are its dominant colors.  With
+    ``refine`` they seed a k-means over at most about ``sample`` pixels
+    per instance, which moves colors that straddle bin edges to the
+    cluster centers.
+
+    Args:
+        image: H x W x 3 uint8 image
+        masks: N x H x W boolean masks, or
+        labels: A label map from ``label_map`` instead of masks
+        exclusive: Give overlapping pixels to the first mask only
+        bits: Histogram bits per channel (1-8)
+        top_k: Colors per instance
+        refine: Run k-means on a subsample after the histogram
+        sample: Approximate pixels per instance used by k-means
+        iterations: k-means iterations
+        seed: Subsampling seed
+
+    Returns:
+        DominantColors
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError("bits must be between 1 and 8")
+    ids, pixels, count = _instance_pixels(image, masks, labels, exclusive)
+    colors = np.zeros((count, top_k, 3), dtype=np.uint8)
+    shares = np.zeros((count, top_k))
+    if not len(ids):
+        return DominantColors(colors, shares, np.zeros(count, dtype=np.int64))
+    sizes = np.bincount(ids, minlength=count)
+
+    centers, bin_sizes = _top_bins(ids, pixels, count, bits, top_k)
+    k = centers.shape[1]
+    if refine:
+        centers, fractions = _kmeans(ids, pixels, centers, bin_sizes, sample, iterations, seed)
+    else:
+        fractions = bin_sizes / np.maximum(sizes, 1)[:, None]
+    # Most common first after refinement too
+    order = np.argsort(-fractions, axis=1, kind="stable")
+    colors[:, :k] = np.clip(np.rint(np.take_along_axis(centers, order[:, :, None], axis=1)), 0, 255)
+    shares[:, :k] = np.take_along_axis(fractions, order, axis=1)
+    return DominantColors(colors, shares, sizes)
+
+
+def _instance_pixels(image, masks, labels, exclusive):
+    """
+    Masked pixels with the 0-based index of their instance, and the instance count.
+
+    A pixel under several masks appears once per mask unless ``exclusive``
+    is set or a label map is given.
+    """
+    if labels is None:
+        masks = np.asarray(masks, dtype=bool)
+        if masks.ndim == 2:
+            masks = masks[None]
+        if masks.shape[1:] != image.shape[:2]:
+            raise ValueError("Mask and image shapes do not match.")
+        if exclusive:
+            labels = label_map(masks)
+        else:
+            ids, foreground = np.nonzero(masks.reshape(len(masks), -1))
+            pixels = image.reshape(-1, image.shape[2])[foreground, :3]
+            return ids, pixels, len(masks)
+        count = len(masks)
+    else:
+        if labels.shape != image.shape[:2]:
+            raise ValueError("Mask and image shapes do not match.")
+        count = int(labels.max(initial=0))
+    flat = labels.reshape(-1)
+    foreground = np.flatnonzero(flat)
+    # Ids are shifted to 0-based
+    return flat[foreground] - 1, image.reshape(-1, image.shape[2])[foreground, :3], count
+
+
+def color_table(
+    image: np.ndarray, masks=None, labels: Optional[np.ndarray] = None, bits: int = 4, exclusive: bool = False
+) -> np.ndarray:
+    """
+    Pixel count, mean, median and dominant color of every instance.
+
+    Args:
+        image: H x W x 3 uint8 image; channels keep the image's order
+        masks: N x H x W boolean masks, or
+        labels: A label map from ``label_map`` instead of masks
+        bits: Bits per channel of the dominant-color histogram
+        exclusive: Give overlapping pixels to the first mask only
+
+    Returns:
+        Structured array with COLOR_TABLE_DTYPE, row i for instance i;
+        instances without pixels have a zero count and zero colors
+    """
+    ids, pixels, count = _instance_pixels(image, masks, labels, exclusive)
+    table = np.zeros(count, dtype=COLOR_TABLE_DTYPE)
+    if not len(ids):
+        return table
+
+    sizes = np.bincount(ids, minlength=count)
+    table["pixels"] = sizes
+    table["mean"], table["median"] = _mean_median(ids, pixels, count, sizes)
+    table["dominant"] = np.rint(_top_bins(ids, pixels, count, bits, 1)[0][:, 0])
+    return table
+
+
+def colorize(labels: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    """Paint each instance of a label map in its color, background black."""
+    palette = np.zeros((len(colors) + 1, 3), dtype=np.uint8)
+    palette[1:] = np.clip(np.rint(colors), 0, 255)
+    return palette[labels]
+
+
+def colors_by_name(names: Sequence[str], table: np.ndarray, statistic: str = "mean") -> Dict[str, np.ndarray]:
+    """Map instance names to one statistic, skipping instances without pixels."""
+    return {name: row[statistic] for name, row in zip(names, table) if row["pixels"]}
+
+
+def stack_masks(masks: Iterable) -> np.ndarray:
+    """N x H x W boolean array from an iterable of H x W masks."""
+    return np.stack([np.asarray(m, dtype=bool) for m in masks])
@@ -1,3 +1,138 @@
+"""
+Bulk generation of ORKA classes, e.g. one class per Wikidata color.
+
+Creating each class through owlready2 (``type(color_id, (Color,), {})``
+plus one attribute assignment per annotation, then a second pass for the
+parents) costs a quadstore round trip per triple.  Here the classes are
+described as ClassSpec entries, turned into RDF in one pass -- parents are
+looked up among the specs themselves, so no second pass is needed -- and
+merged into the ontology graph with a single ``addN``.  Annotations are
+written as ``owl:hasValue`` restrictions, as owlready2 did and as orka.owl
+does for ``hasWikiDataURI`` on its object classes.
+
+    python create_orka.py --ontology orka.owl --output updated_ontology.owl
+
+builds color classes from the local palette snapshot (see color_palette.py).
+Running it again replaces the classes it generated before.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple
+
+import rdflib
+from rdflib import BNode, Literal
+from rdflib.namespace import OWL, RDF, RDFS
+
+ORKA = rdflib.Namespace("https://w3id.org/def/orka#")
+DEFAULT_ONTOLOGY = Path(__file__).resolve().parents[2] / "orka.owl"
+
+
+class ClassSpec(NamedTuple):
+    """One class to generate."""
+
+    id: str  # local name in the namespace
+    label: str
+    parents: List[str]  # ids of other specs; unknown ids are ignored
+    annotations: Dict[str, List[str]]  # property local name -> values
+
+
+def _unnamed(name: str) -> bool:
+    return name.startswith("#") or " " in name
+
+
+def color_specs(palette, skip: Callable[[str], bool] = _unnamed) -> List[ClassSpec]:
+    """
+    One ClassSpec per palette color, named by its Wikidata ID.
+
+    Colors whose name starts with "#" or contains a space are skipped by
+    default, as before; their children then hang under the root class.
+    """
+    return [
+        ClassSpec(
+            color.id,
+            color.name.capitalize(),
+            list(color.parents),
+            {
+                "hasRGBvalue": [color.hex],
+                "hasWikiDataURI": [f"https://www.wikidata.org/wiki/{color.id}"],
+            },
+        )
+        for color in palette
+        if not skip(color.name)
+    ]
+
+
+def class_triples(specs: Iterable[ClassSpec], root=ORKA.Color, namespace=ORKA) -> Iterator[tuple]:
+    """
+    Triples declaring every spec as a subclass of its parents, or of ``root``
+    when none of its parents is among the specs.
+    """
+    specs = list(specs)
+    known = {spec.id for spec in specs}
+    for spec in specs:
+        cls = namespace[spec.id]
+        yield cls, RDF.type, OWL.Class
+        yield cls, RDFS.label, Literal(spec.label)
+        parents = [namespace[p] for p in spec.parents if p in known and p != spec.id]
+        for parent in parents or [root]:
+            yield cls, RDFS.subClassOf, parent
+        for prop, values in spec.annotations.items():
+            for value in values:
+                restriction = BNode()
+                yield restriction, RDF.type, OWL.Restriction
+                yield restriction, OWL.onProperty, namespace[prop]
+                yield restriction, OWL.hasValue, Literal(value)
+                yield cls, RDFS.subClassOf, restriction
+
+
+def remove_classes(graph: rdflib.Graph, classes: Iterable) -> int:
+    """Drop classes with their anonymous superclass restrictions; returns the triples removed."""
+    before = len(graph)
+    for cls in classes:
+        for restriction in list(graph.objects(cls, RDFS.subClassOf)):
+            if isinstance(restriction, BNode):
+                graph.remove((restriction, None, None))
+        graph.remove((cls, None, None))
+    return before - len(graph)
+
+
+def add_classes(graph: rdflib.Graph, specs: Iterable[ClassSpec], root=ORKA.Color, namespace=ORKA) -> int:
+    """
+    Merge generated classes into ``graph``, replacing earlier versions of them.
+
+    Returns:
+        Number of classes added
+    """
+    specs = list(specs)
+    remove_classes(graph, (namespace[spec.id] for spec in specs))
+    graph.addN((s, p, o, graph) for s, p, o in class_triples(specs, root, namespace))
+    return len(specs)
+
+
+def main(argv=None) -> None:
+    from color_palette import load_palette
+
+    parser = argparse.ArgumentParser(description="Add the Wikidata colors to an ontology as ORKA classes")
+    parser.add_argument("--ontology", type=Path, default=DEFAULT_ONTOLOGY, help="Ontology to extend")
+    parser.add_argument("--output", type=Path, default=Path("updated_ontology.owl"))
+    parser.add_argument("--palette", type=Path, default=None, help="Palette snapshot")
+    parser.add_argument("--refresh", action="store_true", help="Rebuild the palette snapshot from Wikidata")
+    parser.add_argument("--format", default="xml", help="rdflib serialization format of the output")
+    args = parser.parse_args(argv)
+
+    graph = rdflib.Graph()
+    graph.parse(str(args.ontology))
+    count = add_classes(graph, color_specs(load_palette(args.palette, refresh=args.refresh)))
+    graph.serialize(destination=str(args.output), format=args.format)
+    print(f"Added {count} color classes; saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# Class hierarchy notes
 # VisualCharactersitic
 # 	Color
 # 	GeometricCharacteristic
@@ -69,55 +204,55 @@
 # 		Slam
 
 
-Sensors
-    Exteroception Sensor
-    Proprioception Sensor
-    Active Sensor
-    Passive Sensor
-    Tactile Sensor
-        Switch
-        Bumper
-        Optical Barrier
-        Proximity Sensor
-    Haptic Sensor
-        Contact Array
-        Force Sensor
-        Torque Sensor
-        Resistive Sensor
-    Motor Sensor
-        Brush Encoder
-        Potentiometer
-        Resolver
-        Optical Encoder
-        Magnetic Encoder
-        Inductive Encoder
-        Capacity Encoder
-    Heading Sensor
-        Compass
-        Gyroscope
-        Inclinometer
-    Position Sensor
-        GPS
-        Active Optical
-        RF Beacon
-        Ultrasound Beacon
-        Reflective Beacon
-    Ranging Sensor
-        Capacitive Sensor
-        Magnetic Sensor
-        Camera
-        Sonar
-        Laser Range
-        Structures Light
-    Speed Sensor
-        Doppler Radar
-        Doppler Sound
-        Camera
-        Accelerometer
-    Identification
-        Camera
-        Radio Frequency Identification
-        Laser Ranging
-        Radar
-        Ultrasound
-        Sound
\ No newline at end of file
+# Sensors
+#     Exteroception Sensor
+#     Proprioception Sensor
+#     Active Sensor
+#     Passive Sensor
+#     Tactile Sensor
+#         Switch
+#         Bumper
+#         Optical Barrier
+#         Proximity Sensor
+#     Haptic Sensor
+#         Contact Array
+#         Force Sensor
+#         Torque Sensor
+#         Resistive Sensor
+#     Motor Sensor
+#         Brush Encoder
+#         Potentiometer
+#         Resolver
+#         Optical Encoder
+#         Magnetic Encoder
+#         Inductive Encoder
+#         Capacity Encoder
+#     Heading Sensor
+#         Compass
+#         Gyroscope
+#         Inclinometer
+#     Position Sensor
+#         GPS
+#         Active Optical
+#         RF Beacon
+#         Ultrasound Beacon
+#         Reflective Beacon
+#     Ranging Sensor
+#         Capacitive Sensor
+#         Magnetic Sensor
+#         Camera
+#         Sonar
+#         Laser Range
+#         Structures Light
+#     Speed Sensor
+#         Doppler Radar
+#         Doppler Sound
+#         Camera
+#         Accelerometer
+#     Identification
+#         Camera
+#         Radio Frequency Identification
+#         Laser Ranging
+#         Radar
+#         Ultrasound
+#         Sound
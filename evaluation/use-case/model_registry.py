@@ -0,0 +1,194 @@
+"""
+Process-wide registry for the perception models.
+
+Each model is built once, on first use, from a local weights directory and
+then kept for the lifetime of the process.  Once the weights are in that
+directory no network access is needed; with ORKA_OFFLINE=1 a missing file
+is an error instead of a download.
+
+    from model_registry import get_model, warm_up
+    warm_up(["maskrcnn"])            # optional, at startup
+    model = get_model("maskrcnn")
+
+The weights directory defaults to ``~/.cache/orka/models`` and can be moved
+with ORKA_MODEL_DIR.  torch and torchvision are imported by the loaders,
+not by this module.
+"""
+
+import contextlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+MASKRCNN_WEIGHTS = "maskrcnn_resnet50_fpn_coco.pth"
+YOLOV5_REPO = "ultralytics/yolov5"
+YOLOV5_WEIGHTS = "yolov5s.pt"
+
+
+def default_weights_dir() -> Path:
+    env = os.environ.get("ORKA_MODEL_DIR")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "orka" / "models"
+
+
+def offline() -> bool:
+    return os.environ.get("ORKA_OFFLINE", "") not in ("", "0")
+
+
+def default_device() -> str:
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+class ModelRegistry:
+    """
+    Named model loaders whose results are cached.
+
+    A loader is called as ``loader(weights_dir, device)`` and returns the
+    ready-to-use model; a warm-up function, if given, is called with the
+    model to run one dummy inference.
+
+    Args:
+        weights_dir: Local weights directory, defaults to default_weights_dir()
+        device: Torch device, defaults to CUDA when available
+    """
+
+    def __init__(self, weights_dir: Optional[Path] = None, device: Optional[str] = None):
+        self.weights_dir = Path(weights_dir) if weights_dir is not None else default_weights_dir()
+        self._device = device
+        self._loaders: Dict[str, Callable] = {}
+        self._warmups: Dict[str, Callable] = {}
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def device(self) -> str:
+        if self._device is None:
+            self._device = default_device()
+        return self._device
+
+    def register(self, name: str, loader: Callable, warmup: Optional[Callable] = None) -> None:
+        self._loaders[name] = loader
+        if warmup is not None:
+            self._warmups[name] = warmup
+        self._models.pop(name, None)
+
+    def loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str):
+        """Return the model, loading it on first use."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self._loaders:
+            raise KeyError(f"No model registered as '{name}'")
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            model = self._models.get(name)
+            if model is None:
+                self.weights_dir.mkdir(parents=True, exist_ok=True)
+                model = self._loaders[name](self.weights_dir, self.device)
+                self._models[name] = model
+        return model
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        """Load models and run one dummy inference so the first real call is fast."""
+        for name in (self._loaders if names is None else names):
+            model = self.get(name)
+            warmup = self._warmups.get(name)
+            if warmup is not None:
+                warmup(model)
+
+    def unload(self, name: Optional[str] = None) -> None:
+        """Drop a loaded model, or all of them."""
+        if name is None:
+            self._models.clear()
+        else:
+            self._models.pop(name, None)
+
+
+def _missing(path: Path) -> FileNotFoundError:
+    return FileNotFoundError(f"{path} not found and ORKA_OFFLINE is set; copy the weights there first")
+
+
+def load_maskrcnn(weights_dir: Path, device: str):
+    """Mask R-CNN ResNet-50 FPN with COCO weights from ``weights_dir``."""
+    import torch
+    import torchvision
+
+    path = weights_dir / MASKRCNN_WEIGHTS
+    if not path.is_file():
+        if offline():
+            raise _missing(path)
+        weights = torchvision.models.detection.MaskRCNN_ResNet50_FPN_Weights.DEFAULT
+        tmp = path.with_suffix(".tmp")
+        torch.save(weights.get_state_dict(progress=True), tmp)
+        os.replace(tmp, path)
+
+    model = torchvision.models.detection.maskrcnn_resnet50_fpn(weights=None, weights_backbone=None)
+    model.load_state_dict(torch.load(path, map_location=device))
+    return model.to(device).eval()
+
+
+def warm_up_maskrcnn(model) -> None:
+    import torch
+
+    device = next(model.parameters()).device
+    with torch.inference_mode():
+        model([torch.zeros(3, 480, 640, device=device)])
+
+
+@contextlib.contextmanager
+def _hub_dir(path: Path):
+    """Point torch.hub at ``path`` for the duration of a load, then restore the caller's directory."""
+    import torch
+
+    previous = torch.hub.get_dir()
+    torch.hub.set_dir(str(path))
+    try:
+        yield
+    finally:
+        torch.hub.set_dir(previous)
+
+
+def load_yolov5(weights_dir: Path, device: str):
+    """YOLOv5s through torch.hub, with the hub checkout and weights kept in ``weights_dir``."""
+    import torch
+
+    hub_dir = weights_dir / "hub"
+    repo = hub_dir / (YOLOV5_REPO.replace("/", "_") + "_master")
+    weights = weights_dir / YOLOV5_WEIGHTS
+    if repo.is_dir() and (weights.is_file() or offline()):
+        if not weights.is_file():
+            raise _missing(weights)
+        return torch.hub.load(str(repo), "custom", path=str(weights), source="local", device=device)
+    if offline():
+        raise _missing(repo)
+    # First run: check out the hub repo; yolov5 downloads the release weights to ``path``
+    with _hub_dir(hub_dir):
+        return torch.hub.load(YOLOV5_REPO, "custom", path=str(weights), device=device, trust_repo=True)
+
+
+def warm_up_yolov5(model) -> None:
+    import numpy as np
+
+    model(np.zeros((640, 640, 3), dtype=np.uint8), size=640)
+
+
+registry = ModelRegistry()
+registry.register("maskrcnn", load_maskrcnn, warm_up_maskrcnn)
+registry.register("yolov5s", load_yolov5, warm_up_yolov5)
+
+
+def get_model(name: str):
+    """Shortcut for ``registry.get``."""
+    return registry.get(name)
+
+
+def warm_up(names: Optional[Iterable[str]] = None) -> None:
+    """Shortcut for ``registry.warm_up``."""
+    registry.warm_up(names)
@@ -0,0 +1,199 @@
+"""
+Nearest named color in CIELAB.
+
+``closest()`` in color-extractor-wikidata.py compared each query with
+every palette entry in RGB and then searched the palette dict again for
+the name.  NamedColorIndex converts the palette to CIELAB once and answers
+whole batches of queries, returning name, URI and CIE76 distance (Delta E)
+directly.  Exact queries go through a KD-tree (scipy when available, else
+chunked brute force, which is fine for palettes of a few hundred colors);
+``approximate=True`` uses a precomputed table over quantized RGB, one
+lookup per query.
+
+    index = NamedColorIndex.from_mapping(color_dict)
+    names, uris, distances = index.query([[201, 127, 34], [179, 96, 53]])[:3]
+"""
+
+from typing import Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; brute force is used instead
+    cKDTree = None
+
+# D65 reference white
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+
+def srgb_to_lab(rgb) -> np.ndarray:
+    """
+    Convert sRGB colors (0-255, last axis RGB) to CIELAB under D65.
+    """
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _RGB_TO_XYZ.T / _WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def parse_rgb(value) -> List[int]:
+    """RGB triple from a hex string ("CC7722", "#cc7722") or a sequence of three numbers."""
+    if isinstance(value, str):
+        value = value.strip().lstrip("#")
+        if len(value) != 6:
+            raise ValueError(f"Not a 6-digit hex color: {value!r}")
+        return [int(value[i:i + 2], 16) for i in (0, 2, 4)]
+    rgb = [int(v) for v in value]
+    if len(rgb) != 3:
+        raise ValueError(f"Not an RGB triple: {value!r}")
+    return rgb
+
+
+class ColorMatches(NamedTuple):
+    """Nearest palette entry for each query color."""
+
+    names: List[str]
+    uris: List[Optional[str]]
+    distances: np.ndarray  # CIE76 Delta E
+    indices: np.ndarray  # into the palette
+
+
+class NamedColorIndex:
+    """
+    Palette of named colors searchable by perceptual distance.
+
+    Args:
+        names: Color names
+        rgb: P x 3 sRGB values (0-255)
+        uris: Optional URI per color, e.g. the Wikidata entity or ORKA class
+        lut_bits: Bits per channel of the approximate lookup table
+    """
+
+    def __init__(self, names: Sequence[str], rgb, uris: Optional[Sequence[Optional[str]]] = None, lut_bits: int = 5):
+        self.names = list(names)
+        self.rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+        if len(self.names) != len(self.rgb) or not len(self.names):
+            raise ValueError("A color index needs one RGB value per name and at least one color")
+        self.uris = list(uris) if uris is not None else [None] * len(self.names)
+        self.lab = srgb_to_lab(self.rgb)
+        self.lut_bits = lut_bits
+        self._tree = cKDTree(self.lab) if cKDTree is not None else None
+        self._lut = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_mapping(cls, colors: Mapping, uris: Optional[Mapping] = None, **kwargs) -> "NamedColorIndex":
+        """
+        Build from ``{name: hex or [r, g, b]}``, e.g. the ``color_dict`` of
+        color-extractor-wikidata.py, with an optional ``{name: uri}``.
+        """
+        names = list(colors)
+        rgb = [parse_rgb(colors[name]) for name in names]
+        return cls(names, rgb, [(uris or {}).get(name) for name in names], **kwargs)
+
+    @classmethod
+    def from_graph(cls, graph, namespace="https://w3id.org/def/orka#", **kwargs) -> "NamedColorIndex":
+        """
+        Build from ORKA Color classes with an ``orka:hasRGBvalue``.
+
+        The value may be asserted on the class or given as an
+        ``owl:hasValue`` restriction the class is a subclass of, which is
+        how the Wikidata import writes it; the class label is used as name
+        and ``orka:hasWikiDataURI`` as URI when present.
+        """
+        from rdflib import URIRef
+        from rdflib.namespace import OWL, RDFS
+
+        has_rgb = URIRef(namespace + "hasRGBvalue")
+        has_uri = URIRef(namespace + "hasWikiDataURI")
+
+        def values(cls_, prop):
+            yield from graph.objects(cls_, prop)
+            for restriction in graph.objects(cls_, RDFS.subClassOf):
+                if (restriction, OWL.onProperty, prop) in graph:
+                    yield from graph.objects(restriction, OWL.hasValue)
+
+        classes = set(graph.subjects(has_rgb, None))
+        classes.update(
+            cls_ for restriction in graph.subjects(OWL.onProperty, has_rgb)
+            for cls_ in graph.subjects(RDFS.subClassOf, restriction)
+        )
+        names, rgb, uris = [], [], []
+        for cls_ in sorted(classes):
+            value = next(values(cls_, has_rgb), None)
+            if value is None:
+                continue
+            label = graph.value(cls_, RDFS.label)
+            names.append(str(label) if label is not None else cls_.split("#")[-1].split("/")[-1])
+            rgb.append(parse_rgb(str(value)))
+            uri = next(values(cls_, has_uri), None)
+            uris.append(str(uri) if uri is not None else str(cls_))
+        return cls(names, rgb, uris, **kwargs)
+
+    def _nearest_exact(self, lab: np.ndarray):
+        if self._tree is not None:
+            return self._tree.query(lab)[::-1]
+        indices = np.empty(len(lab), dtype=np.int64)
+        lab_sq = (self.lab ** 2).sum(axis=1)
+        # Chunks keep the query x palette distance matrix small
+        for start in range(0, len(lab), 4096):
+            chunk = lab[start:start + 4096]
+            d = lab_sq[None, :] - 2 * chunk @ self.lab.T
+            indices[start:start + 4096] = d.argmin(axis=1)
+        return indices, None
+
+    def _lookup_table(self) -> np.ndarray:
+        """Nearest palette index for the center of every quantized RGB cell."""
+        if self._lut is None:
+            size = 1 << self.lut_bits
+            step = 256 / size
+            centers = (np.arange(size) + 0.5) * step
+            grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 3)
+            indices, _ = self._nearest_exact(srgb_to_lab(grid))
+            self._lut = np.asarray(indices, dtype=np.int32).reshape(size, size, size)
+        return self._lut
+
+    def query(self, colors, approximate: bool = False) -> ColorMatches:
+        """
+        Nearest named color for each query.
+
+        Args:
+            colors: Q x 3 (or a single) sRGB color, 0-255
+            approximate: Use the quantized lookup table; the match can be
+                off for colors near the boundary between two palette entries
+
+        Returns:
+            ColorMatches
+        """
+        rgb = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        lab = srgb_to_lab(rgb)
+        if approximate:
+            q = np.clip(rgb, 0, 255).astype(np.int64) >> (8 - self.lut_bits)
+            indices = self._lookup_table()[q[:, 0], q[:, 1], q[:, 2]]
+        else:
+            indices, _ = self._nearest_exact(lab)
+        indices = np.asarray(indices, dtype=np.int64)
+        distances = np.sqrt(((lab - self.lab[indices]) ** 2).sum(axis=1))
+        return ColorMatches(
+            [self.names[i] for i in indices],
+            [self.uris[i] for i in indices],
+            distances,
+            indices,
+        )
+
+    def nearest(self, color, approximate: bool = False):
+        """(name, uri, distance) of the nearest named color to one color."""
+        match = self.query([color], approximate=approximate)
+        return match.names[0], match.uris[0], float(match.distances[0])
+
+    def names_for(self, colors: Iterable, approximate: bool = False) -> List[str]:
+        return self.query(list(colors), approximate=approximate).names
@@ -0,0 +1,183 @@
+"""
+Batched Mask R-CNN instance segmentation for whole capture sessions.
+
+``get_prediction`` in descriptors.py segments one image per forward pass.
+``segment_images`` takes any iterable of image paths, PIL images or RGB
+arrays, runs the model on batches of ``batch_size`` images and leaves
+decoding and mask post-processing to a thread pool, so decoding the next
+batch and thresholding the previous one overlap with the forward pass.
+Results are yielded in input order as soon as they are ready; the input is
+consumed lazily, one batch ahead.
+
+    for seg in segment_images(sorted(Path("session").glob("*.jpg")), batch_size=8):
+        print(seg.index, seg.labels)
+"""
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+from PIL import Image
+
+from model_registry import get_model, registry
+
+# Classes of the COCO dataset the torchvision model was trained on
+COCO_INSTANCE_CATEGORY_NAMES = [
+    '__background__', 'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus',
+    'train', 'truck', 'boat', 'traffic light', 'fire hydrant', 'N/A', 'stop sign',
+    'parking meter', 'bench', 'bird', 'cat', 'dog', 'horse', 'sheep', 'cow',
+    'elephant', 'bear', 'zebra', 'giraffe', 'N/A', 'backpack', 'umbrella', 'N/A', 'N/A',
+    'handbag', 'tie', 'suitcase', 'frisbee', 'skis', 'snowboard', 'sports ball',
+    'kite', 'baseball bat', 'baseball glove', 'skateboard', 'surfboard', 'tennis racket',
+    'bottle', 'N/A', 'wine glass', 'cup', 'fork', 'knife', 'spoon', 'bowl',
+    'banana', 'apple', 'sandwich', 'orange', 'broccoli', 'carrot', 'hot dog', 'pizza',
+    'donut', 'cake', 'chair', 'couch', 'potted plant', 'bed', 'N/A', 'dining table',
+    'N/A', 'N/A', 'toilet', 'N/A', 'tv', 'laptop', 'mouse', 'remote', 'keyboard', 'cell phone',
+    'microwave', 'oven', 'toaster', 'sink', 'refrigerator', 'N/A', 'book',
+    'clock', 'vase', 'scissors', 'teddy bear', 'hair drier', 'toothbrush'
+]
+
+
+class Segmentation(NamedTuple):
+    """Instances found in one image, highest score first."""
+
+    index: int
+    image: np.ndarray  # H x W x 3 RGB uint8
+    masks: np.ndarray  # N x H x W bool
+    boxes: np.ndarray  # N x 4 (x1, y1, x2, y2)
+    labels: List[str]
+    scores: np.ndarray  # N
+
+
+def load_image(image) -> np.ndarray:
+    """
+    Decode an image path, PIL image or array into an H x W x 3 RGB uint8 array.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        with Image.open(image) as img:
+            return np.asarray(img.convert("RGB"))
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("RGB"))
+    array = np.asarray(image)
+    if array.ndim == 2:
+        array = np.repeat(array[:, :, None], 3, axis=2)
+    if array.dtype != np.uint8:
+        array = np.clip(array * 255 if array.max() <= 1 else array, 0, 255).astype(np.uint8)
+    return array[:, :, :3]
+
+
+def postprocess(index, image, output, threshold=0.5, mask_threshold=0.5, categories=COCO_INSTANCE_CATEGORY_NAMES):
+    """
+    Turn raw model output for one image into a Segmentation.
+
+    Args:
+        index: Position of the image in the input
+        image: Decoded RGB image
+        output: Dict of NumPy arrays with ``scores``, ``labels``, ``boxes``
+            and soft ``masks`` (N x 1 x H x W)
+        threshold: Minimum instance score
+        mask_threshold: Soft mask value above which a pixel belongs to the instance
+        categories: Label index to name
+
+    Returns:
+        Segmentation
+    """
+    keep = np.flatnonzero(output["scores"] > threshold)
+    masks = output["masks"][keep]
+    if masks.ndim == 4:
+        masks = masks[:, 0]
+    return Segmentation(
+        index=index,
+        image=image,
+        masks=masks > mask_threshold,
+        boxes=output["boxes"][keep],
+        labels=[categories[int(i)] for i in output["labels"][keep]],
+        scores=output["scores"][keep],
+    )
+
+
+class TorchRunner:
+    """
+    Runs a torchvision detection model on a batch of RGB arrays.
+
+    Args:
+        model: Model to use, the registry's "maskrcnn" by default
+        device: Torch device, the registry's by default
+    """
+
+    def __init__(self, model=None, device=None):
+        self.model = model if model is not None else get_model("maskrcnn")
+        self.device = device if device is not None else registry.device
+
+    def __call__(self, images):
+        import torch
+
+        tensors = [
+            torch.from_numpy(np.ascontiguousarray(img)).to(self.device).permute(2, 0, 1).float().div_(255)
+            for img in images
+        ]
+        with torch.inference_mode():
+            outputs = self.model(tensors)
+        return [{k: v.cpu().numpy() for k, v in out.items()} for out in outputs]
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def segment_images(
+    images: Iterable,
+    threshold: float = 0.5,
+    batch_size: int = 4,
+    workers: Optional[int] = None,
+    runner=None,
+    mask_threshold: float = 0.5,
+) -> Iterator[Segmentation]:
+    """
+    Segment a stream of images in batches.
+
+    Args:
+        images: Image paths, PIL images or RGB arrays
+        threshold: Minimum instance score
+        batch_size: Images per forward pass
+        workers: Threads for decoding and post-processing, defaults to the CPU count
+        runner: Callable mapping a list of RGB arrays to a list of output
+            dicts, a TorchRunner by default
+        mask_threshold: Soft mask value above which a pixel belongs to the instance
+
+    Yields:
+        One Segmentation per input image, in input order
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    runner = runner if runner is not None else TorchRunner()
+    workers = workers or os.cpu_count() or 1
+    counter = itertools.count()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def decode(batch):
+            return [(next(counter), pool.submit(load_image, image)) for image in batch]
+
+        batches = _batches(images, batch_size)
+        pending = deque()
+        upcoming = decode(next(batches, []))
+        while upcoming:
+            current = [(index, future.result()) for index, future in upcoming]
+            # Start decoding the next batch before the forward pass
+            upcoming = decode(next(batches, []))
+            outputs = runner([image for _, image in current])
+            for (index, image), output in zip(current, outputs):
+                pending.append(pool.submit(postprocess, index, image, output, threshold, mask_threshold))
+            # Hand out what is finished, keeping at most one batch in flight
+            while pending and (pending[0].done() or len(pending) > batch_size):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
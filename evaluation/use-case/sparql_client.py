@@ -0,0 +1,337 @@
+"""
+Caching, rate-limited client for the Wikidata SPARQL endpoint.
+
+The query scripts each issued their own ``requests.get``: one without a
+timeout, one that kept retrying after a successful response.  SparqlClient
+is the shared replacement:
+
+* responses are cached on disk, keyed by endpoint and normalized query
+  text (comments dropped, whitespace outside literals and IRIs
+  collapsed), so re-running a script or a reformatted query costs no
+  request;
+* keep-alive connections to the endpoint are pooled and reused;
+* only failures are retried (connection errors, 429 and 5xx), with
+  exponential backoff or the server's Retry-After; other errors raise;
+* ``paginate`` pages through large results with LIMIT/OFFSET;
+* ``map`` runs many queries on a thread pool, with all threads sharing
+  one request-rate limit, which the endpoint's usage policy asks for.
+
+    client = SparqlClient()
+    rows = client.bindings(items_query("Q1075"))
+    results = client.map([items_query(i) for i in ("Q1075", "Q22964093")])
+
+The cache lives in ``~/.cache/orka/sparql`` (ORKA_CACHE_DIR moves the
+cache root); with ORKA_OFFLINE=1 only cached responses are returned.  Only
+the standard library is used.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+WIKIDATA_ENDPOINT = "https://query.wikidata.org/sparql"
+USER_AGENT = "orka-sparql-client/1.0 (https://w3id.org/def/orka)"
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def default_cache_dir() -> Path:
+    root = os.environ.get("ORKA_CACHE_DIR")
+    return (Path(root) if root else Path.home() / ".cache" / "orka") / "sparql"
+
+
+def offline() -> bool:
+    return os.environ.get("ORKA_OFFLINE", "") not in ("", "0")
+
+
+class SparqlError(RuntimeError):
+    """A query failed; ``status`` is the HTTP status, None for connection errors."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def normalize_query(query: str) -> str:
+    """
+    Query text with comments removed and whitespace collapsed.
+
+    String literals and IRIs are kept as they are; ``#`` only starts a
+    comment outside them.
+    """
+    out = []
+    quote = None
+    in_iri = in_comment = escaped = blank = False
+    for ch in query:
+        if in_comment:
+            if ch == "\n":
+                in_comment = False
+                blank = True
+            continue
+        if quote:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+            continue
+        if in_iri:
+            # IRIs hold no whitespace, so a "<" comparison ends at the next blank
+            if not ch.isspace():
+                out.append(ch)
+                in_iri = ch != ">"
+                continue
+            in_iri = False
+        if ch.isspace():
+            blank = True
+            continue
+        if ch == "#":
+            in_comment = True
+            continue
+        if blank and out:
+            out.append(" ")
+        blank = False
+        if ch in "\"'":
+            quote = ch
+        elif ch == "<":
+            in_iri = True
+        out.append(ch)
+    return "".join(out)
+
+
+def items_query(entity_id: str, limit: Optional[int] = 200) -> str:
+    """Instances of an entity and properties that are subproperties of it, with English labels."""
+    query = """
+    SELECT ?item ?itemLabel WHERE {
+      { ?item wdt:P31* wd:%s . }
+      UNION
+      { ?item wdt:P1647 wd:%s . }
+      SERVICE wikibase:label { bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en". }
+    }
+    """ % (entity_id, entity_id)
+    return query + (f"LIMIT {limit}\n" if limit else "")
+
+
+class QueryCache:
+    """SPARQL JSON responses on disk, one file per endpoint and normalized query."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+
+    @staticmethod
+    def key(endpoint: str, query: str) -> str:
+        return hashlib.sha256(f"{endpoint}\n{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def path(self, endpoint: str, query: str) -> Path:
+        key = self.key(endpoint, query)
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, endpoint: str, query: str, max_age: Optional[float] = None) -> Optional[dict]:
+        path = self.path(endpoint, query)
+        try:
+            if max_age is not None and time.time() - path.stat().st_mtime > max_age:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, endpoint: str, query: str, result: dict) -> None:
+        path = self.path(endpoint, query)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class SparqlClient:
+    """
+    Args:
+        endpoint: SPARQL endpoint URL
+        cache_dir: Response cache directory; None for the default, False to disable
+        timeout: Seconds per request
+        retries: Attempts per query, including the first
+        backoff: Base delay in seconds; attempt ``n`` waits ``backoff * 2**n``
+        rate: Requests per second across all threads; None for no limit
+        max_age: Seconds a cached response stays valid; None keeps it forever
+        user_agent: Sent with every request, as Wikidata asks
+    """
+
+    def __init__(
+        self,
+        endpoint: str = WIKIDATA_ENDPOINT,
+        cache_dir=None,
+        timeout: float = 60.0,
+        retries: int = 5,
+        backoff: float = 1.0,
+        rate: Optional[float] = 5.0,
+        max_age: Optional[float] = None,
+        user_agent: str = USER_AGENT,
+    ):
+        self.endpoint = endpoint
+        self.cache = QueryCache(cache_dir) if cache_dir is not False else None
+        self.timeout = timeout
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.limiter = RateLimiter(rate)
+        self.max_age = max_age
+        self.user_agent = user_agent
+        self.requests = 0
+        self.cache_hits = 0
+        url = urlsplit(endpoint)
+        self._https = url.scheme == "https"
+        self._host = url.netloc
+        self._path = url.path or "/"
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        """An idle keep-alive connection, or a new one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+    def _request(self, query: str) -> dict:
+        target = self._path + "?" + urlencode({"query": query, "format": "json"})
+        headers = {"Accept": "application/sparql-results+json", "User-Agent": self.user_agent}
+        error, delay = None, 0.0
+        for attempt in range(self.retries):
+            if error is not None:
+                time.sleep(delay)
+            self.limiter.wait()
+            delay = self.backoff * 2 ** attempt
+            conn = self._acquire()
+            try:
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                error = SparqlError(f"Request to {self.endpoint} failed: {e}")
+                continue
+            self._release(conn)
+            with self._lock:
+                self.requests += 1
+            if response.status == 200:
+                try:
+                    return json.loads(body)
+                except ValueError as e:
+                    # A truncated or proxy-mangled body; the query may well succeed again
+                    error = SparqlError(f"{self.endpoint} answered 200 with invalid JSON: {e}", response.status)
+                    continue
+            message = f"{self.endpoint} answered {response.status}: {body[:200].decode('utf-8', 'replace')}"
+            if response.status not in RETRY_STATUS:
+                raise SparqlError(message, response.status)
+            retry_after = response.getheader("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            error = SparqlError(message, response.status)
+        raise error
+
+    def query(self, query: str, refresh: bool = False) -> dict:
+        """
+        SPARQL JSON result of a query.
+
+        Args:
+            query: Query text
+            refresh: Skip the cached response; the new one is still cached
+        """
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(self.endpoint, query, self.max_age)
+            if cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return cached
+        if offline():
+            raise SparqlError("ORKA_OFFLINE is set and the query is not cached")
+        result = self._request(query)
+        if self.cache is not None:
+            self.cache.put(self.endpoint, query, result)
+        return result
+
+    def bindings(self, query: str, refresh: bool = False) -> List[dict]:
+        return self.query(query, refresh)["results"]["bindings"]
+
+    def paginate(self, query: str, page_size: int = 1000, max_pages: Optional[int] = None) -> Iterator[dict]:
+        """
+        Yield the bindings of a query page by page with LIMIT/OFFSET.
+
+        The query should have an ORDER BY so pages do not overlap, and no
+        LIMIT or OFFSET of its own.
+        """
+        tail = normalize_query(query).upper().rsplit("}", 1)[-1]
+        if "LIMIT" in tail or "OFFSET" in tail:
+            raise ValueError("paginate adds LIMIT and OFFSET itself")
+        page = 0
+        while max_pages is None or page < max_pages:
+            rows = self.bindings(f"{query.rstrip()}\nLIMIT {page_size} OFFSET {page * page_size}")
+            yield from rows
+            if len(rows) < page_size:
+                return
+            page += 1
+
+    def map(self, queries: Iterable[str], workers: int = 4) -> List[dict]:
+        """Run queries concurrently under the shared rate limit; results are in input order."""
+        queries = list(queries)
+        if workers <= 1 or len(queries) <= 1:
+            return [self.query(q) for q in queries]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.query, queries))
+
+
+_default: Optional[SparqlClient] = None
+
+
+def default_client() -> SparqlClient:
+    """Process-wide client for the Wikidata endpoint."""
+    global _default
+    if _default is None:
+        _default = SparqlClient()
+    return _default
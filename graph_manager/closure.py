@@ -0,0 +1,214 @@
+"""
+Materialized subclass/subproperty closure for hierarchy queries.
+
+SPARQL property paths such as ``rdf:type/rdfs:subClassOf*`` are evaluated by
+rdflib with a fresh graph traversal for every binding.  HierarchyClosure
+precomputes the transitive closure of ``rdfs:subClassOf`` and
+``rdfs:subPropertyOf`` and ``rewrite`` swaps the ``*`` and ``+`` paths over
+those predicates in a parsed query for ClosurePath, which answers them
+with dictionary lookups while keeping the SPARQL path semantics.
+"""
+
+import copy
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+import rdflib
+from rdflib.namespace import RDFS
+from rdflib.paths import AlternativePath, InvPath, MulPath, Path, SequencePath
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.algebra import traverse
+
+HIERARCHY_PREDICATES = (RDFS.subClassOf, RDFS.subPropertyOf)
+
+
+def _transitive_closure(edges: Dict[rdflib.term.Node, Set[rdflib.term.Node]]):
+    """Map every node to all nodes reachable from it (itself only via a cycle)."""
+    reachable = {}
+    for node in edges:
+        found = set()
+        frontier = list(edges[node])
+        while frontier:
+            current = frontier.pop()
+            if current in found:
+                continue
+            found.add(current)
+            frontier.extend(edges.get(current, ()))
+        reachable[node] = frozenset(found)
+    return reachable
+
+
+class HierarchyClosure:
+    """
+    Transitive subclass/subproperty closure over a set of graphs.
+
+    The closure is rebuilt by ``refresh()`` whenever the number of hierarchy
+    triples in the source graphs changed or after ``invalidate()``.  Edits
+    that replace a hierarchy triple without changing the counts need an
+    explicit ``invalidate()``.
+
+    Args:
+        graphs: Graphs whose hierarchy triples are closed over, usually the
+            ontology and the observation graph
+    """
+
+    MAX_PREPARED = 256
+
+    def __init__(self, graphs: Iterable[rdflib.Graph]):
+        self.graphs: List[rdflib.Graph] = list(graphs)
+        self.up: Dict[rdflib.URIRef, Dict] = {p: {} for p in HIERARCHY_PREDICATES}
+        self.down: Dict[rdflib.URIRef, Dict] = {p: {} for p in HIERARCHY_PREDICATES}
+        self._signature = None
+        self._counts: Dict[int, tuple] = {}
+        self._prepared: Dict = {}
+        self.rebuilds = 0
+
+    def _current_signature(self):
+        # Only graphs whose size changed are rescanned, so the ontology's
+        # hierarchy is counted once rather than on every query
+        signature = []
+        for i, g in enumerate(self.graphs):
+            size = len(g)
+            previous = self._counts.get(i)
+            if previous is None or previous[0] != size:
+                counts = tuple(sum(1 for _ in g.triples((None, p, None))) for p in HIERARCHY_PREDICATES)
+                self._counts[i] = previous = (size, counts)
+            signature.append(previous[1])
+        return tuple(signature)
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next refresh."""
+        self._signature = None
+        self._counts.clear()
+
+    def refresh(self) -> None:
+        """Rebuild the closure if the source hierarchy changed."""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+
+        for predicate in HIERARCHY_PREDICATES:
+            edges: Dict = {}
+            for g in self.graphs:
+                for child, parent in g.subject_objects(predicate):
+                    edges.setdefault(child, set()).add(parent)
+            up = _transitive_closure(edges)
+            down: Dict = {}
+            for child, parents in up.items():
+                for parent in parents:
+                    down.setdefault(parent, set()).add(child)
+            self.up[predicate] = up
+            self.down[predicate] = {node: frozenset(children) for node, children in down.items()}
+        self._signature = signature
+        self.rebuilds += 1
+
+    def _lookup(self, table, predicate, node, reflexive):
+        self.refresh()
+        found = table[predicate].get(node, frozenset())
+        return found | {node} if reflexive else found
+
+    def superclasses(self, cls, reflexive: bool = True) -> FrozenSet:
+        return self._lookup(self.up, RDFS.subClassOf, cls, reflexive)
+
+    def subclasses(self, cls, reflexive: bool = True) -> FrozenSet:
+        return self._lookup(self.down, RDFS.subClassOf, cls, reflexive)
+
+    def superproperties(self, prop, reflexive: bool = True) -> FrozenSet:
+        return self._lookup(self.up, RDFS.subPropertyOf, prop, reflexive)
+
+    def subproperties(self, prop, reflexive: bool = True) -> FrozenSet:
+        return self._lookup(self.down, RDFS.subPropertyOf, prop, reflexive)
+
+    def rewrite(self, query, initNs=None):
+        """
+        Prepare a query with its hierarchy ``*``/``+`` paths answered from
+        this closure.
+
+        Args:
+            query: SPARQL query string or prepared query (left untouched).
+                Rewritten query strings are cached.
+            initNs: Prefix bindings for parsing a query string
+
+        Returns:
+            Prepared query to run against the graphs of this closure
+        """
+        if isinstance(query, str):
+            key = (query, tuple(sorted((initNs or {}).items())))
+            prepared = self._prepared.get(key)
+            if prepared is not None:
+                return prepared
+            prepared = prepareQuery(query, initNs=initNs or {})
+            if len(self._prepared) >= self.MAX_PREPARED:
+                self._prepared.clear()
+            self._prepared[key] = prepared
+        else:
+            prepared = copy.deepcopy(query)
+
+        def visit(node):
+            if isinstance(node, Path):
+                return self._rewrite_path(node)
+            return None
+
+        traverse(prepared.algebra, visitPost=visit)
+        return prepared
+
+    def _rewrite_path(self, path):
+        if isinstance(path, MulPath):
+            if path.path in HIERARCHY_PREDICATES and path.more:
+                return ClosurePath(self, path.path, reflexive=path.zero)
+            return MulPath(self._rewrite_path(path.path), path.mod)
+        if isinstance(path, SequencePath):
+            return SequencePath(*(self._rewrite_path(arg) for arg in path.args))
+        if isinstance(path, AlternativePath):
+            return AlternativePath(*(self._rewrite_path(arg) for arg in path.args))
+        if isinstance(path, InvPath):
+            return InvPath(self._rewrite_path(path.arg))
+        return path
+
+
+class ClosurePath(Path):
+    """
+    ``predicate*`` (reflexive) or ``predicate+`` answered from a HierarchyClosure.
+    """
+
+    def __init__(self, closure: HierarchyClosure, predicate: rdflib.URIRef, reflexive: bool):
+        self.closure = closure
+        self.predicate = predicate
+        self.reflexive = reflexive
+
+    def eval(self, graph, subj=None, obj=None):
+        up = self.closure.up[self.predicate]
+        down = self.closure.down[self.predicate]
+        if subj is not None and obj is not None:
+            if obj in up.get(subj, ()) or (self.reflexive and subj == obj):
+                yield subj, obj
+        elif subj is not None:
+            if self.reflexive:
+                yield subj, subj
+            for parent in up.get(subj, ()):
+                if not (self.reflexive and parent == subj):
+                    yield subj, parent
+        elif obj is not None:
+            if self.reflexive:
+                yield obj, obj
+            for child in down.get(obj, ()):
+                if not (self.reflexive and child == obj):
+                    yield child, obj
+        else:
+            seen = set()
+            if self.reflexive:
+                # Zero-length paths match every node of the graph
+                for s, o in graph.subject_objects(None):
+                    for node in (s, o):
+                        if node not in seen:
+                            seen.add(node)
+                            yield node, node
+            for child, parents in up.items():
+                for parent in parents:
+                    if not (self.reflexive and parent == child):
+                        yield child, parent
+
+    def n3(self, namespace_manager=None):
+        return f"{self.predicate.n3(namespace_manager)}{'*' if self.reflexive else '+'}"
+
+    def __repr__(self):
+        return f"ClosurePath({self.n3()})"
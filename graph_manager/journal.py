@@ -0,0 +1,248 @@
+"""
+Append-only persistence for observation graphs.
+
+Triples are streamed to an N-Quads journal as they are added instead of
+re-serializing the whole graph on every save.  Additions are written as
+plain triples; removals are written as quads in the ``REMOVED`` graph so a
+replay can apply both in order.  ``compact`` rolls a journal into a Turtle
+snapshot offline and ``load_journaled_graph`` rebuilds a graph from
+snapshot + journal.
+
+    python -m graph_manager.journal compact session.nq session.ttl
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import rdflib
+
+from .ntriples import nt_line, nt_lines
+
+# Graph name marking a journal line as a removal
+REMOVED = rdflib.URIRef("urn:orka:journal#removed")
+_REMOVED_SUFFIX = f" {REMOVED.n3()} .\n"
+
+
+class GraphJournal:
+    """
+    Append-only N-Quads log with batched fsync.
+
+    Lines are buffered and flushed + fsynced once ``fsync_every`` lines
+    have accumulated, and by a background thread once they have waited
+    ``fsync_interval`` seconds, so a crash loses at most one batch or one
+    interval of writes, even if no further line follows.  ``sync`` and
+    ``close`` flush immediately.
+
+    Args:
+        path: Journal file, created if missing
+        fsync_every: Lines written between fsyncs, 0 disables fsync
+        fsync_interval: Seconds unsynced lines may wait, 0 disables the
+            background sync
+    """
+
+    def __init__(self, path: Union[str, Path], fsync_every: int = 1024, fsync_interval: float = 1.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self.lines_written = 0
+        self._stop = threading.Event()
+        self._syncer = None
+        if fsync_every and fsync_interval:
+            self._syncer = threading.Thread(target=self._sync_periodically, name="journal-sync", daemon=True)
+            self._syncer.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def add(self, triple) -> None:
+        self._write(nt_line(triple))
+
+    def add_all(self, triples: Iterable) -> None:
+        self._write(nt_lines(triples))
+
+    def remove_all(self, triples: Iterable) -> None:
+        self._write("".join(nt_line(t)[:-3] + _REMOVED_SUFFIX for t in triples))
+
+    def _write(self, text: str) -> None:
+        if not text:
+            return
+        count = text.count("\n")
+        with self._lock:
+            self._file.write(text)
+            self.lines_written += count
+            self._unsynced += count
+            if self.fsync_every and self._unsynced >= self.fsync_every:
+                self._sync()
+
+    def _sync_periodically(self) -> None:
+        while not self._stop.wait(self.fsync_interval):
+            with self._lock:
+                if self._unsynced and not self._file.closed:
+                    self._sync()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def sync(self) -> None:
+        """Flush buffered lines and fsync the journal file."""
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def replay_journal(journal_path: Union[str, Path], graph: Optional[rdflib.Graph] = None) -> rdflib.Graph:
+    """
+    Apply a journal to a graph in order.
+
+    A trailing line without a newline is the remains of a crashed write and
+    is ignored.
+
+    Args:
+        journal_path: Journal to replay
+        graph: Graph to apply it to, a new one if omitted
+
+    Returns:
+        The updated graph
+    """
+    if graph is None:
+        graph = rdflib.Graph()
+    path = Path(journal_path)
+    if not path.exists():
+        return graph
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    # Everything after the last newline is an incomplete record
+    lines.pop()
+
+    # Parse consecutive runs of additions or removals in bulk
+    run, removing = [], False
+    for line in lines:
+        is_removal = line.endswith(_REMOVED_SUFFIX[:-1])
+        if run and is_removal != removing:
+            _apply_run(graph, run, removing)
+            run = []
+        removing = is_removal
+        run.append(line)
+    if run:
+        _apply_run(graph, run, removing)
+    return graph
+
+
+def _apply_run(graph: rdflib.Graph, lines, removing: bool) -> None:
+    data = "\n".join(lines) + "\n"
+    if removing:
+        parsed = rdflib.Dataset()
+        parsed.parse(data=data, format="nquads")
+        for s, p, o in parsed.graph(REMOVED):
+            graph.remove((s, p, o))
+    else:
+        parsed = rdflib.Graph()
+        parsed.parse(data=data, format="nt")
+        graph.addN((s, p, o, graph) for s, p, o in parsed)
+
+
+def load_journaled_graph(
+    snapshot_path: Optional[Union[str, Path]] = None,
+    journal_path: Optional[Union[str, Path]] = None,
+    graph: Optional[rdflib.Graph] = None,
+) -> rdflib.Graph:
+    """
+    Rebuild a graph from a Turtle snapshot followed by its journal.
+
+    Args:
+        snapshot_path: Compacted Turtle snapshot, skipped if missing
+        journal_path: Journal written after the snapshot, skipped if missing
+        graph: Graph to load into, a new one if omitted
+
+    Returns:
+        The loaded graph
+    """
+    if graph is None:
+        graph = rdflib.Graph()
+    if snapshot_path is not None and Path(snapshot_path).exists():
+        graph.parse(str(snapshot_path), format="turtle")
+    if journal_path is not None:
+        replay_journal(journal_path, graph)
+    return graph
+
+
+def compact(journal_path: Union[str, Path], snapshot_path: Union[str, Path]) -> int:
+    """
+    Roll a journal into its Turtle snapshot and truncate the journal.
+
+    Must not run while a GraphJournal is writing to ``journal_path``.  The
+    snapshot is replaced atomically before the journal is truncated, so an
+    interruption at any point leaves a state that replays correctly.
+
+    Args:
+        journal_path: Journal to compact
+        snapshot_path: Snapshot to merge into, created if missing
+
+    Returns:
+        Number of triples in the new snapshot
+    """
+    snapshot_path = Path(snapshot_path)
+    graph = load_journaled_graph(snapshot_path, journal_path)
+
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(snapshot_path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            graph.serialize(destination=f, format="turtle")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, snapshot_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+    with open(journal_path, "w", encoding="utf-8") as f:
+        f.flush()
+        os.fsync(f.fileno())
+    return len(graph)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain ORKA observation journals")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compact_parser = sub.add_parser("compact", help="roll a journal into a Turtle snapshot")
+    compact_parser.add_argument("journal")
+    compact_parser.add_argument("snapshot")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        count = compact(args.journal, args.snapshot)
+        print(f"compacted {args.journal} into {args.snapshot} ({count} triples)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,118 @@
 import rdflib
-from pathlib import Path
-from rdflib.namespace import RDF
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.namespace import RDF, XSD
+from rdflib.paths import Path
+from rdflib.store import TripleAddedEvent
+import datetime
 import json
 import random
 import uuid
 
+from .closure import HierarchyClosure
+from .journal import GraphJournal, load_journaled_graph
+from .materializer import Materializer
+from .ontology import DEFAULT_ONTOLOGY_PATH, load_ontology
+from .retention import ObservationArchive, ObservationUnit, ObservationWindow, _iter_units, epoch_seconds
+from .time_index import LatestResults, TimeIndex
+from .sqlite_store import SQLiteStore  # also registers the "SQLite" store plugin
+
+
+SOSA = rdflib.Namespace("http://www.w3.org/ns/sosa/")
+
+
+class _UnionView(ReadOnlyGraphAggregate):
+    """
+    ReadOnlyGraphAggregate that evaluates property paths once.
+
+    The rdflib aggregate evaluates a path once per member graph (each time
+    over the whole aggregate) and rebinds the pattern terms while doing so,
+    which duplicates path matches and can drop others.
+    """
+
+    def triples(self, triple):
+        s, p, o = triple
+        if isinstance(p, Path):
+            for s1, o1 in p.eval(self, s, o):
+                yield s1, p, o1
+        else:
+            yield from super().triples(triple)
+
+
+class _ObservationGraph(rdflib.Graph):
+    """
+    Graph that reports the triples removed from it.
+
+    rdflib stores announce a removal with the pattern that was passed in,
+    if at all (the in-memory store does not), so ``remove`` looks up the
+    matching triples first and hands them to each of ``removal_hooks``
+    before they go.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.removal_hooks = []
+
+    def remove(self, triple):
+        if not self.removal_hooks:
+            return super().remove(triple)
+        if None in triple:
+            self.remove_triples(list(self.triples(triple)))
+        elif triple in self:
+            self.remove_triples([triple])
+        return self
+
+    def remove_triples(self, triples):
+        """Remove triples of the graph, reporting them to the hooks as one batch."""
+        triples = list(triples)
+        if not triples:
+            return
+        for hook in self.removal_hooks:
+            hook(triples)
+        for triple in triples:
+            super().remove(triple)
+
 
 class GraphManager:
-    def __init__(self, base_uri = "http://example.org/orka/observation_graph/"):
+    def __init__(self, base_uri = "http://example.org/orka/observation_graph/", owl_path=DEFAULT_ONTOLOGY_PATH, use_snapshot=True, store="default", store_path=None):
+        """
+        Args:
+            base_uri: Namespace for the observation graph's resources
+            owl_path: Ontology to load as the TBox
+            use_snapshot: Load the ontology through its on-disk snapshot
+            store: rdflib store plugin for the observation graph, e.g.
+                "SQLite" to keep observations on disk
+            store_path: Configuration passed to the store's open(), e.g. the
+                database file; an existing store is reopened as is.
+                Required for "SQLite" unless an open store is passed
+        """
         self.ORKA = rdflib.Namespace("https://w3id.org/def/orka#")
-        owl_path = Path(__file__).resolve().parent.parent / "orka.owl"
-        self.graph = rdflib.Graph()
-        self.graph.parse(str(owl_path))
+        # TBox: one read-only ontology graph shared by every manager in the process
+        self.ontology = load_ontology(owl_path, use_snapshot=use_snapshot)
+        # ABox: this session's observations, the only graph that gets saved
+        self.graph = _ObservationGraph(store=store)
+        if store_path is not None:
+            self.graph.open(str(store_path), create=True)
+        elif isinstance(self.graph.store, SQLiteStore) and not self.graph.store.is_open:
+            raise ValueError(f"store {store!r} requires store_path")
+        for prefix, ns in self.ontology.namespaces():
+            self.graph.bind(prefix, ns, override=True)
         self.graph.bind("orka", self.ORKA)
+        # Read-only view over both, used for queries
+        self.union = _UnionView([self.graph, self.ontology])
+        # rdfs:subClassOf/subPropertyOf closure for use_closure queries
+        self.closure = HierarchyClosure([self.ontology, self.graph])
+        self.journal = None
+        # Incremental inferences, see enable_reasoning
+        self.inferred = None
+        self.materializer = None
+        # Sliding window over observations, see enable_retention
+        self.retention = None
+        self.archive = None
+        # Observations by time per sensor and per entity and the newest
+        # result per (entity, characteristic), built on first use
+        self.sensor_times = None
+        self.entity_times = None
+        self.latest = None
         self.obs_graph_base = rdflib.Namespace(base_uri)
 
     def add_robot(self, robot_name):
@@ -57,8 +157,169 @@ class GraphManager:
         self.graph.add((result_uri, RDF.type, self.ORKA.Result))
         return result_uri
     
-    def save_graph(self, file_path, format="turtle"):
-        self.graph.serialize(destination=file_path, format=format)
+    def save_graph(self, file_path, format="turtle", include_ontology=False):
+        """Serialize the observation graph, optionally merged with the ontology."""
+        graph = self.graph
+        if include_ontology:
+            graph = rdflib.Graph()
+            for prefix, ns in self.graph.namespaces():
+                graph.bind(prefix, ns, override=True)
+            graph += self.ontology
+            graph += self.graph
+        graph.serialize(destination=file_path, format=format)
+
+    def enable_journal(self, journal_path, snapshot_path=None, **journal_options):
+        """
+        Stream every triple added to or removed from the observation graph to a journal.
+
+        An existing snapshot and journal are replayed into the graph first,
+        so a restarted session continues where it stopped.
+
+        Args:
+            journal_path: N-Quads journal to append to
+            snapshot_path: Compacted Turtle snapshot to restore from
+            journal_options: Passed on to GraphJournal (fsync_every, fsync_interval)
+
+        Returns:
+            The open GraphJournal
+        """
+        self.close_journal()
+        load_journaled_graph(snapshot_path, journal_path, graph=self.graph)
+        self.journal = GraphJournal(journal_path, **journal_options)
+        if not getattr(self, "_journal_subscribed", False):
+            self.graph.store.dispatcher.subscribe(TripleAddedEvent, self._journal_added)
+            self.graph.removal_hooks.append(self._journal_removed)
+            self._journal_subscribed = True
+        return self.journal
+
+    def enable_reasoning(self):
+        """
+        Keep OWL-RL/RDFS inferences over the observation graph up to date.
+
+        Inferences go to ``self.inferred``, which queries see but
+        ``save_graph`` leaves out.  Triples already in the graph are
+        materialized now; later ones after each add_observations call or
+        before the next query.  Removed triples, evicted observations
+        among them, take the inferences that rest on them along; class and
+        property axioms added to the observation graph apply like those of
+        the ontology.
+
+        Returns:
+            The Materializer
+        """
+        if self.materializer is None:
+            self.inferred = rdflib.Graph()
+            # Axioms added to the observation graph count as schema too
+            self.materializer = Materializer([self.ontology, self.graph], self.graph, self.inferred)
+            self.graph.store.dispatcher.subscribe(TripleAddedEvent, self._reasoning_added)
+            self.graph.removal_hooks.append(self.materializer.retract)
+            self.materializer.materialize(list(self.graph))
+            self.union = _UnionView([self.graph, self.inferred, self.ontology])
+        return self.materializer
+
+    def enable_retention(self, max_age=None, max_observations=None, max_triples=None, archive_dir=None):
+        """
+        Bound the observation graph by evicting the oldest observations.
+
+        Each evicted observation is removed together with its measurement
+        and result; robots, sensors, procedures, entities and
+        characteristics are never evicted.  Observations already in the
+        graph are indexed once now, later ones as they are added.
+
+        Args:
+            max_age: Seconds (or timedelta) behind the newest observation
+                time after which an observation is evicted
+            max_observations: Number of observations kept
+            max_triples: Observation graph size above which the oldest
+                observations are evicted
+            archive_dir: Directory receiving evicted triples as gzipped
+                N-Triples before they are removed
+
+        Returns:
+            The ObservationWindow
+        """
+        self.retention = ObservationWindow(max_age, max_observations, max_triples)
+        self.archive = ObservationArchive(archive_dir) if archive_dir is not None else None
+        for unit in _iter_units(self.graph, self.ORKA, SOSA.resultTime):
+            self.retention.add(unit)
+        self._apply_retention()
+        return self.retention
+
+    def _apply_retention(self):
+        """Evict observations until the window limits hold; returns how many."""
+        window = self.retention
+        if window is None or not window.over_limit(len(self.graph)):
+            return 0
+        evicted = []
+        count = 0
+        triples = set()
+        while window.over_limit(len(self.graph) - len(triples)):
+            unit = window.pop()
+            count += 1
+            unit_triples = set()
+            for node in unit[1:]:
+                unit_triples.update(self.graph.triples((node, None, None)))
+                unit_triples.update(self.graph.triples((None, None, node)))
+            unit_triples -= triples
+            triples |= unit_triples
+            if self.archive is not None:
+                evicted.append((unit, unit_triples))
+            if self.sensor_times is not None:
+                self._unindex_observation(unit, unit_triples)
+        # Journaled, and retracted from the inferences, as one batch
+        self.graph.remove_triples(triples)
+        if self.materializer is not None:
+            self.materializer.run()
+        if self.archive is not None:
+            self.archive.write(evicted)
+        self.commit()
+        return count
+
+    def _reasoning_added(self, event):
+        self.materializer.notify(event.triple)
+
+    def close_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def commit(self):
+        """Commit pending writes of a transactional store such as SQLite and sync the journal."""
+        if self.graph.store.transaction_aware:
+            self.graph.commit()
+        if self.journal is not None:
+            self.journal.sync()
+
+    def close(self):
+        """Close the journal and the observation graph's store."""
+        self.close_journal()
+        self.graph.close(commit_pending_transaction=True)
+
+    def _journal_added(self, event):
+        if self.journal is not None:
+            self.journal.add(event.triple)
+
+    def _journal_removed(self, triples):
+        if self.journal is not None:
+            self.journal.remove_all(triples)
+
+    def query(self, query_object, use_closure=False, **kwargs):
+        """
+        Run a SPARQL query over the observations and the ontology.
+
+        With ``use_closure`` the rdfs:subClassOf/subPropertyOf ``*`` and ``+``
+        paths are answered from the precomputed hierarchy closure instead of
+        being traversed per binding.  The closure is rebuilt first if the
+        class or property hierarchy changed since the last query.
+        """
+        # The aggregate view does not expose the session's prefix bindings
+        kwargs.setdefault("initNs", dict(self.graph.namespaces()))
+        if self.materializer is not None:
+            self.materializer.run()
+        if use_closure:
+            self.closure.refresh()
+            query_object = self.closure.rewrite(query_object, initNs=kwargs.pop("initNs"))
+        return self.union.query(query_object, **kwargs)
 
     def build_static_graph(self, robot_name, sensors, procedures):
         self.add_robot(robot_name)
@@ -72,24 +333,276 @@ class GraphManager:
             self.add_procedure(procedure)
 
 
-    def update_graph_with_observation(self, observation_name, measurement_name, sensor, result, procedure_name=None, entity_name=None, characteristic_name=None):
-        observation = self.add_observation(observation_name)
-        measurement = self.add_Measurement(measurement_name)
-        result_uri = self.add_result(result)
-        self.graph.add((observation, self.ORKA.hasMeasurement, measurement))
-        self.graph.add((measurement, self.ORKA.hasResult, result_uri))
-        self.graph.add((measurement, self.ORKA.madeBySensor, sensor))
-        if procedure_name:
-            procedure = self.add_procedure(procedure_name)
-            self.graph.add((measurement, self.ORKA.usedProcedure, procedure))
-        if entity_name:
-            entity = self.add_entity(entity_name)
-            self.graph.add((observation, self.ORKA.ofEntity, entity))
-        if characteristic_name:
-            characteristic = self.add_characteristic(characteristic_name)
-            self.graph.add((entity, self.ORKA.hasCharacteristic, characteristic))
+    def update_graph_with_observation(self, observation_name, measurement_name, sensor, result, procedure_name=None, entity_name=None, characteristic_name=None, value=None, timestamp=None):
+        self.add_observations([{
+            "observation_name": observation_name,
+            "measurement_name": measurement_name,
+            "sensor": sensor,
+            "result": result,
+            "procedure_name": procedure_name,
+            "entity_name": entity_name,
+            "characteristic_name": characteristic_name,
+            "value": value,
+            "timestamp": timestamp,
+        }])
         return self.graph
 
+    def add_observations(self, records):
+        """
+        Add many observations in one bulk insert.
+
+        Args:
+            records: Iterable of mappings with the keyword arguments of
+                update_graph_with_observation, a NumPy structured array with
+                those field names, or a mapping of field name to column.
+                A ``value`` becomes the result's orka:hasValue and a
+                ``timestamp`` (datetime, ISO string or epoch seconds) the
+                observation's sosa:resultTime, which defaults to now.
+
+        Returns:
+            Number of observations added
+        """
+        columns = self._record_columns(records)
+        triples = self._observation_triples(columns)
+        self.graph.addN((s, p, o, self.graph) for s, p, o in triples)
+        if self.materializer is not None:
+            self.materializer.run()
+        if self.retention is not None or self.sensor_times is not None:
+            self._track_observations(columns)
+        return len(columns["observation_name"])
+
+    def observation_triples(self, records):
+        """
+        Triples add_observations would add for ``records``, without adding them.
+
+        Args:
+            records: Observation records in any form add_observations takes
+
+        Returns:
+            List of (subject, predicate, object) triples
+        """
+        return self._observation_triples(self._record_columns(records))
+
+    def _record_columns(self, records):
+        columns = _observation_columns(records)
+        # Observations without a time get the time they were recorded
+        timestamps = columns.get("timestamp")
+        if timestamps is None or None in timestamps:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            count = len(columns["observation_name"])
+            columns["timestamp"] = [now if t is None else t for t in (timestamps or [None] * count)]
+        return columns
+
+    def _track_observations(self, columns):
+        """Feed new observations to the retention window and time indexes."""
+        base = str(self.obs_graph_base)
+        sensors = self._mint_column(columns["sensor"])
+        missing = [None] * len(sensors)
+        entities = self._mint_column(columns.get("entity_name") or missing)
+        characteristics = self._mint_column(columns.get("characteristic_name") or missing)
+        rows = zip(columns["observation_name"], columns["measurement_name"], columns["result"],
+                   columns["timestamp"], sensors, entities, characteristics, columns.get("value") or missing)
+        for observation, measurement, result, timestamp, sensor, entity, characteristic, value in rows:
+            unit = ObservationUnit(
+                epoch_seconds(timestamp),
+                rdflib.URIRef(base + observation),
+                rdflib.URIRef(base + measurement),
+                rdflib.URIRef(base + result),
+            )
+            if self.retention is not None:
+                self.retention.add(unit)
+            if self.sensor_times is not None:
+                self.sensor_times.add(sensor, unit)
+                if entity is not None:
+                    self.entity_times.add(entity, unit)
+                    if characteristic is not None:
+                        self.latest.update((entity, characteristic), unit, value)
+        if self.retention is not None:
+            self._apply_retention()
+
+    def _build_time_indexes(self):
+        """Index the observations already in the graph, once."""
+        self.sensor_times, self.entity_times, self.latest = TimeIndex(), TimeIndex(), LatestResults()
+        ORKA = self.ORKA
+        for unit in _iter_units(self.graph, ORKA, SOSA.resultTime):
+            for sensor in self.graph.objects(unit.measurement, ORKA.madeBySensor):
+                self.sensor_times.add(sensor, unit)
+            for entity in self.graph.objects(unit.observation, ORKA.ofEntity):
+                self.entity_times.add(entity, unit)
+                value = self.graph.value(unit.result, ORKA.hasValue)
+                for characteristic in self.graph.objects(unit.measurement, ORKA.ofCharacteristic):
+                    self.latest.update((entity, characteristic), unit, None if value is None else value.toPython())
+
+    def _unindex_observation(self, unit, triples):
+        entities, characteristics = [], []
+        for s, p, o in triples:
+            if p == self.ORKA.madeBySensor and s == unit.measurement:
+                self.sensor_times.remove(o, unit)
+            elif p == self.ORKA.ofEntity and s == unit.observation:
+                self.entity_times.remove(o, unit)
+                entities.append(o)
+            elif p == self.ORKA.ofCharacteristic and s == unit.measurement:
+                characteristics.append(o)
+        for entity in entities:
+            for characteristic in characteristics:
+                self.latest.discard((entity, characteristic), unit)
+
+    def _time_index(self, sensor, entity):
+        if (sensor is None) == (entity is None):
+            raise ValueError("Pass exactly one of sensor or entity")
+        if self.sensor_times is None:
+            self._build_time_indexes()
+        name = sensor if sensor is not None else entity
+        key = name if isinstance(name, rdflib.URIRef) else self.obs_graph_base[name]
+        return (self.sensor_times if sensor is not None else self.entity_times), key
+
+    def latest_observation(self, sensor=None, entity=None):
+        """
+        Most recent observation made by a sensor or of an entity.
+
+        Args:
+            sensor: Sensor name or URI
+            entity: Entity name or URI
+
+        Returns:
+            ObservationUnit (time, observation, measurement, result), or
+            None if there is none
+        """
+        index, key = self._time_index(sensor, entity)
+        return index.latest(key)
+
+    def current_result(self, entity, characteristic):
+        """
+        Newest observation of an entity's characteristic, in O(1).
+
+        Counts a hit or a miss in ``self.latest``.
+
+        Args:
+            entity: Entity name or URI
+            characteristic: Characteristic name or URI
+
+        Returns:
+            LatestResult (unit, value), or None if the characteristic was
+            never observed for the entity
+        """
+        if self.latest is None:
+            self._build_time_indexes()
+        key = tuple(n if isinstance(n, rdflib.URIRef) else self.obs_graph_base[n] for n in (entity, characteristic))
+        return self.latest.get(key)
+
+    def current_value(self, entity, characteristic):
+        """The result value of ``current_result``, or None."""
+        latest = self.current_result(entity, characteristic)
+        return None if latest is None else latest.value
+
+    def observations_between(self, start=None, end=None, sensor=None, entity=None):
+        """
+        Observations of a sensor or entity with ``start <= resultTime <= end``.
+
+        Args:
+            start: Datetime, ISO 8601 string or epoch seconds; None for no bound
+            end: Same as ``start``
+            sensor: Sensor name or URI
+            entity: Entity name or URI
+
+        Returns:
+            List of ObservationUnit, oldest first
+        """
+        index, key = self._time_index(sensor, entity)
+        start = None if start is None else epoch_seconds(start)
+        end = None if end is None else epoch_seconds(end)
+        return index.between(key, start, end)
+
+    def observations_since(self, start, sensor=None, entity=None):
+        """Observations of a sensor or entity made strictly after ``start``, oldest first."""
+        index, key = self._time_index(sensor, entity)
+        return index.since(key, epoch_seconds(start))
+
+    def _mint_column(self, names):
+        """Build URIs for a column, minting each distinct name once."""
+        base = str(self.obs_graph_base)
+        cache = {}
+        uris = []
+        for name in names:
+            uri = cache.get(name)
+            if uri is None:
+                if not name:
+                    uri = None
+                elif isinstance(name, rdflib.URIRef):
+                    uri = name
+                else:
+                    uri = rdflib.URIRef(base + name)
+                cache[name] = uri
+            uris.append(uri)
+        return uris
+
+    def _observation_triples(self, columns):
+        base = str(self.obs_graph_base)
+        ORKA = self.ORKA
+        type_ = RDF.type
+        observations = [rdflib.URIRef(base + n) for n in columns["observation_name"]]
+        measurements = [rdflib.URIRef(base + n) for n in columns["measurement_name"]]
+        results = [rdflib.URIRef(base + n) for n in columns["result"]]
+        sensors = self._mint_column(columns["sensor"])
+
+        triples = []
+        append = triples.append
+        for observation, measurement, result_uri, sensor in zip(observations, measurements, results, sensors):
+            append((observation, type_, ORKA.Observation))
+            append((measurement, type_, ORKA.Measurement))
+            append((result_uri, type_, ORKA.Result))
+            append((observation, ORKA.hasMeasurement, measurement))
+            append((measurement, ORKA.hasResult, result_uri))
+            append((measurement, ORKA.madeBySensor, sensor))
+
+        # Procedures, entities and characteristics repeat across a batch, so
+        # their typing triples are emitted once per distinct URI
+        optional = (
+            ("procedure_name", measurements, ORKA.Procedure, ORKA.usedProcedure),
+            ("entity_name", observations, ORKA.Entity, ORKA.ofEntity),
+        )
+        for field, subjects, cls, prop in optional:
+            column = columns.get(field)
+            if column is None:
+                continue
+            typed = set()
+            for subject, uri in zip(subjects, self._mint_column(column)):
+                if uri is not None:
+                    if uri not in typed:
+                        typed.add(uri)
+                        append((uri, type_, cls))
+                    append((subject, prop, uri))
+
+        characteristics = columns.get("characteristic_name")
+        if characteristics is not None and columns.get("entity_name") is not None:
+            entities = self._mint_column(columns["entity_name"])
+            typed = set()
+            linked = set()
+            for measurement, entity, uri in zip(measurements, entities, self._mint_column(characteristics)):
+                if uri is None or entity is None:
+                    continue
+                # The measured characteristic; hasCharacteristic is its shortcut
+                append((measurement, ORKA.ofCharacteristic, uri))
+                if (entity, uri) in linked:
+                    continue
+                if uri not in typed:
+                    typed.add(uri)
+                    append((uri, type_, ORKA.Characteristic))
+                linked.add((entity, uri))
+                append((entity, ORKA.hasCharacteristic, uri))
+
+        values = columns.get("value")
+        if values is not None:
+            for result_uri, value in zip(results, values):
+                if value is not None:
+                    append((result_uri, ORKA.hasValue, rdflib.Literal(value)))
+
+        timestamps = columns.get("timestamp")
+        if timestamps is not None:
+            for observation, timestamp in zip(observations, timestamps):
+                if timestamp is not None:
+                    append((observation, SOSA.resultTime, _datetime_literal(timestamp)))
+        return triples
 
     def load_robot_config(self, path: str) -> dict:
         """Load robot configuration derived from URDF."""
@@ -97,6 +610,56 @@ class GraphManager:
             return json.load(f)
 
 
+OBSERVATION_FIELDS = (
+    "observation_name",
+    "measurement_name",
+    "sensor",
+    "result",
+    "procedure_name",
+    "entity_name",
+    "characteristic_name",
+    "value",
+    "timestamp",
+)
+REQUIRED_OBSERVATION_FIELDS = OBSERVATION_FIELDS[:4]
+
+
+def _datetime_literal(timestamp):
+    """xsd:dateTime literal for a datetime, ISO 8601 string or epoch seconds."""
+    if isinstance(timestamp, (int, float)):
+        timestamp = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    elif isinstance(timestamp, str):
+        timestamp = datetime.datetime.fromisoformat(timestamp)
+    return rdflib.Literal(timestamp, datatype=XSD.dateTime)
+
+
+def _observation_columns(records):
+    """Turn observation records into a mapping of field name to list."""
+    dtype = getattr(records, "dtype", None)
+    if dtype is not None and dtype.names:
+        # NumPy structured array: convert whole columns at once
+        columns = {name: records[name].tolist() for name in dtype.names if name in OBSERVATION_FIELDS}
+    elif isinstance(records, dict):
+        columns = {name: list(column) for name, column in records.items() if name in OBSERVATION_FIELDS}
+    else:
+        rows = list(records)
+        columns = {}
+        for name in OBSERVATION_FIELDS:
+            column = [row.get(name) for row in rows]
+            if any(value is not None for value in column):
+                columns[name] = column
+        if not rows:
+            columns = {name: [] for name in REQUIRED_OBSERVATION_FIELDS}
+
+    for name in REQUIRED_OBSERVATION_FIELDS:
+        column = columns.get(name)
+        if column is None or not all(column):
+            raise ValueError(f"Every observation record needs a '{name}'")
+    if len({len(column) for column in columns.values()}) > 1:
+        raise ValueError("Observation columns must all have the same length")
+    return columns
+
+
 def generate_test_sensor_data(gm: GraphManager, sensor_name: str):
     """Generate synthetic observation data for testing."""
     obs_id = f"obs_{uuid.uuid4().hex[:6]}"
@@ -112,7 +675,8 @@ def generate_test_sensor_data(gm: GraphManager, sensor_name: str):
         result=res_id,
         procedure_name="synthetic_procedure",
         entity_name="synthetic_entity",
-        characteristic_name="distance"
+        characteristic_name="distance",
+        value=fake_distance,
     )
 
     return {
@@ -0,0 +1,271 @@
+"""
+Incremental OWL-RL/RDFS materialization of observation graphs.
+
+Instead of re-running a DL reasoner over the whole ontology (see
+``test/reasoning.py``), Materializer applies a fixed rule subset to the
+triples added since the last run and writes what follows into a separate
+``inferred`` graph.  The rules cover RDFS and the OWL-RL constructs the
+ORKA ontology uses for instance data:
+
+    cax-sco, cax-eqc    rdfs:subClassOf, owl:equivalentClass
+    prp-spo1, prp-eqp   rdfs:subPropertyOf, owl:equivalentProperty
+    prp-dom, prp-rng    rdfs:domain, rdfs:range
+    prp-inv             owl:inverseOf
+    prp-symp, prp-trp   owl:SymmetricProperty, owl:TransitiveProperty
+    prp-spo2            owl:propertyChainAxiom
+    cls-hv1             owl:hasValue restrictions
+
+Schema triples are compiled once into lookup tables, so the cost of each
+new triple depends on the consequences it has, not on the graph size.
+Axioms may also live in the asserted graph; adding or removing one there
+recompiles the tables and materializes the data again from scratch.
+
+Removals are handled DRed-style (delete and rederive): ``retract``
+deletes every inference that may depend on the removed triples, and the
+next ``run`` derives again whatever still follows from the rest.
+Restrictions, SWRL rules and class expressions that need a DL reasoner
+(someValuesFrom, intersections, cardinalities) are out of scope.
+"""
+
+from rdflib import BNode, Graph, Literal
+from rdflib.namespace import OWL, RDF, RDFS
+
+from .closure import _transitive_closure
+
+# Types and properties that hold for every individual and are not worth storing
+_TRIVIAL_TYPES = {OWL.Thing, RDFS.Resource, OWL.NamedIndividual}
+_TRIVIAL_PROPERTIES = {OWL.topObjectProperty, OWL.topDataProperty}
+
+# Predicates of the triples compile_schema reads
+SCHEMA_PREDICATES = frozenset({
+    RDFS.subClassOf, OWL.equivalentClass, RDFS.subPropertyOf, OWL.equivalentProperty,
+    RDFS.domain, RDFS.range, OWL.inverseOf, OWL.hasValue, OWL.onProperty,
+    OWL.propertyChainAxiom, RDF.first, RDF.rest,
+})
+_SCHEMA_TYPES = {OWL.SymmetricProperty, OWL.TransitiveProperty}
+
+
+def is_schema_triple(triple):
+    """Whether a triple changes the tables compile_schema builds."""
+    _, p, o = triple
+    return p in SCHEMA_PREDICATES or (p == RDF.type and o in _SCHEMA_TYPES)
+
+
+def _add_edge(edges, a, b):
+    if a != b:
+        edges.setdefault(a, set()).add(b)
+
+
+class Materializer:
+    """
+    Forward-chaining rule engine over an asserted and an inferred graph.
+
+    Args:
+        schema_graphs: Graphs holding the class and property axioms; may
+            include ``asserted``
+        asserted: Graph of asserted instance data
+        inferred: Graph receiving the inferences, created if not given
+    """
+
+    def __init__(self, schema_graphs, asserted, inferred=None):
+        self.schema_graphs = list(schema_graphs)
+        self.asserted = asserted
+        self.inferred = inferred if inferred is not None else Graph()
+        self.pending = []
+        # Subjects of retracted inferences, rederived on the next run
+        self.affected = set()
+        self.schema_changed = False
+        self.derived = 0
+        self.compile_schema()
+
+    def compile_schema(self):
+        """Turn the schema axioms into lookup tables."""
+        graphs = self.schema_graphs
+        class_edges, property_edges = {}, {}
+        self.domains, self.ranges, self.inverses = {}, {}, {}
+        self.symmetric, self.transitive = set(), set()
+        self.has_value = {}
+        self.chains = {}
+
+        for g in graphs:
+            for c, d in g.subject_objects(RDFS.subClassOf):
+                _add_edge(class_edges, c, d)
+            for c, d in g.subject_objects(OWL.equivalentClass):
+                _add_edge(class_edges, c, d)
+                _add_edge(class_edges, d, c)
+            for p, q in g.subject_objects(RDFS.subPropertyOf):
+                _add_edge(property_edges, p, q)
+            for p, q in g.subject_objects(OWL.equivalentProperty):
+                _add_edge(property_edges, p, q)
+                _add_edge(property_edges, q, p)
+            for p, c in g.subject_objects(RDFS.domain):
+                self.domains.setdefault(p, set()).add(c)
+            for p, c in g.subject_objects(RDFS.range):
+                self.ranges.setdefault(p, set()).add(c)
+            for p, q in g.subject_objects(OWL.inverseOf):
+                self.inverses.setdefault(p, set()).add(q)
+                self.inverses.setdefault(q, set()).add(p)
+            self.symmetric.update(g.subjects(RDF.type, OWL.SymmetricProperty))
+            self.transitive.update(g.subjects(RDF.type, OWL.TransitiveProperty))
+            for restriction, value in g.subject_objects(OWL.hasValue):
+                for prop in g.objects(restriction, OWL.onProperty):
+                    self.has_value.setdefault(restriction, []).append((prop, value))
+            for prop, head in g.subject_objects(OWL.propertyChainAxiom):
+                # Graph.items only reads; Collection() rewrites the list's last rdf:rest
+                chain = list(g.items(head))
+                for position, link in enumerate(chain):
+                    self.chains.setdefault(link, []).append((prop, chain, position))
+
+        self.superclasses = _transitive_closure(class_edges)
+        self.superproperties = {
+            p: frozenset(q for q in supers if q not in _TRIVIAL_PROPERTIES)
+            for p, supers in _transitive_closure(property_edges).items()
+        }
+
+    def __contains__(self, triple):
+        return triple in self.asserted or triple in self.inferred
+
+    def _objects(self, subject, predicate):
+        yield from self.asserted.objects(subject, predicate)
+        yield from self.inferred.objects(subject, predicate)
+
+    def _subjects(self, predicate, obj):
+        yield from self.asserted.subjects(predicate, obj)
+        yield from self.inferred.subjects(predicate, obj)
+
+    def notify(self, triple):
+        """Queue an asserted triple for the next ``run``."""
+        if is_schema_triple(triple):
+            self.schema_changed = True
+        self.pending.append(triple)
+
+    def retract(self, triples):
+        """
+        Withdraw the inferences that may depend on asserted triples.
+
+        Must be called while ``triples`` are still in the asserted graph;
+        remove them from it afterwards.  Every inference derived from them,
+        directly or through other inferences, is deleted now.  The ones
+        that still follow from the remaining triples are derived again on
+        the next ``run``.
+
+        Returns:
+            Number of triples deleted from the inferred graph
+        """
+        triples = list(triples)
+        if any(is_schema_triple(t) for t in triples):
+            # Rebuilt from scratch on the next run
+            self.schema_changed = True
+            return 0
+        self.run()
+        deleted = set()
+        agenda = triples
+        while agenda:
+            triple = agenda.pop()
+            for derived in self._consequences(triple):
+                if derived not in deleted and derived in self.inferred:
+                    deleted.add(derived)
+                    agenda.append(derived)
+        for triple in deleted:
+            self.inferred.remove(triple)
+        self.affected.update(s for s, _, _ in deleted)
+        return len(deleted)
+
+    def _rederive(self):
+        """Queue the triples around retracted inferences again."""
+        affected, self.affected = self.affected, set()
+        # Every rule's conclusion shares its subject with the subject or
+        # object of one of its premises, so these triples rederive all of them
+        for node in affected:
+            for g in (self.asserted, self.inferred):
+                self.pending.extend(g.triples((node, None, None)))
+                self.pending.extend(g.triples((None, None, node)))
+
+    def _rebuild(self):
+        """Recompile the schema and materialize the asserted graph again."""
+        self.schema_changed = False
+        self.affected.clear()
+        self.compile_schema()
+        self.inferred.remove((None, None, None))
+        self.pending = list(self.asserted)
+
+    def run(self):
+        """
+        Derive everything that follows from the queued triples.
+
+        Returns:
+            Number of triples added to the inferred graph
+        """
+        if self.schema_changed:
+            self._rebuild()
+        elif self.affected:
+            self._rederive()
+        agenda, self.pending = self.pending, []
+        added = 0
+        # Consequences are often derived more than once in a run
+        seen = set()
+        while agenda:
+            triple = agenda.pop()
+            for derived in self._consequences(triple):
+                # Anonymous property expressions are only used internally
+                if derived in seen or isinstance(derived[1], BNode):
+                    continue
+                seen.add(derived)
+                if derived in self:
+                    continue
+                self.inferred.add(derived)
+                agenda.append(derived)
+                added += 1
+        self.derived += added
+        return added
+
+    def materialize(self, triples):
+        """Queue ``triples`` and run; the usual way to seed a whole graph."""
+        self.pending.extend(triples)
+        return self.run()
+
+    def _type_consequences(self, x, cls):
+        for c in (cls, *self.superclasses.get(cls, ())):
+            if c != cls and not isinstance(c, BNode) and c not in _TRIVIAL_TYPES:
+                yield x, RDF.type, c
+            for prop, value in self.has_value.get(c, ()):
+                # onProperty may be an anonymous inverse property expression
+                if not isinstance(prop, BNode):
+                    yield x, prop, value
+
+    def _consequences(self, triple):
+        s, p, o = triple
+        if p == RDF.type:
+            yield from self._type_consequences(s, o)
+            return
+
+        for q in self.superproperties.get(p, ()):
+            yield s, q, o
+        for cls in self.domains.get(p, ()):
+            yield s, RDF.type, cls
+        if isinstance(o, Literal):
+            return
+        for cls in self.ranges.get(p, ()):
+            yield o, RDF.type, cls
+        for q in self.inverses.get(p, ()):
+            yield o, q, s
+        if p in self.symmetric:
+            yield o, p, s
+        if p in self.transitive:
+            for z in list(self._objects(o, p)):
+                yield s, p, z
+            for w in list(self._subjects(p, s)):
+                yield w, p, o
+        for prop, chain, position in self.chains.get(p, ()):
+            for start, end in self._extend_chain(chain, position, s, o):
+                yield start, prop, end
+
+    def _extend_chain(self, chain, position, s, o):
+        """Chain ends reachable through a new link at ``position``."""
+        starts = [s]
+        for link in reversed(chain[:position]):
+            starts = [w for x in starts for w in self._subjects(link, x)]
+        ends = [o]
+        for link in chain[position + 1:]:
+            ends = [z for y in ends for z in self._objects(y, link)]
+        return [(a, b) for a in starts for b in ends]
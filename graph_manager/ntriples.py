@@ -0,0 +1,38 @@
+"""
+N-Triples line formatting for the journal, the retention archive and the
+synthetic data writer.
+
+rdflib's own row formatter is private to its serializer, so the few lines
+it takes live here.  Literals are escaped as the N-Triples grammar asks
+(``Literal.n3()`` switches to Turtle's long quotes for multi-line text);
+IRIs and blank nodes use their ``n3()`` form.
+"""
+
+from typing import Iterable
+
+from rdflib import Literal
+
+_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+
+def nt_term(term) -> str:
+    """N-Triples form of one term."""
+    if isinstance(term, Literal):
+        text = f'"{str(term).translate(_ESCAPES)}"'
+        if term.language:
+            return f"{text}@{term.language}"
+        if term.datatype:
+            return f"{text}^^<{term.datatype}>"
+        return text
+    return term.n3()
+
+
+def nt_line(triple) -> str:
+    """One N-Triples line, newline included."""
+    s, p, o = triple
+    return f"{s.n3()} {p.n3()} {nt_term(o)} .\n"
+
+
+def nt_lines(triples: Iterable) -> str:
+    """N-Triples text of many triples."""
+    return "".join(map(nt_line, triples))
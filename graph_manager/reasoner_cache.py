@@ -0,0 +1,283 @@
+"""
+Cache for DL reasoner output.
+
+Running Pellet over the ORKA ontology (``test/reasoning.py``) starts a JVM
+and takes several seconds, yet its input rarely changes.  ReasonerCache keys
+the inferred ontology by the SHA-256 of every file in the input's import
+closure plus the reasoner name and settings, and hands back the stored
+result while none of those changed.
+
+Imports are resolved the way Protégé does it: through the
+``catalog-v001.xml`` next to the importing file, falling back to a plain
+file path.  Imports that resolve to nothing local (e.g. a remote IRI) are
+keyed by their IRI only.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+from .ontology import default_cache_dir, file_digest
+
+# Bump whenever the key or the cache layout changes
+CACHE_VERSION = 1
+
+CATALOG_NAME = "catalog-v001.xml"
+
+_ENTITY = re.compile(r'<!ENTITY\s+([\w.-]+)\s+"([^"]*)"\s*>')
+_XML_IMPORT = re.compile(r'<owl:imports\s+rdf:resource\s*=\s*"([^"]+)"')
+_TURTLE_IMPORT = re.compile(r'owl:imports\s+<([^>]+)>')
+
+_catalogs: Dict[Path, Tuple[float, List[Tuple[str, str]]]] = {}
+
+
+def read_catalog(path: Union[str, Path]) -> List[Tuple[str, str]]:
+    """
+    Read the ``uri`` entries of an OASIS XML catalog.
+
+    Args:
+        path: Catalog file
+
+    Returns:
+        (name, uri) pairs in document order; relative uris are left as is
+    """
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime
+    cached = _catalogs.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    entries = []
+    for element in ET.parse(path).iter():
+        if element.tag.rsplit("}", 1)[-1] == "uri" and element.get("name") and element.get("uri"):
+            entries.append((element.get("name"), element.get("uri")))
+    _catalogs[path] = (mtime, entries)
+    return entries
+
+
+def _local_path(uri: str, base: Path) -> Optional[Path]:
+    """Existing local file a catalog target or import IRI points to."""
+    parsed = urlparse(uri)
+    if parsed.scheme in ("", "file"):
+        # file://owl/x.owl/ style IRIs put the directory in the netloc
+        raw = unquote(parsed.netloc + parsed.path) if parsed.scheme else uri
+        candidate = Path(raw.rstrip("/"))
+        if not candidate.is_absolute():
+            candidate = base / candidate
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def resolve_import(iri: str, importer: Union[str, Path]) -> Optional[Path]:
+    """
+    Find the local file an ``owl:imports`` IRI refers to.
+
+    The catalog next to the importing file is consulted first; the first
+    entry whose name matches (ignoring a trailing slash) and whose target
+    exists wins, as in Protégé.
+
+    Args:
+        iri: Imported ontology IRI
+        importer: File containing the import
+
+    Returns:
+        Resolved file, or None if the import is not available locally
+    """
+    base = Path(importer).resolve().parent
+    catalog = base / CATALOG_NAME
+    if catalog.is_file():
+        wanted = iri.rstrip("/")
+        for name, uri in read_catalog(catalog):
+            if name.rstrip("/") == wanted:
+                target = _local_path(uri, base)
+                if target is not None:
+                    return target
+    return _local_path(iri, base)
+
+
+def declared_imports(path: Union[str, Path]) -> List[str]:
+    """
+    List the ``owl:imports`` IRIs of an RDF/XML or Turtle ontology.
+
+    The file is scanned textually, expanding XML entity declarations, so
+    that keying a large ontology does not cost a full RDF parse.
+    """
+    text = Path(path).read_text(encoding="utf-8", errors="replace")
+    entities = dict(_ENTITY.findall(text))
+    imports = []
+    for iri in _XML_IMPORT.findall(text) + _TURTLE_IMPORT.findall(text):
+        for name, value in entities.items():
+            iri = iri.replace(f"&{name};", value)
+        if iri not in imports:
+            imports.append(iri)
+    return imports
+
+
+def import_closure(path: Union[str, Path]) -> List[Tuple[str, Optional[Path]]]:
+    """
+    Walk the import closure of an ontology.
+
+    Args:
+        path: Root ontology file
+
+    Returns:
+        (IRI, local file or None) for the root and every transitive import,
+        in discovery order; the root is listed under its own path
+    """
+    root = Path(path).resolve()
+    closure = [(str(root), root)]
+    seen_files, seen_iris = {root}, set()
+    queue = [root]
+    while queue:
+        importer = queue.pop(0)
+        for iri in declared_imports(importer):
+            if iri in seen_iris:
+                continue
+            seen_iris.add(iri)
+            target = resolve_import(iri, importer)
+            if target is not None and target in seen_files:
+                continue
+            closure.append((iri, target))
+            if target is not None:
+                seen_files.add(target)
+                queue.append(target)
+    return closure
+
+
+def reasoning_key(path: Union[str, Path], reasoner: str, settings: Optional[dict] = None) -> Tuple[str, dict]:
+    """
+    Compute the cache key for reasoning over an ontology.
+
+    Args:
+        path: Root ontology file
+        reasoner: Reasoner name, e.g. "pellet"
+        settings: Reasoner options; must be JSON serializable
+
+    Returns:
+        Hex key and the description it was computed from
+    """
+    inputs = [
+        {"iri": iri, "sha256": file_digest(target) if target is not None else None}
+        for iri, target in import_closure(path)
+    ]
+    # The root is identified by content, not by where it happens to live
+    inputs[0]["iri"] = None
+    description = {
+        "version": CACHE_VERSION,
+        "reasoner": reasoner,
+        "settings": settings or {},
+        "inputs": inputs,
+    }
+    encoded = json.dumps(description, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest(), description
+
+
+def _atomic_copy(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(target.parent), suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class ReasonerCache:
+    """
+    Directory of inferred ontologies keyed by ``reasoning_key``.
+
+    Args:
+        cache_dir: Cache root, defaults to ``default_cache_dir() / "reasoner"``
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir() / "reasoner"
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key[:32]}.owl"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Stored output for ``key``, or None."""
+        path = self.entry_path(key)
+        return path if path.is_file() and path.with_suffix(".json").is_file() else None
+
+    def put(self, key: str, output: Union[str, Path], description: Optional[dict] = None) -> Path:
+        """Store a reasoner output file under ``key``."""
+        path = self.entry_path(key)
+        _atomic_copy(Path(output), path)
+        meta = path.with_suffix(".json")
+        with open(meta.with_suffix(".json.tmp"), "w", encoding="utf-8") as f:
+            json.dump({"key": key, **(description or {})}, f, indent=1, sort_keys=True)
+        os.replace(meta.with_suffix(".json.tmp"), meta)
+        return path
+
+    def run(
+        self,
+        path: Union[str, Path],
+        output: Union[str, Path],
+        reason: Callable[[Path, Path], None],
+        reasoner: str,
+        settings: Optional[dict] = None,
+    ) -> bool:
+        """
+        Write the inferred ontology for ``path`` to ``output``.
+
+        ``reason(path, output, **settings)`` is only called when no stored result matches
+        the current input files and settings.
+
+        Args:
+            path: Root ontology file
+            output: Where the inferred ontology goes
+            reason: Function running the reasoner and saving its output
+            reasoner: Reasoner name, part of the key
+            settings: Keyword arguments of ``reason``, part of the key
+
+        Returns:
+            True if the result came from the cache
+        """
+        path, output = Path(path), Path(output)
+        key, description = reasoning_key(path, reasoner, settings)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            if not output.is_file() or file_digest(output) != file_digest(cached):
+                _atomic_copy(cached, output)
+            return True
+
+        self.misses += 1
+        reason(path, output, **(settings or {}))
+        try:
+            self.put(key, output, description)
+        except OSError as e:
+            print(f"Note: Could not write reasoner cache entry {self.entry_path(key)}: {e}")
+        return False
+
+
+def pellet(path: Union[str, Path], output: Union[str, Path], **settings) -> None:
+    """
+    Run Pellet through owlready2 and save the inferred ontology as RDF/XML.
+
+    Args:
+        path: Ontology file
+        output: Output file
+        **settings: Passed on to ``owlready2.sync_reasoner_pellet``
+    """
+    import owlready2
+
+    onto = owlready2.get_ontology(str(path)).load()
+    with onto:
+        owlready2.sync_reasoner_pellet(**settings)
+        onto.save(file=str(output), format="rdfxml")
@@ -0,0 +1,176 @@
+"""
+Sliding-window retention for observation graphs.
+
+A robot that runs all day adds observations until the process runs out of
+memory.  ObservationWindow remembers every observation GraphManager adds
+together with its measurement and result, ordered by observation time, and
+hands back the oldest ones once a limit on age, observation count or graph
+size is exceeded.  GraphManager then removes each Observation/Measurement/
+Result subgraph as a unit (see ``GraphManager.enable_retention``), so the
+static robot/sensor graph and entity/characteristic nodes stay in place.
+
+Finding what to evict is a heap pop and removing it touches only the
+triples of the evicted nodes, so the cost of an eviction does not depend on
+how large the graph is.  Evicted triples can be appended to per-day gzipped
+N-Triples files first; ``load_archive`` reads them back.
+"""
+
+import datetime
+import gzip
+import heapq
+import itertools
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import rdflib
+
+from .ntriples import nt_line
+
+
+class ObservationUnit(NamedTuple):
+    """Nodes that are evicted together; ``time`` is in epoch seconds."""
+
+    time: float
+    observation: rdflib.URIRef
+    measurement: rdflib.URIRef
+    result: rdflib.URIRef
+
+
+def epoch_seconds(timestamp=None) -> float:
+    """
+    Epoch seconds for a datetime, ISO 8601 string, xsd:dateTime literal or number.
+
+    Naive datetimes are taken as local time; None means now.
+    """
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, rdflib.Literal):
+        timestamp = timestamp.toPython()
+    if isinstance(timestamp, str):
+        timestamp = datetime.datetime.fromisoformat(timestamp)
+    if isinstance(timestamp, datetime.datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class ObservationWindow:
+    """
+    Observations ordered by time, with the limits that bound them.
+
+    Args:
+        max_age: Seconds (or timedelta) an observation is kept, measured
+            back from the newest observation time seen, so replayed or
+            simulated data ages by its own clock
+        max_observations: Number of observations kept
+        max_triples: Size of the observation graph above which the oldest
+            observations are evicted
+    """
+
+    def __init__(self, max_age=None, max_observations: Optional[int] = None, max_triples: Optional[int] = None):
+        if isinstance(max_age, datetime.timedelta):
+            max_age = max_age.total_seconds()
+        if max_age is None and max_observations is None and max_triples is None:
+            raise ValueError("A retention window needs max_age, max_observations or max_triples")
+        self.max_age = max_age
+        self.max_observations = max_observations
+        self.max_triples = max_triples
+        self.newest = float("-inf")
+        self.evicted = 0
+        self._heap = []
+        # Tie-breaker keeping arrival order among equal times
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, unit: ObservationUnit) -> None:
+        heapq.heappush(self._heap, (unit.time, next(self._seq), unit))
+        if unit.time > self.newest:
+            self.newest = unit.time
+
+    def oldest(self) -> Optional[ObservationUnit]:
+        return self._heap[0][2] if self._heap else None
+
+    def over_limit(self, graph_size: int) -> bool:
+        """Whether the oldest observation has to go."""
+        if not self._heap:
+            return False
+        if self.max_observations is not None and len(self._heap) > self.max_observations:
+            return True
+        if self.max_age is not None and self._heap[0][0] < self.newest - self.max_age:
+            return True
+        return self.max_triples is not None and graph_size > self.max_triples
+
+    def pop(self) -> ObservationUnit:
+        self.evicted += 1
+        return heapq.heappop(self._heap)[2]
+
+
+class ObservationArchive:
+    """
+    Appends evicted triples to ``<directory>/observations-YYYY-MM-DD.nt.gz``.
+
+    Each write adds a gzip member, which gzip readers treat as one stream.
+
+    Args:
+        directory: Archive directory, created if missing
+        compresslevel: gzip compression level
+    """
+
+    def __init__(self, directory: Union[str, Path], compresslevel: int = 6):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compresslevel = compresslevel
+        self.triples_written = 0
+
+    def path_for(self, epoch: float) -> Path:
+        day = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).date()
+        return self.directory / f"observations-{day.isoformat()}.nt.gz"
+
+    def write(self, batches: Iterable) -> None:
+        """
+        Archive ``(unit, triples)`` pairs, grouped into one member per day.
+        """
+        days = {}
+        for unit, triples in batches:
+            days.setdefault(self.path_for(unit.time), []).extend(map(nt_line, triples))
+        for path, lines in days.items():
+            with gzip.open(path, "at", encoding="utf-8", compresslevel=self.compresslevel) as f:
+                f.write("".join(lines))
+            self.triples_written += len(lines)
+
+
+def archive_files(directory: Union[str, Path]) -> List[Path]:
+    """Archive files in a directory, oldest day first."""
+    return sorted(Path(directory).glob("observations-*.nt.gz"))
+
+
+def load_archive(paths: Union[str, Path, Iterable], graph: Optional[rdflib.Graph] = None) -> rdflib.Graph:
+    """
+    Read archived observations back into a graph.
+
+    Args:
+        paths: Archive directory, a single file or several files
+        graph: Graph to add to, a new one by default
+
+    Returns:
+        The graph holding the archived triples
+    """
+    if isinstance(paths, (str, Path)):
+        paths = archive_files(paths) if Path(paths).is_dir() else [Path(paths)]
+    graph = graph if graph is not None else rdflib.Graph()
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            graph.parse(data=f.read(), format="nt")
+    return graph
+
+
+def _iter_units(graph: rdflib.Graph, ORKA, result_time) -> Iterator[ObservationUnit]:
+    """Observation units already present in a graph."""
+    for observation in graph.subjects(rdflib.RDF.type, ORKA.Observation):
+        stamp = graph.value(observation, result_time)
+        epoch = epoch_seconds(stamp) if stamp is not None else time.time()
+        for measurement in graph.objects(observation, ORKA.hasMeasurement):
+            for result in graph.objects(measurement, ORKA.hasResult):
+                yield ObservationUnit(epoch, observation, measurement, result)
@@ -0,0 +1,294 @@
+"""
+SQLite-backed rdflib store.
+
+Keeps a graph in a single SQLite file so that a long-running session does
+not have to hold its observations in RAM or re-parse them at start-up:
+reopening is a matter of opening the file, and queries read only the index
+pages they touch.  Terms are interned in a ``terms`` table and triples are
+stored as integer ids, indexed as SPO, POS and OSP so that every triple
+pattern is answered from an index.
+
+The store is registered with rdflib as ``"SQLite"``:
+
+    graph = rdflib.Graph(store="SQLite")
+    graph.open("observations.sqlite", create=True)
+
+Every ``add``, ``addN`` and ``remove`` call is its own transaction, so a
+crash loses nothing that was added before it; ``addN`` is the cheap way to
+write many triples at once.  Add and remove events are dispatched only for
+triples that actually changed the store, after the change is written.  The
+connection is shared between threads and guarded by a lock.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.plugin import register
+from rdflib.store import NO_STORE, VALID_STORE, Store, TripleAddedEvent, TripleRemovedEvent
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS triples (
+    s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, uri TEXT NOT NULL);
+"""
+
+
+def encode_term(term):
+    """Text key identifying an RDF term, its kind in the first character."""
+    if isinstance(term, Literal):
+        return f'"{term}\x00{term.datatype or ""}\x00{term.language or ""}'
+    if isinstance(term, BNode):
+        return f"_{term}"
+    return f"<{term}"
+
+
+def decode_term(key):
+    """Inverse of ``encode_term``."""
+    kind, value = key[0], key[1:]
+    if kind == "<":
+        return URIRef(value)
+    if kind == "_":
+        return BNode(value)
+    lexical, datatype, language = value.rsplit("\x00", 2)
+    return Literal(lexical, datatype=URIRef(datatype) if datatype else None, lang=language or None)
+
+
+class SQLiteStore(Store):
+    """
+    Single-graph rdflib store in an SQLite database.
+
+    Args:
+        configuration: Database path; opened right away if given
+        identifier: Store identifier
+        cache_size: Number of decoded terms kept in memory
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None, cache_size=100000):
+        self._conn = None
+        self._cache_size = cache_size
+        self._ids = {}
+        self._terms = {}
+        self._length = 0
+        self.identifier = identifier
+        self._lock = threading.RLock()
+        super().__init__(configuration)
+
+    # Lifecycle
+
+    @property
+    def is_open(self):
+        return self._conn is not None
+
+    def open(self, configuration, create=True):
+        path = Path(configuration)
+        if not create and not path.exists():
+            return NO_STORE
+        if path.parent != Path(""):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._length = self._conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction=True):
+        with self._lock:
+            if self._conn is None:
+                return
+            if commit_pending_transaction:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+            self._conn.close()
+            self._conn = None
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def rollback(self):
+        with self._lock:
+            self._conn.rollback()
+            self._length = self._conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+            self._ids.clear()
+            self._terms.clear()
+
+    def destroy(self, configuration):
+        self.close(commit_pending_transaction=False)
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(str(configuration) + suffix)
+            if path.exists():
+                path.unlink()
+
+    # Terms
+
+    def _remember(self, term_id, term):
+        if len(self._terms) >= self._cache_size:
+            self._ids.clear()
+            self._terms.clear()
+        self._ids[term] = term_id
+        self._terms[term_id] = term
+
+    def _lookup_id(self, term):
+        """Id of a stored term, or None if the store has never seen it."""
+        term_id = self._ids.get(term)
+        if term_id is None:
+            with self._lock:
+                row = self._conn.execute("SELECT id FROM terms WHERE key = ?", (encode_term(term),)).fetchone()
+                if row is None:
+                    return None
+                term_id = row[0]
+                self._remember(term_id, term)
+        return term_id
+
+    def _intern(self, term):
+        with self._lock:
+            term_id = self._lookup_id(term)
+            if term_id is None:
+                term_id = self._conn.execute("INSERT INTO terms (key) VALUES (?)", (encode_term(term),)).lastrowid
+                self._remember(term_id, term)
+            return term_id
+
+    def _term(self, term_id):
+        term = self._terms.get(term_id)
+        if term is None:
+            with self._lock:
+                key = self._conn.execute("SELECT key FROM terms WHERE id = ?", (term_id,)).fetchone()[0]
+                term = decode_term(key)
+                self._remember(term_id, term)
+        return term
+
+    def _pattern(self, triple):
+        """SQL condition and parameters for a triple pattern, None if it cannot match."""
+        clauses = []
+        params = []
+        for column, term in zip("spo", triple):
+            if term is None:
+                continue
+            term_id = self._lookup_id(term)
+            if term_id is None:
+                return None
+            clauses.append(f"{column} = ?")
+            params.append(term_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    # Triples
+
+    def _insert(self, quads):
+        """
+        Insert quads in one transaction; returns the ones that were new.
+
+        Nothing is kept if any insert fails.
+        """
+        intern = self._intern
+        added = []
+        with self._lock:
+            try:
+                for s, p, o, c in quads:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)",
+                        (intern(s), intern(p), intern(o)),
+                    )
+                    if cursor.rowcount:
+                        added.append((s, p, o, c))
+                self._conn.commit()
+            except BaseException:
+                self.rollback()
+                raise
+            self._length += len(added)
+        return added
+
+    def add(self, triple, context, quoted=False):
+        if self._insert([(*triple, context)]):
+            super().add(triple, context, quoted)
+
+    def addN(self, quads):  # noqa: N802
+        added = self._insert(quads)
+        if getattr(self.dispatcher, "_dispatch_map", None):
+            for s, p, o, c in added:
+                self.dispatcher.dispatch(TripleAddedEvent(triple=(s, p, o), context=c))
+
+    def remove(self, triple, context=None):
+        with self._lock:
+            pattern = self._pattern(triple)
+            if pattern is None:
+                return
+            where, params = pattern
+            cursor = self._conn.execute("DELETE FROM triples" + where, params)
+            self._conn.commit()
+            self._length -= cursor.rowcount
+        if cursor.rowcount:
+            self.dispatcher.dispatch(TripleRemovedEvent(triple=triple, context=context))
+
+    def triples(self, triple_pattern, context=None):
+        with self._lock:
+            pattern = self._pattern(triple_pattern)
+            if pattern is None:
+                return
+            where, params = pattern
+            cursor = self._conn.execute("SELECT s, p, o FROM triples" + where, params)
+        term = self._term
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for s, p, o in rows:
+                yield (term(s), term(p), term(o)), iter(())
+
+    def __len__(self, context=None):
+        return self._length
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    # Namespaces
+
+    def bind(self, prefix, namespace, override=True):
+        with self._lock:
+            self._bind(prefix, str(namespace), override)
+
+    def _bind(self, prefix, namespace, override):
+        bound = self.namespace(prefix)
+        existing = self.prefix(namespace)
+        if bound is not None and not override:
+            return
+        if existing is not None and existing != prefix:
+            if not override:
+                return
+            self._conn.execute("DELETE FROM namespaces WHERE prefix = ?", (existing,))
+        self._conn.execute("INSERT OR REPLACE INTO namespaces (prefix, uri) VALUES (?, ?)", (prefix, namespace))
+        self._conn.commit()
+
+    def namespace(self, prefix):
+        with self._lock:
+            row = self._conn.execute("SELECT uri FROM namespaces WHERE prefix = ?", (prefix,)).fetchone()
+        return URIRef(row[0]) if row else None
+
+    def prefix(self, namespace):
+        with self._lock:
+            row = self._conn.execute("SELECT prefix FROM namespaces WHERE uri = ?", (str(namespace),)).fetchone()
+        return row[0] if row else None
+
+    def namespaces(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT prefix, uri FROM namespaces").fetchall()
+        for prefix, uri in rows:
+            yield prefix, URIRef(uri)
+
+
+register("SQLite", Store, "graph_manager.sqlite_store", "SQLiteStore")
@@ -0,0 +1,237 @@
+"""
+Synthetic observation streams for load testing.
+
+FleetGenerator builds a fleet of robots hosting sensors drawn from the ORKA
+sensor classes, a population of physical entities and a set of observed
+characteristics, then yields observation records in timestamp order.  Each
+sensor samples at its own rate with jitter, and each (sensor,
+characteristic) value follows a mean-reverting random walk, so consecutive
+readings look like a real signal rather than independent noise.
+
+Records are generated lazily, so millions of observations can be streamed
+into a GraphManager in batches or written to N-Triples without holding them
+in memory.  The same seed always produces the same fleet and stream.
+
+    python -m graph_manager.synthetic --observations 1000000 --output fleet.nt
+"""
+
+import argparse
+import datetime
+import heapq
+import itertools
+import math
+import random
+
+import rdflib
+from rdflib.namespace import RDF
+
+from .main import SOSA, GraphManager
+from .ntriples import nt_lines
+
+# name -> (mean, standard deviation, lower bound, upper bound)
+CHARACTERISTIC_PROFILES = {
+    "distance": (2.5, 1.2, 0.05, 12.0),
+    "size": (0.4, 0.25, 0.01, 3.0),
+    "weight": (2.0, 1.5, 0.01, 80.0),
+    "density": (900.0, 300.0, 50.0, 8000.0),
+    "orientation": (0.0, 1.2, -math.pi, math.pi),
+}
+
+DEFAULT_START = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _leaf_subclasses(gm, root):
+    """Sorted classes below ``root`` in the ORKA namespace without subclasses."""
+    prefix = str(gm.ORKA)
+    classes = gm.closure.subclasses(root, reflexive=False)
+    return sorted(
+        c for c in classes
+        if str(c).startswith(prefix) and not (gm.closure.subclasses(c, reflexive=False) & classes)
+    )
+
+
+class FleetGenerator:
+    """
+    Deterministic fleet of robots, sensors and entities with an observation
+    stream.
+
+    Args:
+        gm: GraphManager whose ontology supplies the sensor and entity classes
+        robots: Number of robots
+        sensors_per_robot: Sensors hosted by each robot
+        entities: Number of physical entities being observed
+        characteristics: Characteristic names, keys of CHARACTERISTIC_PROFILES
+        seed: Seed for every random choice
+        start: Timestamp of the first observation
+        rate_range: Range of per-sensor sampling rates in Hz
+        prefix: Prefix for all generated names, to keep runs apart
+    """
+
+    def __init__(self, gm, robots=2, sensors_per_robot=4, entities=50, characteristics=None, seed=0,
+                 start=DEFAULT_START, rate_range=(1.0, 30.0), prefix="syn"):
+        if characteristics is None:
+            characteristics = sorted(CHARACTERISTIC_PROFILES)
+        unknown = set(characteristics) - set(CHARACTERISTIC_PROFILES)
+        if unknown:
+            raise ValueError(f"Unknown characteristics: {sorted(unknown)}")
+
+        self.gm = gm
+        self.seed = seed
+        self.start = start
+        self.prefix = prefix
+        self.characteristics = list(characteristics)
+        rng = random.Random(seed)
+
+        gm.closure.refresh()
+        sensor_classes = _leaf_subclasses(gm, SOSA.Sensor) or [gm.ORKA.Sensor]
+        entity_classes = _leaf_subclasses(gm, gm.ORKA.PhysicalEntity) or [gm.ORKA.PhysicalEntity]
+        sensor_properties = sorted(
+            p for p in gm.closure.subproperties(gm.ORKA.hasSensorCharacteristic, reflexive=False)
+            if str(p).startswith(str(gm.ORKA))
+        )
+
+        self.robots = [f"{prefix}_robot_{i}" for i in range(robots)]
+        # (name, class, robot, rate in Hz, sensor characteristic values)
+        self.sensors = []
+        for r, robot in enumerate(self.robots):
+            for i in range(sensors_per_robot):
+                properties = rng.sample(sensor_properties, min(3, len(sensor_properties)))
+                self.sensors.append((
+                    f"{prefix}_sensor_{r}_{i}",
+                    rng.choice(sensor_classes),
+                    robot,
+                    rng.uniform(*rate_range),
+                    {p: round(rng.uniform(0.1, 100.0), 2) for p in properties},
+                ))
+        self.entities = [(f"{prefix}_entity_{i}", rng.choice(entity_classes)) for i in range(entities)]
+
+    def static_triples(self):
+        """Triples describing the fleet itself: robots, sensors and entities."""
+        gm = self.gm
+        base = gm.obs_graph_base
+        for robot in self.robots:
+            yield base[robot], RDF.type, gm.ORKA.Robot
+        for name, cls, robot, _, properties in self.sensors:
+            yield base[name], RDF.type, cls
+            yield base[robot], SOSA.hosts, base[name]
+            for prop, value in properties.items():
+                yield base[name], prop, rdflib.Literal(value)
+        for name, cls in self.entities:
+            yield base[name], RDF.type, cls
+
+    def records(self, count):
+        """
+        Yield ``count`` observation records in timestamp order.
+
+        Records have the fields of GraphManager.add_observations, including
+        ``value`` and ``timestamp``.
+        """
+        rng = random.Random(self.seed + 1)
+        prefix = self.prefix
+        phi = 0.9
+        state = {}
+        # (next time in seconds from start, sensor index)
+        heap = [(rng.random() / sensor[3], i) for i, sensor in enumerate(self.sensors)]
+        heapq.heapify(heap)
+
+        for n in range(count):
+            t, i = heapq.heappop(heap)
+            name, _, _, rate, _ = self.sensors[i]
+            entity = self.entities[rng.randrange(len(self.entities))][0]
+            characteristic = self.characteristics[rng.randrange(len(self.characteristics))]
+            mean, sd, low, high = CHARACTERISTIC_PROFILES[characteristic]
+
+            key = (i, characteristic)
+            previous = state.get(key, mean)
+            value = mean + phi * (previous - mean) + rng.gauss(0.0, sd * math.sqrt(1 - phi * phi))
+            value = min(max(value, low), high)
+            state[key] = value
+
+            yield {
+                "observation_name": f"{prefix}_obs_{n}",
+                "measurement_name": f"{prefix}_meas_{n}",
+                "sensor": name,
+                "result": f"{prefix}_res_{n}",
+                "procedure_name": f"{prefix}_procedure",
+                "entity_name": entity,
+                "characteristic_name": characteristic,
+                "value": round(value, 4),
+                "timestamp": self.start + datetime.timedelta(seconds=t),
+            }
+            # Sample interval jittered by up to 10%
+            heapq.heappush(heap, (t + rng.uniform(0.9, 1.1) / rate, i))
+
+    def batches(self, count, batch_size=10000):
+        """``records(count)`` in lists of at most ``batch_size``."""
+        stream = self.records(count)
+        while True:
+            batch = list(itertools.islice(stream, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def populate(self, count, batch_size=10000):
+        """
+        Add the fleet and ``count`` observations to the GraphManager.
+
+        Returns:
+            Number of observations added
+        """
+        gm = self.gm
+        gm.graph.addN((s, p, o, gm.graph) for s, p, o in self.static_triples())
+        added = 0
+        for batch in self.batches(count, batch_size):
+            added += gm.add_observations(batch)
+        return added
+
+    def write_ntriples(self, path, count, batch_size=10000):
+        """
+        Write the fleet and ``count`` observations to an N-Triples file
+        without adding them to the graph.
+
+        Returns:
+            Number of triples written
+        """
+        base = self.gm.obs_graph_base
+        # Triples about shared nodes (procedures, entities, characteristics)
+        # come back with every batch; each is written once, like the graph
+        # populate() builds would hold it once
+        shared = set(self.static_triples())
+        written = len(shared)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(nt_lines(shared))
+            for batch in self.batches(count, batch_size):
+                own = {base[r[key]] for r in batch for key in ("observation_name", "measurement_name", "result")}
+                fresh = []
+                for triple in self.gm.observation_triples(batch):
+                    if triple[0] not in own:
+                        if triple in shared:
+                            continue
+                        shared.add(triple)
+                    fresh.append(triple)
+                f.write(nt_lines(fresh))
+                written += len(fresh)
+        return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic observation graph")
+    parser.add_argument("--observations", type=int, default=100000)
+    parser.add_argument("--robots", type=int, default=2)
+    parser.add_argument("--sensors-per-robot", type=int, default=4)
+    parser.add_argument("--entities", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--output", required=True, help="N-Triples file to write")
+    args = parser.parse_args()
+
+    generator = FleetGenerator(
+        GraphManager(), robots=args.robots, sensors_per_robot=args.sensors_per_robot,
+        entities=args.entities, seed=args.seed,
+    )
+    written = generator.write_ntriples(args.output, args.observations, args.batch_size)
+    print(f"Wrote {written} triples to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
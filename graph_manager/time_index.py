@@ -0,0 +1,136 @@
+"""
+Time-ordered index of observations per sensor and per entity.
+
+"Latest observation of entity X" is the task planner's most frequent
+question; as SPARQL it is a scan over every observation of X plus an ORDER
+BY.  TimeIndex keeps, for each sensor and entity, the observation times in
+a sorted list next to the observations themselves, so latest, range and
+"since T" lookups are a bisection followed by a slice.
+
+LatestResults goes one step further for "what is the current distance of
+X": it maps (entity, characteristic) straight to the newest result.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+
+from .retention import ObservationUnit
+
+
+class TimeIndex:
+    """
+    Sorted observation times per key.
+
+    Observations normally arrive in time order and are appended; late ones
+    are inserted in place.
+    """
+
+    def __init__(self):
+        self._times: Dict[Hashable, List[float]] = {}
+        self._units: Dict[Hashable, List[ObservationUnit]] = {}
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def __contains__(self, key) -> bool:
+        return key in self._times
+
+    def keys(self):
+        return self._times.keys()
+
+    def add(self, key: Hashable, unit: ObservationUnit) -> None:
+        times = self._times.get(key)
+        if times is None:
+            self._times[key] = [unit.time]
+            self._units[key] = [unit]
+        elif not times or unit.time >= times[-1]:
+            times.append(unit.time)
+            self._units[key].append(unit)
+        else:
+            position = bisect_right(times, unit.time)
+            times.insert(position, unit.time)
+            self._units[key].insert(position, unit)
+
+    def remove(self, key: Hashable, unit: ObservationUnit) -> bool:
+        """Drop one observation; returns False if it was not indexed."""
+        times = self._times.get(key)
+        if times is None:
+            return False
+        units = self._units[key]
+        position = bisect_left(times, unit.time)
+        while position < len(times) and times[position] == unit.time:
+            if units[position] == unit:
+                del times[position], units[position]
+                if not times:
+                    del self._times[key], self._units[key]
+                return True
+            position += 1
+        return False
+
+    def latest(self, key: Hashable) -> Optional[ObservationUnit]:
+        units = self._units.get(key)
+        return units[-1] if units else None
+
+    def between(self, key: Hashable, start: Optional[float] = None, end: Optional[float] = None) -> List[ObservationUnit]:
+        """Observations with ``start <= time <= end``, oldest first; None leaves a side open."""
+        times = self._times.get(key)
+        if times is None:
+            return []
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_right(times, end)
+        return self._units[key][lo:hi]
+
+    def since(self, key: Hashable, start: float) -> List[ObservationUnit]:
+        """Observations strictly after ``start``, oldest first."""
+        times = self._times.get(key)
+        if times is None:
+            return []
+        return self._units[key][bisect_right(times, start):]
+
+
+class LatestResult(NamedTuple):
+    """Newest observation of an entity characteristic and its result value."""
+
+    unit: ObservationUnit
+    value: Any
+
+
+class LatestResults:
+    """
+    (entity, characteristic) -> LatestResult map with hit/miss counters.
+    """
+
+    def __init__(self):
+        self._latest: Dict[Hashable, LatestResult] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def update(self, key: Hashable, unit: ObservationUnit, value=None) -> bool:
+        """Record an observation; returns True if it is the newest for ``key``."""
+        current = self._latest.get(key)
+        if current is not None and unit.time < current.unit.time:
+            return False
+        self._latest[key] = LatestResult(unit, value)
+        return True
+
+    def discard(self, key: Hashable, unit: ObservationUnit) -> None:
+        """
+        Forget ``unit`` if it is the newest for ``key``.
+
+        Retention evicts oldest first, so every older observation of the
+        key is already gone and the key is dropped.
+        """
+        current = self._latest.get(key)
+        if current is not None and current.unit == unit:
+            del self._latest[key]
+
+    def get(self, key: Hashable) -> Optional[LatestResult]:
+        latest = self._latest.get(key)
+        if latest is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return latest
@@ -1,3 +1,13 @@
 from .vision_sensor import initiate_sensor, add_vision_sensor_observation
+from .capture_pipeline import CapturePipeline, FrameQueue
+from .image_writer import AsyncImageWriter
+from .raw_store import RawDataStore
 
-__all__ = ["initiate_sensor", "add_vision_sensor_observation"]
+__all__ = [
+    "initiate_sensor",
+    "add_vision_sensor_observation",
+    "CapturePipeline",
+    "FrameQueue",
+    "AsyncImageWriter",
+    "RawDataStore",
+]
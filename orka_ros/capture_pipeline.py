@@ -0,0 +1,294 @@
+"""
+Continuous capture pipeline shared by the streaming ROS node.
+
+Kept free of rclpy so it can be driven by a fake publisher in tests: the
+subscriber callback calls ``CapturePipeline.submit`` and a worker thread
+converts frames, records observations in one long-lived GraphManager and
+periodically flushes the graph.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from rdflib import RDF
+
+from .vision_sensor import add_vision_sensor_observation
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+BLOCK = "block"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class FrameQueue:
+    """Bounded FIFO with a configurable policy for when it is full."""
+
+    def __init__(self, maxsize=8, policy=DROP_OLDEST):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"policy must be one of {DROP_POLICIES}, got '{policy}'")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self._items = deque()
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._items)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def put(self, item, timeout=None):
+        """
+        Enqueue an item, applying the drop policy when full.
+
+        Returns:
+            False if the item itself was dropped, True otherwise
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    ready = self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed, timeout)
+                    if not ready or self._closed:
+                        self.dropped += 1
+                        return False
+            self._items.append(item)
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """Dequeue the oldest item, or None on timeout or once closed and empty."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageTimer:
+    """Latency statistics for one pipeline stage, in milliseconds."""
+
+    def __init__(self, window=1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def record(self, seconds):
+        ms = seconds * 1e3
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self._recent.append(ms)
+
+    def summary(self):
+        recent = sorted(self._recent)
+
+        def pct(q):
+            return recent[min(len(recent) - 1, int(q * len(recent)))] if recent else 0.0
+
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": self.max,
+        }
+
+
+class CapturePipeline:
+    """
+    Turn a stream of frames into observations in a single GraphManager.
+
+    Args:
+        gm: GraphManager that receives every observation
+        sensor_name: Sensor the observations are attributed to
+        graph_path: File the observation graph is flushed to when ``gm`` has
+            no journal; each such flush rewrites the whole graph, so long
+            sessions should enable one (see GraphManager.enable_journal),
+            which makes a flush an fsync of the lines added since the last one
+        convert: Callable turning a received message into a PIL image,
+            frames are used as-is if omitted
+        queue_size: Maximum number of frames waiting to be processed
+        drop_policy: One of DROP_POLICIES, applied when the queue is full
+        flush_every: Flush after this many processed frames, 0 disables
+        flush_interval: Flush after this many seconds, 0 disables
+        image_dir: Directory raw images are written to, None to skip saving
+        name_prefix: Base of the generated observation/measurement/result names;
+            numbering continues after the highest ``obs_<prefix>_<n>`` already
+            in the graph, e.g. one replayed from a journal
+        writer: AsyncImageWriter to save images in the background with
+        store: RawDataStore images are saved into, takes precedence over
+            ``image_dir``
+    """
+
+    def __init__(
+        self,
+        gm,
+        sensor_name,
+        graph_path,
+        convert=None,
+        queue_size=8,
+        drop_policy=DROP_OLDEST,
+        flush_every=100,
+        flush_interval=5.0,
+        image_dir=None,
+        name_prefix="vision",
+        writer=None,
+        store=None,
+    ):
+        self.gm = gm
+        self.sensor_name = sensor_name
+        self.graph_path = Path(graph_path)
+        self.convert = convert
+        self.queue = FrameQueue(queue_size, drop_policy)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.image_dir = image_dir
+        self.name_prefix = name_prefix
+        self.writer = writer
+        self.store = store
+
+        self.received = 0
+        self.processed = 0
+        self.errors = 0
+        self.stages = {name: StageTimer() for name in ("queue", "convert", "graph", "flush")}
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
+        self._worker = None
+        self._first_index = self._last_index()
+
+    @property
+    def dropped(self):
+        return self.queue.dropped
+
+    def submit(self, msg):
+        """Hand a received frame to the pipeline; safe to call from any thread."""
+        self.received += 1
+        return self.queue.put((time.monotonic(), msg))
+
+    def start(self):
+        self._worker = threading.Thread(target=self._run, name="orka_capture_worker", daemon=True)
+        self._worker.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Process the frames already queued, flush and stop the worker."""
+        self.queue.close()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+        if self.writer is not None:
+            self.writer.flush(timeout)
+        self.flush()
+
+    def _run(self):
+        while True:
+            item = self.queue.get(timeout=0.1)
+            if item is None:
+                if self.queue.closed:
+                    return
+                self._maybe_flush()
+                continue
+            try:
+                self.process(*item)
+            except Exception as e:
+                self.errors += 1
+                print(f"Note: Dropping frame that failed to process: {e}")
+            self._maybe_flush()
+
+    def _last_index(self):
+        """Highest observation number already used for ``name_prefix``, 0 if none."""
+        pattern = re.compile(re.escape(f"obs_{self.name_prefix}_") + r"(\d+)$")
+        base = str(self.gm.obs_graph_base)
+        last = 0
+        for observation in self.gm.graph.subjects(RDF.type, self.gm.ORKA.Observation):
+            name = str(observation)
+            if name.startswith(base):
+                match = pattern.match(name[len(base):])
+                if match:
+                    last = max(last, int(match.group(1)))
+        return last
+
+    def process(self, received_at, msg):
+        start = time.monotonic()
+        self.stages["queue"].record(start - received_at)
+
+        image = self.convert(msg) if self.convert is not None else msg
+        converted = time.monotonic()
+        self.stages["convert"].record(converted - start)
+
+        index = self._first_index + self.processed + 1
+        add_vision_sensor_observation(
+            self.gm,
+            sensor_name=self.sensor_name,
+            observation_name=f"obs_{self.name_prefix}_{index}",
+            measurement_name=f"meas_{self.name_prefix}_{index}",
+            result_name=f"res_{self.name_prefix}_{index}",
+            image=image,
+            save_image=self.image_dir is not None or self.store is not None,
+            image_dir=str(self.image_dir) if self.image_dir is not None else "observation_graph",
+            writer=self.writer,
+            store=self.store,
+        )
+        self.stages["graph"].record(time.monotonic() - converted)
+        self.processed += 1
+        self._since_flush += 1
+
+    def _maybe_flush(self):
+        due = (self.flush_every and self._since_flush >= self.flush_every) or (
+            self.flush_interval and self._since_flush and time.monotonic() - self._last_flush >= self.flush_interval
+        )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Persist the observation graph.
+
+        With a journal only its unsynced lines are written; without one the
+        whole graph is serialized to ``graph_path``.
+        """
+        start = time.monotonic()
+        if self.gm.journal is not None:
+            self.gm.journal.sync()
+        else:
+            self.graph_path.parent.mkdir(parents=True, exist_ok=True)
+            self.gm.save_graph(str(self.graph_path))
+        self.stages["flush"].record(time.monotonic() - start)
+        self._since_flush = 0
+        self._last_flush = time.monotonic()
+
+    def stats(self):
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": len(self.queue),
+            "stages": {name: timer.summary() for name, timer in self.stages.items()},
+        }
@@ -0,0 +1,129 @@
+"""
+Conversion of sensor_msgs/Image messages to NumPy arrays and PIL images.
+
+``ros_image_to_array`` wraps ``msg.data`` as a strided NumPy view that
+honours ``msg.step`` row padding, so the common encodings are converted
+without copying the pixel buffer.  YUV 4:2:2 has to be decoded and is the
+only encoding that allocates.  Encodings not handled here fall back to a
+single shared CvBridge when cv_bridge is installed.
+"""
+
+import numpy as np
+from PIL import Image
+
+try:
+    from cv_bridge import CvBridge
+except Exception:
+    CvBridge = None
+
+# encoding -> (dtype, channels)
+_LAYOUTS = {
+    "rgb8": (np.uint8, 3),
+    "bgr8": (np.uint8, 3),
+    "rgba8": (np.uint8, 4),
+    "bgra8": (np.uint8, 4),
+    "mono8": (np.uint8, 1),
+    "8uc1": (np.uint8, 1),
+    "mono16": (np.uint16, 1),
+    "16uc1": (np.uint16, 1),
+    "32fc1": (np.float32, 1),
+    # Packed 4:2:2, two bytes per pixel
+    "yuv422": (np.uint8, 2),
+    "uyvy": (np.uint8, 2),
+    "yuv422_yuy2": (np.uint8, 2),
+    "yuyv": (np.uint8, 2),
+}
+_YUV_UYVY = ("yuv422", "uyvy")
+_YUV_YUYV = ("yuv422_yuy2", "yuyv")
+
+_bridge = None
+
+
+def get_bridge():
+    """Return the process-wide CvBridge, or None if cv_bridge is missing."""
+    global _bridge
+    if _bridge is None and CvBridge is not None:
+        _bridge = CvBridge()
+    return _bridge
+
+
+def _raw_view(msg, dtype, channels):
+    """View msg.data as (height, width[, channels]) without copying."""
+    dtype = np.dtype(dtype)
+    if dtype.itemsize > 1:
+        dtype = dtype.newbyteorder(">" if msg.is_bigendian else "<")
+    row_bytes = msg.width * channels * dtype.itemsize
+    step = msg.step or row_bytes
+    if step < row_bytes:
+        raise ValueError(f"step {step} is smaller than a row of {row_bytes} bytes")
+
+    buf = np.frombuffer(msg.data, dtype=np.uint8, count=step * msg.height)
+    shape = (msg.height, msg.width, channels)
+    strides = (step, channels * dtype.itemsize, dtype.itemsize)
+    if step % dtype.itemsize == 0 and buf.ctypes.data % dtype.itemsize == 0:
+        view = np.lib.stride_tricks.as_strided(buf.view(dtype), shape=shape, strides=strides, writeable=False)
+    else:
+        # Misaligned rows: fall back to a copy of just the pixel bytes
+        rows = buf.reshape(msg.height, step)[:, :row_bytes]
+        view = np.ascontiguousarray(rows).view(dtype).reshape(shape)
+    return view[..., 0] if channels == 1 else view
+
+
+def _yuv422_to_rgb(packed, order):
+    """Decode packed 4:2:2 (height, width, 2) bytes to an RGB uint8 array."""
+    pairs = packed.reshape(packed.shape[0], -1, 4).astype(np.float32)
+    if order in _YUV_UYVY:
+        u, y0, v, y1 = (pairs[..., i] for i in range(4))
+    else:
+        y0, u, y1, v = (pairs[..., i] for i in range(4))
+    y = np.stack([y0, y1], axis=-1).reshape(packed.shape[0], -1)
+    u = np.repeat(u, 2, axis=1) - 128.0
+    v = np.repeat(v, 2, axis=1) - 128.0
+    rgb = np.empty(y.shape + (3,), dtype=np.float32)
+    rgb[..., 0] = y + 1.402 * v
+    rgb[..., 1] = y - 0.344136 * u - 0.714136 * v
+    rgb[..., 2] = y + 1.772 * u
+    return np.clip(rgb, 0, 255).astype(np.uint8)
+
+
+def ros_image_to_array(msg, rgb=True, drop_alpha=True):
+    """
+    Convert a sensor_msgs/Image to a NumPy array.
+
+    Args:
+        msg: Image message (anything with height, width, step, encoding,
+            is_bigendian and data)
+        rgb: Reorder BGR(A) channels to RGB(A) as a view
+        drop_alpha: Return three channels for RGBA/BGRA input
+
+    Returns:
+        Read-only array of shape (height, width) for single-channel
+        encodings and (height, width, channels) otherwise; a view on
+        ``msg.data`` except for YUV input and BGRA kept with its alpha
+    """
+    enc = msg.encoding.lower()
+    layout = _LAYOUTS.get(enc)
+    if layout is None:
+        bridge = get_bridge()
+        if bridge is None:
+            raise ValueError(f"Unsupported encoding: {msg.encoding}")
+        return bridge.imgmsg_to_cv2(msg, desired_encoding="rgb8" if rgb else "passthrough")
+
+    view = _raw_view(msg, *layout)
+    if enc in _YUV_UYVY or enc in _YUV_YUYV:
+        if msg.width % 2:
+            raise ValueError("YUV 4:2:2 images need an even width")
+        return _yuv422_to_rgb(view, enc)
+    if layout[1] == 4 and drop_alpha:
+        view = view[..., :3]
+    if rgb and enc.startswith("bgr"):
+        view = view[..., 2::-1] if view.shape[-1] == 3 else view[..., [2, 1, 0, 3]]
+    return view
+
+
+def ros_image_to_pil(msg):
+    """Convert a sensor_msgs/Image to a PIL image (L, I;16, F or RGB)."""
+    array = ros_image_to_array(msg)
+    if array.dtype.byteorder == ">":
+        array = array.astype(array.dtype.newbyteorder("="))
+    return Image.fromarray(array)
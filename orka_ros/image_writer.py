@@ -0,0 +1,109 @@
+"""
+Background JPEG encoding and disk writes for captured images.
+
+Encoding a frame and writing it out takes tens of milliseconds, too long to
+do on a ROS callback.  AsyncImageWriter runs that work on a thread (or
+process) pool behind a bounded number of pending writes, so callers get a
+future back immediately and only block when the backlog is full.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+
+def write_image(image, path, format="JPEG", **save_options):
+    """Encode an image and write it to ``path``, returning the path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.save(path, format=format, **save_options)
+    return path
+
+
+class AsyncImageWriter:
+    """
+    Writes images on a worker pool with a bounded queue.
+
+    Submitted images must not be modified afterwards, they are encoded on
+    another thread.
+
+    Args:
+        max_workers: Size of the worker pool
+        max_pending: Writes allowed in flight before submit blocks
+        use_processes: Encode in worker processes instead of threads
+        save_options: Passed on to ``PIL.Image.save`` (e.g. quality)
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, use_processes=False, **save_options):
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = pool(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.save_options = save_options
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, image, path, format="JPEG", timeout=None):
+        """
+        Queue an image for writing.
+
+        Returns:
+            Future resolving to the written path
+
+        Raises:
+            TimeoutError: If no slot frees up within ``timeout`` seconds
+        """
+        return self.run(write_image, image, path, format, timeout=timeout, **self.save_options)
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """Run any write job on the pool, subject to the same backlog limit."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Image write queue is full")
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            if future.exception() is None:
+                self.written += 1
+            else:
+                self.failed += 1
+        self._slots.release()
+
+    def flush(self, timeout=None):
+        """
+        Wait for all pending writes.
+
+        Returns:
+            True if everything submitted so far has completed
+        """
+        with self._lock:
+            pending = set(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
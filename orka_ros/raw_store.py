@@ -0,0 +1,239 @@
+"""
+Digest-named, deduplicating store for raw sensor data.
+
+Blobs are named by a SHA-256 digest and sharded into nested directories
+(``objects/ab/cd/abcd...``), so identical payloads are stored once and
+finding a blob never depends on how many have been captured.  A small
+append-only index records size, MIME type, the SHA-256 of the stored bytes
+and the observation that first produced each blob.  Graphs refer to blobs
+through URIs rather than filesystem paths:
+
+* ``put_bytes`` blobs are named by the hash of their bytes and get an
+  RFC 6920 ``ni:///sha-256;...`` URI, which anyone can verify against the
+  blob it names.
+* ``put_image`` blobs are named by the hash of the decoded pixels (see
+  ``image_digest``), so the same frame is stored once however it is
+  encoded and its name is known before the encoding finishes.  An encoded
+  file does not hash to that digest, so these get a
+  ``urn:orka:pixels:sha256:<hex>`` URI instead of an ``ni`` one; the index
+  keeps the hash of the stored bytes.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from pathlib import Path
+
+from rdflib import URIRef
+
+BlobRef = namedtuple("BlobRef", ["digest", "uri", "path", "created", "future"])
+
+_NI_PREFIX = "ni:///sha-256;"
+_PIXELS_PREFIX = "urn:orka:pixels:sha256:"
+
+
+def blob_uri(digest):
+    """RFC 6920 named-information URI for the hex SHA-256 digest of a blob's bytes."""
+    raw = base64.urlsafe_b64encode(bytes.fromhex(digest)).rstrip(b"=").decode("ascii")
+    return URIRef(_NI_PREFIX + raw)
+
+
+def pixels_uri(digest):
+    """URI for an ``image_digest``, which identifies decoded pixels, not file bytes."""
+    return URIRef(_PIXELS_PREFIX + digest)
+
+
+def digest_from_uri(uri):
+    """Inverse of ``blob_uri`` and ``pixels_uri``."""
+    uri = str(uri)
+    if uri.startswith(_PIXELS_PREFIX):
+        return uri[len(_PIXELS_PREFIX):]
+    if not uri.startswith(_NI_PREFIX):
+        raise ValueError(f"Not a sha-256 blob URI: {uri}")
+    raw = uri[len(_NI_PREFIX):]
+    return base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)).hex()
+
+
+def image_digest(image):
+    """
+    Digest of an image's decoded pixels, independent of how it is encoded.
+
+    An identity of the picture, not of a file: an encoded copy hashes to
+    something else, see ``pixels_uri``.
+    """
+    h = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+def _write_atomic(path, data):
+    """Write ``data`` to ``path`` through a temporary file in the same directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def encode_blob(image, path, format="JPEG", save_options=None):
+    """
+    Encode an image and write it to a blob path.
+
+    Module level and free of store state so it can run in a worker process.
+
+    Returns:
+        Size and hex SHA-256 of the encoded image
+    """
+    if format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buf = io.BytesIO()
+    image.save(buf, format=format, **(save_options or {}))
+    data = buf.getvalue()
+    _write_atomic(Path(path), data)
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+class RawDataStore:
+    """
+    Sharded, deduplicating blob directory with an on-disk index.
+
+    Args:
+        root: Store directory, created if missing
+        levels: Number of nested shard directories
+        width: Hex characters of the digest used per shard level
+    """
+
+    INDEX_NAME = "index.jsonl"
+
+    def __init__(self, root, levels=2, width=2):
+        self.root = Path(root)
+        self.levels = levels
+        self.width = width
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._index = {}
+        self._index_path = self.root / self.INDEX_NAME
+        if self._index_path.exists():
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        entry = json.loads(line)
+                        self._index.setdefault(entry["digest"], entry)
+        self._index_file = open(self._index_path, "a", encoding="utf-8")
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, digest):
+        return digest in self._index
+
+    def close(self):
+        self._index_file.close()
+
+    def path(self, digest):
+        parts = [digest[i * self.width:(i + 1) * self.width] for i in range(self.levels)]
+        return self.root.joinpath("objects", *parts, digest)
+
+    def resolve(self, uri):
+        """Filesystem path of the blob behind a blob URI."""
+        return self.path(digest_from_uri(uri))
+
+    def lookup(self, digest):
+        """Index entry (digest, size, sha256, mime, observation) or None."""
+        return self._index.get(digest)
+
+    def _claim(self, digest):
+        """Reserve a digest for writing; False if it is stored or in flight."""
+        with self._lock:
+            if digest in self._index or digest in self._pending:
+                return False
+            self._pending.add(digest)
+            return True
+
+    def _release(self, digest):
+        with self._lock:
+            self._pending.discard(digest)
+
+    def _record(self, digest, size, sha256, mime, observation):
+        """Index a blob that has been written and release its claim."""
+        entry = {"digest": digest, "size": size, "sha256": sha256, "mime": mime, "observation": observation}
+        with self._lock:
+            self._index[digest] = entry
+            self._index_file.write(json.dumps(entry) + "\n")
+            self._index_file.flush()
+            self._pending.discard(digest)
+
+    def put_bytes(self, data, mime="application/octet-stream", observation=None):
+        """
+        Store a payload unless an identical one is already present.
+
+        Returns:
+            BlobRef with ``created`` False for a deduplicated payload
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        created = self._claim(digest)
+        if created:
+            try:
+                _write_atomic(self.path(digest), data)
+            except BaseException:
+                self._release(digest)
+                raise
+            self._record(digest, len(data), digest, mime, observation)
+        return BlobRef(digest, blob_uri(digest), self.path(digest), created, None)
+
+    def put_image(self, image, observation=None, format="JPEG", writer=None, **save_options):
+        """
+        Store an image, keyed by its pixel content and named by a ``pixels_uri``.
+
+        The key is known before encoding, so with an AsyncImageWriter (on
+        threads or processes) the encoding and write happen in the
+        background and the returned BlobRef carries a future resolving to
+        the blob path once it is indexed.
+        """
+        digest = image_digest(image)
+        if not self._claim(digest):
+            return BlobRef(digest, pixels_uri(digest), self.path(digest), False, None)
+
+        mime = f"image/{format.lower()}"
+        path = self.path(digest)
+        if writer is None:
+            try:
+                size, sha256 = encode_blob(image, path, format, save_options)
+            except BaseException:
+                self._release(digest)
+                raise
+            self._record(digest, size, sha256, mime, observation)
+            return BlobRef(digest, pixels_uri(digest), path, True, None)
+
+        done = Future()
+
+        def finish(future):
+            # A failed write gives the digest up, so the next put retries it
+            # instead of deduplicating against a blob that is not there
+            try:
+                self._record(digest, *future.result(), mime, observation)
+            except BaseException as error:
+                self._release(digest)
+                done.set_exception(error)
+            else:
+                done.set_result(path)
+
+        try:
+            future = writer.run(encode_blob, image, path, format, save_options)
+        except BaseException:
+            self._release(digest)
+            raise
+        future.add_done_callback(finish)
+        return BlobRef(digest, pixels_uri(digest), path, True, done)
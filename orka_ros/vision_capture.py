@@ -1,59 +1,32 @@
 import argparse
+import json
+import time
 from pathlib import Path
 from datetime import datetime
 
-import numpy as np
-from PIL import Image
-
-try:
-    from cv_bridge import CvBridge
-except Exception:
-    CvBridge = None
-
 import rclpy
 from rclpy.node import Node
 from sensor_msgs.msg import Image as RosImage
 
+from graph_manager.journal import compact
 from graph_manager.main import GraphManager
-from .vision_sensor import initiate_sensor, add_vision_sensor_observation
-
-
-def ros_image_to_pil(msg):
-    enc = msg.encoding.lower()
-    if CvBridge is not None:
-        bridge = CvBridge()
-        cv_img = bridge.imgmsg_to_cv2(msg, desired_encoding="passthrough")
-        if enc in ("bgra8", "rgba8"):
-            rgb = cv_img[..., :3]
-            if enc == "bgra8":
-                rgb = rgb[..., ::-1]
-            return Image.fromarray(rgb)
-        if enc.startswith("bgr"):
-            cv_img = cv_img[..., ::-1]
-        return Image.fromarray(cv_img)
-
-    if enc in ("rgb8", "bgr8", "bgra8", "rgba8"):
-        data = np.frombuffer(msg.data, dtype=np.uint8)
-        if enc in ("bgra8", "rgba8"):
-            img = data.reshape((msg.height, msg.width, 4))[..., :3]
-        else:
-            img = data.reshape((msg.height, msg.width, 3))
-        if enc in ("bgr8", "bgra8"):
-            img = img[..., ::-1]
-        return Image.fromarray(img)
+from .capture_pipeline import DROP_OLDEST, DROP_POLICIES, CapturePipeline
+from .image_conversion import ros_image_to_pil
+from .image_writer import AsyncImageWriter
+from .raw_store import RawDataStore
+from .vision_sensor import initiate_sensor
 
-    raise ValueError(f"Unsupported encoding: {msg.encoding}")
 
+class StreamingCapture(Node):
+    """Subscribes to an image topic and feeds every frame into a CapturePipeline."""
 
-class OneShotImage(Node):
-    def __init__(self, topic):
+    def __init__(self, topic, pipeline, qos_depth=10):
         super().__init__("orka_vision_capture")
-        self.msg = None
-        self.sub = self.create_subscription(RosImage, topic, self._cb, 1)
+        self.pipeline = pipeline
+        self.sub = self.create_subscription(RosImage, topic, self._cb, qos_depth)
 
     def _cb(self, msg):
-        if self.msg is None:
-            self.msg = msg
+        self.pipeline.submit(msg)
 
 
 def main():
@@ -63,63 +36,88 @@ def main():
     parser.add_argument("--sensor-topic", default="/TIAGO_PP/Astra_rgb/image_color")
     parser.add_argument("--sensor-class", default="Camera")
     parser.add_argument("--save-image", action="store_true")
+    parser.add_argument("--raw-store", default=None, help="deduplicating image store, defaults to <output-dir>/raw_store")
     parser.add_argument("--output-dir", default="observation_graph")
     parser.add_argument("--session-dir", default=None)
-    parser.add_argument("--image-filename", default=None)
-    parser.add_argument("--observation-name", default="obs_vision_1")
-    parser.add_argument("--measurement-name", default="meas_vision_1")
-    parser.add_argument("--result-name", default="res_vision_1")
-    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--name-prefix", default="vision")
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--drop-policy", choices=DROP_POLICIES, default=DROP_OLDEST)
+    parser.add_argument("--flush-every", type=int, default=100, help="flush after N frames, 0 disables")
+    parser.add_argument("--flush-interval", type=float, default=5.0, help="flush after N seconds, 0 disables")
+    parser.add_argument("--writer-threads", type=int, default=2, help="background image writers, 0 writes on the worker thread")
+    parser.add_argument("--journal", dest="journal", action="store_true", default=True,
+                        help="append to a journal and write the full graph only on shutdown (default)")
+    parser.add_argument("--no-journal", dest="journal", action="store_false",
+                        help="rewrite the whole graph on every flush instead")
+    parser.add_argument("--max-frames", type=int, default=0, help="stop after N processed frames, 0 runs until interrupted")
+    parser.add_argument("--duration", type=float, default=0.0, help="stop after N seconds, 0 runs until interrupted")
+    parser.add_argument("--stats-interval", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=5.0, help="fail if no frame arrives within N seconds")
     args = parser.parse_args()
 
-    rclpy.init()
-    node = OneShotImage(args.topic)
-
-    start = node.get_clock().now()
-    while rclpy.ok() and node.msg is None:
-        rclpy.spin_once(node, timeout_sec=0.1)
-        if (node.get_clock().now() - start).nanoseconds / 1e9 > args.timeout:
-            break
-
-    if node.msg is None:
-        node.destroy_node()
-        rclpy.shutdown()
-        raise RuntimeError("No image received")
-
-    image = ros_image_to_pil(node.msg)
-
     gm = GraphManager()
     initiate_sensor(gm, args.sensor_name, args.sensor_topic, args.sensor_class)
 
     output_root = Path(args.output_dir)
-    output_root.mkdir(parents=True, exist_ok=True)
     session_name = args.session_dir or datetime.now().strftime("session_%Y%m%d_%H%M%S")
     session_dir = output_root / session_name
-    raw_dir = session_dir / "raw_data"
     processed_dir = session_dir / "processed_data"
-    raw_dir.mkdir(parents=True, exist_ok=True)
     processed_dir.mkdir(parents=True, exist_ok=True)
-
-    image_path = add_vision_sensor_observation(
+    # Shared by all sessions so repeated frames are stored once
+    store = RawDataStore(args.raw_store or output_root / "raw_store") if args.save_image else None
+    graph_path = session_dir / "observations.ttl"
+    journal_path = session_dir / "observations.nq"
+    if args.journal:
+        gm.enable_journal(journal_path, snapshot_path=graph_path)
+
+    writer = AsyncImageWriter(max_workers=args.writer_threads) if args.save_image and args.writer_threads else None
+    pipeline = CapturePipeline(
         gm,
         sensor_name=args.sensor_name,
-        observation_name=args.observation_name,
-        measurement_name=args.measurement_name,
-        result_name=args.result_name,
-        image=image,
-        save_image=args.save_image,
-        image_dir=str(raw_dir),
-        image_filename=args.image_filename,
-    )
+        graph_path=graph_path,
+        convert=ros_image_to_pil,
+        queue_size=args.queue_size,
+        drop_policy=args.drop_policy,
+        flush_every=args.flush_every,
+        flush_interval=args.flush_interval,
+        store=store,
+        name_prefix=args.name_prefix,
+        writer=writer,
+    ).start()
 
-    graph_path = session_dir / f"{args.observation_name}.ttl"
-    gm.save_graph(str(graph_path))
-
-    node.destroy_node()
-    rclpy.shutdown()
+    rclpy.init()
+    node = StreamingCapture(args.topic, pipeline)
+    start = time.monotonic()
+    last_stats = start
+    try:
+        while rclpy.ok():
+            rclpy.spin_once(node, timeout_sec=0.1)
+            now = time.monotonic()
+            if pipeline.received == 0 and now - start > args.timeout:
+                raise RuntimeError("No image received")
+            if args.max_frames and pipeline.processed >= args.max_frames:
+                break
+            if args.duration and now - start >= args.duration:
+                break
+            if args.stats_interval and now - last_stats >= args.stats_interval:
+                node.get_logger().info(json.dumps(pipeline.stats()))
+                last_stats = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipeline.stop()
+        if writer is not None:
+            writer.close()
+        if store is not None:
+            store.close()
+        gm.close_journal()
+        if args.journal:
+            # One full snapshot per session; the next run replays it plus an empty journal
+            compact(journal_path, graph_path)
+        node.destroy_node()
+        rclpy.shutdown()
 
-    if image_path is not None:
-        print(f"saved image: {image_path}")
+    print(json.dumps(pipeline.stats(), indent=2))
     print(f"saved graph: {graph_path}")
 
 
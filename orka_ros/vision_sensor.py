@@ -1,6 +1,8 @@
 from pathlib import Path
 from rdflib import Literal
 
+from .image_writer import write_image
+
 
 def initiate_sensor(gm, sensor_name, sensor_topic, sensor_class="Camera"):
     sensor_type = gm.ORKA[sensor_class]
@@ -9,7 +11,18 @@ def initiate_sensor(gm, sensor_name, sensor_topic, sensor_class="Camera"):
     return sensor_uri
 
 
-def add_vision_sensor_observation(gm, sensor_name, observation_name, measurement_name, result_name, image=None, save_image=True, image_dir="observation_graph", image_filename=None):
+def add_vision_sensor_observation(gm, sensor_name, observation_name, measurement_name, result_name, image=None, save_image=True, image_dir="observation_graph", image_filename=None, writer=None, store=None):
+    """
+    Record a vision observation and optionally save its image.
+
+    With an AsyncImageWriter as ``writer`` the triples are added right away,
+    the image is encoded and written in the background and a future
+    resolving to the image path is returned instead of the path.
+
+    With a RawDataStore as ``store`` the image goes into the
+    deduplicating store instead of ``image_dir``, the graph records the
+    blob's pixel-digest URI and the store's BlobRef is returned.
+    """
     sensor_uri = gm.obs_graph_base[sensor_name]
     gm.update_graph_with_observation(observation_name, measurement_name, sensor_uri, result_name)
 
@@ -17,16 +30,21 @@ def add_vision_sensor_observation(gm, sensor_name, observation_name, measurement
     result_uri = gm.obs_graph_base[result_name]
     image_path = None
 
+    if image is not None and save_image and store is not None:
+        blob = store.put_image(image, observation=str(observation_uri), writer=writer)
+        gm.graph.add((observation_uri, gm.ORKA.hasRawObservation, blob.uri))
+        gm.graph.add((result_uri, gm.ORKA.hasValue, blob.uri))
+        return blob
+
     if image is not None and save_image:
         image_dir_path = Path(image_dir)
-        image_dir_path.mkdir(parents=True, exist_ok=True)
         if image_filename is None:
             image_filename = f"{result_name}.jpg"
         image_path = image_dir_path / image_filename
-        if image.mode == "RGBA":
-            image = image.convert("RGB")
-        image.save(image_path, format="JPEG")
         gm.graph.add((observation_uri, gm.ORKA.hasRawObservation, Literal(str(image_path))))
         gm.graph.add((result_uri, gm.ORKA.hasValue, Literal(str(image_path))))
+        if writer is not None:
+            return writer.submit(image, image_path)
+        write_image(image, image_path)
 
     return image_path
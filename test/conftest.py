@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path_factory, monkeypatch):
+    """Keep ontology snapshots and other caches out of the real ~/.cache/orka."""
+    monkeypatch.setenv("ORKA_CACHE_DIR", str(tmp_path_factory.getbasetemp() / "orka-cache"))
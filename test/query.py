@@ -1,35 +1,20 @@
-import requests, time
+import sys
+from pathlib import Path
 
-def query_wikidata(property_id):
-    # SPARQL query to get instances and subclasses of the given property
-    sparql_query = """
-    SELECT ?item ?itemLabel WHERE {
-      { ?item wdt:P31* wd:""" + property_id + """ . }
-      UNION
-      { ?item wdt:P1647 wd:""" + property_id + """ . }
-      SERVICE wikibase:label { bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en". }
-    }
-    LIMIT 200
-    """
-
-    url = 'https://query.wikidata.org/sparql'
-    headers = {'User-Agent': 'Mozilla/5.0', 'Accept': 'application/json'}
-    params = {'query': sparql_query, 'format': 'json'}
-    max_retries = 5
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "evaluation" / "use-case"))
+from sparql_client import SparqlError, default_client, items_query  # noqa: E402
 
-    for attempt in range(max_retries):
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            results = response.json()['results']['bindings']
-            for result in results:
-                print("Label:\t{}\t\tURI:\t{}".format(result['itemLabel']['value'], result['item']['value']))
-        else:
-            print("Failed to retrieve data: {}".format(response.status_code))
-            wait = 2 ** attempt  # Exponential backoff
-            time.sleep(wait)
-    return None  # or raise an exception
-    
 
+def query_wikidata(property_id):
+    # Instances and subproperties of the given property; retried only on failure, cached on disk
+    try:
+        results = default_client().bindings(items_query(property_id))
+    except SparqlError as e:
+        print("Failed to retrieve data: {}".format(e))
+        return None
+    for result in results:
+        print("Label:\t{}\t\tURI:\t{}".format(result['itemLabel']['value'], result['item']['value']))
+    return results
 
 
 # Example usage: Query for instances and subclasses of Q5 (human)
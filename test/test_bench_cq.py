@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from benchmarks.bench_cq import compare, percentile, run_suites
+
+
+def test_percentile_interpolates():
+    samples = [4, 1, 3, 2]
+    assert percentile(samples, 0) == 1
+    assert percentile(samples, 50) == 2.5
+    assert percentile(samples, 100) == 4
+    assert percentile([7], 99) == 7
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_report_round_trip():
+    report = run_suites(["rpo"], [0], warmup=0, repeat=2, log=None)
+    report = json.loads(json.dumps(report))
+
+    assert report["settings"]["repeat"] == 2
+    assert [r["query"] for r in report["results"]] == [f"cq{i}" for i in range(1, 9)]
+    for result in report["results"]:
+        assert result["rows"] > 0
+        assert result["ms"]["p50"] <= result["ms"]["p99"] <= result["ms"]["max"]
+        assert result["peak_alloc_bytes"] > 0
+
+    rows = compare(report, report)
+    assert len(rows) == 8
+    assert all(ratio == 1.0 for *_, ratio in rows)
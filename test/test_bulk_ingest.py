@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from graph_manager.main import GraphManager
+
+
+def _records(n):
+    return [
+        {
+            "observation_name": f"obs_{i}",
+            "measurement_name": f"meas_{i}",
+            "sensor": "lidar_1",
+            "result": f"res_{i}",
+            "procedure_name": "synthetic_procedure",
+            "entity_name": f"entity_{i % 3}",
+            "characteristic_name": "distance",
+            "timestamp": 1700000000 + i,
+        }
+        for i in range(n)
+    ]
+
+
+def test_bulk_matches_single_inserts():
+    records = _records(20)
+
+    single = GraphManager()
+    for record in records:
+        record = dict(record, sensor=single.obs_graph_base[record["sensor"]])
+        single.update_graph_with_observation(**record)
+
+    bulk = GraphManager()
+    assert bulk.add_observations(records) == 20
+    assert set(bulk.graph) == set(single.graph)
+
+
+def test_observation_triples_leave_graph_alone():
+    gm = GraphManager()
+    triples = gm.observation_triples(_records(5))
+    assert len(gm.graph) == 0
+    gm.add_observations(_records(5))
+    assert set(triples) == set(gm.graph)
+
+
+def test_bulk_accepts_numpy_table_and_columns():
+    records = _records(5)
+    table = np.array(
+        [tuple(r[name] for name in ("observation_name", "measurement_name", "sensor", "result", "entity_name", "timestamp")) for r in records],
+        dtype=[("observation_name", "U16"), ("measurement_name", "U16"), ("sensor", "U16"), ("result", "U16"), ("entity_name", "U16"), ("timestamp", "f8")],
+    )
+    from_table = GraphManager()
+    from_table.add_observations(table)
+
+    columns = {name: [r[name] for r in records] for name in table.dtype.names}
+    from_columns = GraphManager()
+    from_columns.add_observations(columns)
+
+    assert len(from_table.graph) > 0
+    assert set(from_table.graph) == set(from_columns.graph)
+    entity = from_table.obs_graph_base["entity_1"]
+    assert (from_table.obs_graph_base["obs_1"], from_table.ORKA.ofEntity, entity) in from_table.graph
+
+
+def test_bulk_rejects_incomplete_records():
+    gm = GraphManager()
+    with pytest.raises(ValueError):
+        gm.add_observations([{"observation_name": "obs_1", "measurement_name": "meas_1", "sensor": "lidar_1"}])
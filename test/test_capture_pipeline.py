@@ -0,0 +1,111 @@
+import threading
+import time
+
+from PIL import Image
+from rdflib import RDF, Graph
+
+from graph_manager.journal import compact, replay_journal
+from graph_manager.main import GraphManager
+from orka_ros.capture_pipeline import BLOCK, DROP_NEWEST, DROP_OLDEST, CapturePipeline, FrameQueue
+from orka_ros.vision_sensor import initiate_sensor
+
+
+def fake_publisher(pipeline, frames, rate_hz):
+    """Publish solid-colour frames from a separate thread, like a ROS callback would."""
+    def run():
+        for i in range(frames):
+            pipeline.submit(Image.new("RGB", (32, 24), color=(i % 256, 0, 0)))
+            time.sleep(1.0 / rate_hz)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_drop_policies():
+    oldest = FrameQueue(2, DROP_OLDEST)
+    newest = FrameQueue(2, DROP_NEWEST)
+    for i in range(4):
+        oldest.put(i)
+        newest.put(i)
+    assert [oldest.get(0), oldest.get(0)] == [2, 3]
+    assert [newest.get(0), newest.get(0)] == [0, 1]
+    assert oldest.dropped == newest.dropped == 2
+
+    blocking = FrameQueue(1, BLOCK)
+    blocking.put(0)
+    assert blocking.put(1, timeout=0.01) is False
+    threading.Timer(0.05, blocking.get).start()
+    assert blocking.put(2, timeout=1.0) is True
+
+
+def test_pipeline_with_fake_publisher(tmp_path):
+    gm = GraphManager()
+    initiate_sensor(gm, "vision_sensor", "/camera/image")
+    graph_path = tmp_path / "observations.ttl"
+    pipeline = CapturePipeline(
+        gm, "vision_sensor", graph_path, queue_size=64, flush_every=5, image_dir=tmp_path / "raw_data"
+    ).start()
+
+    fake_publisher(pipeline, frames=12, rate_hz=200).join()
+    pipeline.stop()
+
+    stats = pipeline.stats()
+    assert stats["received"] == 12
+    assert stats["processed"] + stats["dropped"] + stats["errors"] == 12
+    assert stats["processed"] == 12
+    assert stats["stages"]["graph"]["count"] == 12
+    assert stats["stages"]["flush"]["count"] >= 2
+    assert len(list((tmp_path / "raw_data").glob("*.jpg"))) == 12
+
+    saved = Graph().parse(str(graph_path))
+    assert len(list(saved.subjects(RDF.type, gm.ORKA.Observation))) == 12
+
+
+def test_pipeline_counts_dropped_frames(tmp_path):
+    gm = GraphManager()
+    pipeline = CapturePipeline(gm, "vision_sensor", tmp_path / "g.ttl", queue_size=2, drop_policy=DROP_NEWEST)
+    # Worker not started yet, so the queue overflows
+    for _ in range(5):
+        pipeline.submit(Image.new("RGB", (8, 8)))
+    pipeline.start()
+    pipeline.stop()
+    assert pipeline.stats()["processed"] == 2
+    assert pipeline.dropped == 3
+
+
+def test_restarted_pipeline_continues_numbering(tmp_path):
+    journal = tmp_path / "observations.nq"
+    names = []
+    for run in range(2):
+        gm = GraphManager()
+        gm.enable_journal(journal)
+        pipeline = CapturePipeline(gm, "vision_sensor", tmp_path / "g.ttl", flush_every=0, flush_interval=0).start()
+        for _ in range(3):
+            pipeline.submit(Image.new("RGB", (8, 8)))
+        pipeline.stop()
+        gm.close_journal()
+        names.append(sorted(str(o).rsplit("/", 1)[-1] for o in gm.graph.subjects(RDF.type, gm.ORKA.Observation)))
+
+    assert names[0] == ["obs_vision_1", "obs_vision_2", "obs_vision_3"]
+    # The second run replays the journal and mints new names after the old ones
+    assert names[1] == [f"obs_vision_{i}" for i in range(1, 7)]
+
+
+def test_journaled_flushes_leave_the_snapshot_alone(tmp_path):
+    graph_path, journal = tmp_path / "observations.ttl", tmp_path / "observations.nq"
+    gm = GraphManager()
+    gm.enable_journal(journal, snapshot_path=graph_path)
+    initiate_sensor(gm, "vision_sensor", "/camera/image")
+    pipeline = CapturePipeline(gm, "vision_sensor", graph_path, queue_size=64, flush_every=2).start()
+    fake_publisher(pipeline, frames=8, rate_hz=200).join()
+    pipeline.stop()
+
+    assert pipeline.stats()["stages"]["flush"]["count"] >= 4
+    assert not graph_path.exists()
+    assert set(replay_journal(journal)) == set(gm.graph)
+
+    # What the streaming node does on shutdown
+    gm.close_journal()
+    assert compact(journal, graph_path) == len(gm.graph)
+    assert set(Graph().parse(str(graph_path))) == set(gm.graph)
@@ -0,0 +1,67 @@
+from rdflib import Literal
+from rdflib.namespace import RDFS
+
+from graph_manager.main import GraphManager
+
+QUERIES = [
+    "SELECT ?s ?c WHERE { ?s rdf:type/rdfs:subClassOf* ?c }",
+    "SELECT ?s WHERE { ?s rdf:type/rdfs:subClassOf* sosa:Sensor }",
+    "SELECT ?c WHERE { ?c rdfs:subClassOf+ sosa:Sensor }",
+    "SELECT ?c WHERE { orka:Camera rdfs:subClassOf* ?c }",
+    "SELECT ?p ?v WHERE { ?s ?p ?v . ?p rdfs:subPropertyOf* orka:hasSensorCharacteristic }",
+    "ASK { orka:Camera rdfs:subClassOf+ sosa:Sensor }",
+]
+
+
+def _session():
+    gm = GraphManager()
+    gm.graph.bind("sosa", "http://www.w3.org/ns/sosa/")
+    camera = gm.add_sensor("camera_1", gm.ORKA.Camera)
+    gm.graph.add((camera, gm.ORKA.hasMaxRange, Literal(10.0)))
+    gm.add_sensor("lidar_1")
+    gm.add_observations([
+        {"observation_name": f"obs_{i}", "measurement_name": f"meas_{i}", "sensor": "camera_1", "result": f"res_{i}"}
+        for i in range(10)
+    ])
+    return gm
+
+
+def test_closure_queries_match_property_paths():
+    gm = _session()
+    for query in QUERIES:
+        plain = gm.query(query)
+        closed = gm.query(query, use_closure=True)
+        if plain.type == "ASK":
+            assert plain.askAnswer == closed.askAnswer
+        else:
+            assert sorted(plain) == sorted(closed), query
+            assert len(plain) > 0, query
+
+
+def test_closure_lookups():
+    gm = _session()
+    sosa_sensor = gm.graph.namespace_manager.expand_curie("sosa:Sensor")
+    assert sosa_sensor in gm.closure.superclasses(gm.ORKA.Camera)
+    assert gm.ORKA.Camera in gm.closure.subclasses(sosa_sensor)
+    assert gm.ORKA.Camera in gm.closure.superclasses(gm.ORKA.Camera)
+    assert gm.ORKA.Camera not in gm.closure.superclasses(gm.ORKA.Camera, reflexive=False)
+    assert gm.ORKA.hasMaxRange in gm.closure.subproperties(gm.ORKA.hasSensorCharacteristic)
+
+
+def test_closure_rebuilt_on_hierarchy_change():
+    gm = _session()
+    query = "SELECT ?s WHERE { ?s rdf:type/rdfs:subClassOf* orka:Lidar }"
+    gm.query(query, use_closure=True)
+    rebuilds = gm.closure.rebuilds
+
+    # Observations alone leave the hierarchy untouched
+    gm.add_observations([{"observation_name": "obs_x", "measurement_name": "meas_x", "sensor": "lidar_1", "result": "res_x"}])
+    gm.query(query, use_closure=True)
+    assert gm.closure.rebuilds == rebuilds
+
+    assert len(gm.query(query, use_closure=True)) == 0
+    gm.graph.add((gm.ORKA.Sensor, RDFS.subClassOf, gm.ORKA.Lidar))
+    closed = sorted(gm.query(query, use_closure=True))
+    assert gm.closure.rebuilds == rebuilds + 1
+    assert closed == sorted(gm.query(query))
+    assert (gm.obs_graph_base["lidar_1"],) in closed
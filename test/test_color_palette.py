@@ -0,0 +1,91 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+USE_CASE = Path(__file__).resolve().parent.parent / "evaluation" / "use-case"
+sys.path.insert(0, str(USE_CASE))
+
+import color_palette  # noqa: E402
+from color_palette import PALETTE_VERSION, build_palette, load_palette, main  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent / "data" / "wikidata-colors.json"
+
+
+def _bindings():
+    with open(FIXTURE) as f:
+        return json.load(f)["results"]["bindings"]
+
+
+def test_build_and_load(tmp_path):
+    path = tmp_path / "palette.json"
+    built = build_palette(path, _bindings(), source="fixture")
+    palette = load_palette(path)
+    assert [c.id for c in palette] == [c.id for c in built]
+    # Rows per parent are merged; the malformed hex value is dropped
+    assert len(palette) == 14
+    assert "Q99999999" not in palette.by_id
+    copper = palette["Q1105656"]
+    assert copper.name == "copper" and copper.hex == "B87333" and copper.rgb == [184, 115, 51]
+    assert copper.parents == ["Q47071", "Q39338"]
+    assert copper.uri == "http://www.wikidata.org/entity/Q1105656"
+    # Parents outside the palette (wd:Q1075 itself) are dropped
+    assert palette["Q1358326"].parents == ["Q1088"]
+    assert palette.source == "fixture"
+
+
+def test_load_is_cached_and_fast(tmp_path):
+    path = tmp_path / "palette.json"
+    build_palette(path, _bindings())
+    color_palette._loaded.clear()
+    start = time.perf_counter()
+    first = load_palette(path)
+    assert time.perf_counter() - start < 0.05
+    assert load_palette(path) is first
+
+
+def test_missing_snapshot_is_built_once(tmp_path, monkeypatch):
+    monkeypatch.delenv("ORKA_OFFLINE", raising=False)
+    path = tmp_path / "palette.json"
+    queries = []
+
+    def fetch(query):
+        queries.append(query)
+        return _bindings()
+
+    load_palette(path, fetch=fetch)
+    load_palette(path, fetch=fetch)
+    assert len(queries) == 1
+    load_palette(path, refresh=True, fetch=fetch)
+    assert len(queries) == 2
+
+
+def test_offline_without_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORKA_OFFLINE", "1")
+    with pytest.raises(FileNotFoundError):
+        load_palette(tmp_path / "missing.json", fetch=lambda query: pytest.fail("queried Wikidata"))
+
+
+def test_version_mismatch(tmp_path):
+    path = tmp_path / "palette.json"
+    path.write_text(json.dumps({"version": PALETTE_VERSION + 1, "colors": []}))
+    with pytest.raises(ValueError, match="--refresh"):
+        load_palette(path)
+
+
+def test_default_path_and_cli(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("ORKA_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("ORKA_PALETTE", raising=False)
+    main(["--from", str(FIXTURE)])
+    assert (tmp_path / "palette" / "wikidata-colors.json").is_file()
+    assert "14 colors" in capsys.readouterr().out
+
+
+def test_named_color_index():
+    palette = color_palette.palette_from_bindings(_bindings())
+    index = palette.index()
+    matches = index.query([[202, 128, 35], [179, 95, 53]])
+    assert matches.names == ["ochre", "copper"]
+    assert matches.uris[1] == "http://www.wikidata.org/entity/Q1105656"
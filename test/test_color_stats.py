@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+USE_CASE = Path(__file__).resolve().parent.parent / "evaluation" / "use-case"
+sys.path.insert(0, str(USE_CASE))
+
+from color_stats import color_table, colorize, dominant_colors, label_map  # noqa: E402
+
+
+def _scene(seed=0, instances=12, shape=(90, 120)):
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 256, size=shape + (3,), dtype=np.uint8)
+    masks = np.zeros((instances,) + shape, dtype=bool)
+    for i in range(instances):
+        y, x = rng.integers(0, shape[0] - 20), rng.integers(0, shape[1] - 20)
+        masks[i, y:y + rng.integers(3, 30), x:x + rng.integers(3, 30)] = True
+        # A block of one color so every instance has a clear dominant color
+        image[y:y + 2, x:x + 3] = rng.integers(0, 256, size=3)
+    return image, masks
+
+
+def _check_reference(table, image, owned):
+    for i, mask in enumerate(owned):
+        assert mask.sum() == table["pixels"][i]
+        if not mask.any():
+            continue
+        pixels = image[mask].astype(int)
+        assert np.allclose(table["mean"][i], pixels.mean(axis=0), atol=1e-3)
+        sorted_pixels = np.sort(pixels, axis=0)
+        assert np.array_equal(table["median"][i], sorted_pixels[(len(pixels) - 1) // 2])
+
+        keys = ((pixels >> 4) * [256, 16, 1]).sum(axis=1)
+        values, counts = np.unique(keys, return_counts=True)
+        best = keys == values[counts.argmax()]
+        assert np.array_equal(table["dominant"][i], np.rint(pixels[best].mean(axis=0)))
+
+
+def test_matches_per_mask_reference():
+    image, masks = _scene()
+    # Every instance is measured over its whole mask, overlaps included
+    _check_reference(color_table(image, masks), image, masks)
+
+    # The exclusive rule gives overlapping pixels to the first mask
+    labels = label_map(masks)
+    exclusive = color_table(image, masks, exclusive=True)
+    assert np.array_equal(color_table(image, labels=labels), exclusive)
+    _check_reference(exclusive, image, [labels == i + 1 for i in range(len(masks))])
+
+
+def test_overlapping_masks_match_baseline_mean():
+    image, masks = _scene(seed=4, instances=4)
+    masks[1] = False
+    masks[1, 10:30, 10:30] = True
+    masks[0, 5:40, 5:40] = True  # covers instance 1 completely
+    masks[2, 20:50, 20:50] = True  # overlaps instance 0 partly
+    table = color_table(image, masks)
+    dominant = dominant_colors(image, masks, top_k=1)
+    for i, mask in enumerate(masks):
+        # What get_color computed per mask before
+        assert np.allclose(table["mean"][i], image[mask].mean(axis=0), atol=1e-3)
+        assert table["pixels"][i] == dominant.pixels[i] == mask.sum()
+    assert color_table(image, masks, exclusive=True)["pixels"][1] == 0
+
+
+def test_label_map_first_mask_wins():
+    masks = np.zeros((3, 4, 5), dtype=bool)
+    masks[0, :2] = masks[1, 1:3] = masks[2, :, 4] = True
+    labels = label_map(masks)
+    assert labels[0, 0] == 1 and labels[1, 0] == 1 and labels[2, 0] == 2 and labels[3, 0] == 0
+    assert labels[0, 4] == 1 and labels[3, 4] == 3
+    assert label_map(masks[:0]).shape == (4, 5) and not label_map(masks[:0]).any()
+
+
+def test_empty_instances_and_colorize():
+    image, masks = _scene(instances=3)
+    masks[1] = False
+    table = color_table(image, masks)
+    assert table["pixels"][1] == 0 and not table["mean"][1].any()
+    painted = colorize(label_map(masks), table["mean"])
+    assert painted.shape == image.shape and not painted[~masks.any(axis=0)].any()
+
+
+def test_dominant_colors_find_most_common_color():
+    # 40% red, 30% green, 30% blue: a per-channel mode would report black
+    image = np.zeros((10, 10, 3), dtype=np.uint8)
+    image.reshape(-1, 3)[:40] = (200, 10, 10)
+    image.reshape(-1, 3)[40:75] = (10, 200, 10)
+    image.reshape(-1, 3)[75:] = (10, 10, 200)
+    # Slight noise so each color is spread over neighbouring values
+    image = image + np.random.default_rng(1).integers(0, 3, size=image.shape, dtype=np.uint8)
+    masks = np.ones((1, 10, 10), dtype=bool)
+
+    for refine in (False, True):
+        dominant = dominant_colors(image, masks, top_k=3, refine=refine)
+        assert np.allclose(dominant.colors[0], [(201, 11, 11), (11, 201, 11), (11, 11, 201)], atol=1)
+        assert np.allclose(dominant.shares[0], [0.4, 0.35, 0.25])
+        assert dominant.pixels[0] == 100
+
+
+def test_dominant_colors_on_citrus_example():
+    image = np.asarray(Image.open(USE_CASE / "citrus.jpg").convert("RGB"))
+    h, w = image.shape[:2]
+    masks = np.zeros((3, h, w), dtype=bool)
+    masks[0, : h // 2, : w // 3] = masks[1, : h // 2, w // 3:] = masks[2, h // 2:] = True
+    labels = label_map(masks)
+
+    # Timing lives in benchmarks/bench_color_stats.py
+    refined = dominant_colors(image, labels=labels, top_k=2, refine=True)
+    assert (refined.shares[:, 0] >= refined.shares[:, 1]).all()
+
+    dominant = dominant_colors(image, labels=labels, top_k=2)
+    for i in range(3):
+        pixels = image[labels == i + 1].astype(int)
+        # Every pixel of the top bin lies within one bin width of its mean color
+        near = (np.abs(pixels - dominant.colors[i, 0]).max(axis=1) < 16).mean()
+        assert near >= dominant.shares[i, 0] > dominant.shares[i, 1] > 0
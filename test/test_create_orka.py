@@ -0,0 +1,95 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import rdflib
+from rdflib import BNode, Literal
+from rdflib.namespace import OWL, RDFS
+
+USE_CASE = Path(__file__).resolve().parent.parent / "evaluation" / "use-case"
+sys.path.insert(0, str(USE_CASE))
+
+from color_palette import palette_from_bindings  # noqa: E402
+from create_orka import ORKA, ClassSpec, add_classes, color_specs, main  # noqa: E402
+from named_colors import NamedColorIndex  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent / "data" / "wikidata-colors.json"
+
+
+def _palette():
+    with open(FIXTURE) as f:
+        return palette_from_bindings(json.load(f)["results"]["bindings"])
+
+
+def _restrictions(graph, cls):
+    return {
+        (graph.value(r, OWL.onProperty), graph.value(r, OWL.hasValue))
+        for r in graph.objects(cls, RDFS.subClassOf) if isinstance(r, BNode)
+    }
+
+
+def test_color_classes():
+    graph = rdflib.Graph()
+    specs = color_specs(_palette())
+    # "navy blue" has a space and is skipped, like before
+    assert "Q1358326" not in {spec.id for spec in specs}
+    assert add_classes(graph, specs) == len(specs) == 13
+
+    copper = ORKA.Q1105656
+    assert graph.value(copper, RDFS.label) == Literal("Copper")
+    named = {c for c in graph.objects(copper, RDFS.subClassOf) if not isinstance(c, BNode)}
+    assert named == {ORKA.Q47071, ORKA.Q39338}
+    assert _restrictions(graph, copper) == {
+        (ORKA.hasRGBvalue, Literal("B87333")),
+        (ORKA.hasWikiDataURI, Literal("https://www.wikidata.org/wiki/Q1105656")),
+    }
+    # Colors without a generated parent hang under orka:Color
+    assert (ORKA.Q3142, RDFS.subClassOf, ORKA.Color) in graph
+    assert (ORKA.Q1050290, RDFS.subClassOf, ORKA.Color) not in graph
+
+    # The generated classes can be read back as a named-color index
+    index = NamedColorIndex.from_graph(graph)
+    assert index.nearest([179, 95, 53])[:2] == ("Copper", "https://www.wikidata.org/wiki/Q1105656")
+
+
+def test_rerun_replaces_classes():
+    graph = rdflib.Graph()
+    specs = color_specs(_palette())
+    add_classes(graph, specs)
+    size = len(graph)
+    add_classes(graph, specs)
+    assert len(graph) == size
+
+    changed = [spec._replace(annotations={"hasRGBvalue": ["000001"]}) if spec.id == "Q3142" else spec for spec in specs]
+    add_classes(graph, changed)
+    assert _restrictions(graph, ORKA.Q3142) == {(ORKA.hasRGBvalue, Literal("000001"))}
+
+
+def test_thousands_of_classes_take_seconds():
+    specs = [
+        ClassSpec(f"Generated{i}", f"Generated {i}", [f"Generated{i // 10}"] if i else [],
+                  {"hasWikiDataURI": [f"https://www.wikidata.org/wiki/Q{i}"], "inDataSet": ["synthetic"]})
+        for i in range(5000)
+    ]
+    graph = rdflib.Graph()
+    start = time.perf_counter()
+    add_classes(graph, specs, root=ORKA.PhysicalEntity)
+    assert time.perf_counter() - start < 5
+    assert (ORKA.Generated123, RDFS.subClassOf, ORKA.Generated12) in graph
+    assert (ORKA.Generated0, RDFS.subClassOf, ORKA.PhysicalEntity) in graph
+
+
+def test_main(tmp_path, monkeypatch):
+    ontology = tmp_path / "orka.ttl"
+    ontology.write_text(f"<{ORKA.Color}> a <{OWL.Class}> .\n")
+    palette = tmp_path / "palette.json"
+    monkeypatch.setenv("ORKA_PALETTE", str(palette))
+    monkeypatch.setenv("ORKA_OFFLINE", "1")
+    from color_palette import save_palette
+
+    save_palette(_palette(), palette)
+    output = tmp_path / "updated.owl"
+    main(["--ontology", str(ontology), "--output", str(output)])
+    graph = rdflib.Graph().parse(str(output), format="xml")
+    assert (ORKA.Q1426482, RDFS.subClassOf, ORKA.Q47071) in graph
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from orka_ros.image_conversion import ros_image_to_array, ros_image_to_pil
+
+
+def make_msg(array, encoding, pad=0, bigendian=False):
+    """Pack an array like a sensor_msgs/Image with ``pad`` bytes per row."""
+    array = np.asarray(array)
+    if bigendian:
+        array = array.astype(array.dtype.newbyteorder(">"))
+    rows = array.reshape(array.shape[0], -1).view(np.uint8)
+    rows = np.pad(rows, ((0, 0), (0, pad)), constant_values=255)
+    return SimpleNamespace(
+        height=array.shape[0], width=array.shape[1], encoding=encoding,
+        step=rows.shape[1], is_bigendian=bigendian, data=rows.tobytes(),
+    )
+
+
+def test_rgb_and_bgr_with_row_padding_are_views():
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    msg = make_msg(rgb, "rgb8", pad=3)
+    out = ros_image_to_array(msg)
+    np.testing.assert_array_equal(out, rgb)
+    assert not out.flags.owndata
+    assert np.shares_memory(out, np.frombuffer(msg.data, dtype=np.uint8))
+
+    bgra = np.concatenate([rgb[..., ::-1], np.full((5, 7, 1), 9, np.uint8)], axis=-1)
+    np.testing.assert_array_equal(ros_image_to_array(make_msg(bgra, "bgra8", pad=1)), rgb)
+    assert ros_image_to_pil(make_msg(bgra, "bgra8")).mode == "RGB"
+
+
+@pytest.mark.parametrize("encoding,dtype,mode", [("mono8", np.uint8, "L"), ("mono16", np.uint16, "I;16"), ("16UC1", np.uint16, "I;16"), ("32FC1", np.float32, "F")])
+def test_single_channel_encodings(encoding, dtype, mode):
+    depth = (np.arange(4 * 6).reshape(4, 6) * 37).astype(dtype)
+    np.testing.assert_array_equal(ros_image_to_array(make_msg(depth, encoding, pad=4)), depth)
+    np.testing.assert_array_equal(ros_image_to_array(make_msg(depth, encoding, bigendian=True)), depth)
+    assert ros_image_to_pil(make_msg(depth, encoding)).mode == mode
+
+
+def test_yuv422_decodes_grey_levels():
+    # UYVY with neutral chroma is pure luma
+    luma = np.array([[16, 128, 235, 60]], dtype=np.uint8)
+    packed = np.array([[128, 16, 128, 128, 128, 235, 128, 60]], dtype=np.uint8).reshape(1, 4, 2)
+    out = ros_image_to_array(make_msg(packed, "yuv422"))
+    np.testing.assert_array_equal(out, np.repeat(luma[..., None], 3, axis=-1))
+
+    yuyv = packed.reshape(1, -1)[:, [1, 0, 3, 2, 5, 4, 7, 6]].reshape(1, 4, 2)
+    np.testing.assert_array_equal(ros_image_to_array(make_msg(yuyv, "yuv422_yuy2")), out)
+
+
+def test_unknown_encoding_without_bridge(monkeypatch):
+    from orka_ros import image_conversion
+    monkeypatch.setattr(image_conversion, "CvBridge", None)
+    monkeypatch.setattr(image_conversion, "_bridge", None)
+    with pytest.raises(ValueError):
+        ros_image_to_array(make_msg(np.zeros((2, 2), np.uint8), "bayer_rggb8"))
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+from PIL import Image
+from rdflib import Literal
+
+from graph_manager.main import GraphManager
+from orka_ros import image_writer
+from orka_ros.image_writer import AsyncImageWriter
+from orka_ros.vision_sensor import add_vision_sensor_observation, initiate_sensor
+
+
+def test_async_observation_records_triples_before_write(tmp_path, monkeypatch):
+    release = threading.Event()
+    real_write = image_writer.write_image
+
+    def slow_write(*args, **kwargs):
+        release.wait(5)
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(image_writer, "write_image", slow_write)
+    gm = GraphManager()
+    initiate_sensor(gm, "vision_sensor", "/camera/image")
+
+    with AsyncImageWriter(max_workers=1) as writer:
+        future = add_vision_sensor_observation(
+            gm, "vision_sensor", "obs_1", "meas_1", "res_1",
+            image=Image.new("RGBA", (16, 16)), image_dir=str(tmp_path), writer=writer,
+        )
+        expected = tmp_path / "res_1.jpg"
+        assert (gm.obs_graph_base["res_1"], gm.ORKA.hasValue, Literal(str(expected))) in gm.graph
+        assert not future.done()
+        assert writer.pending == 1
+
+        release.set()
+        assert writer.flush(timeout=5)
+        assert future.result() == expected
+        assert expected.exists()
+        assert writer.written == 1
+
+
+def test_submit_blocks_when_backlog_is_full(tmp_path, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(image_writer, "write_image", lambda *args, **kwargs: release.wait(5))
+
+    writer = AsyncImageWriter(max_workers=1, max_pending=2)
+    image = Image.new("RGB", (4, 4))
+    writer.submit(image, tmp_path / "a.jpg")
+    writer.submit(image, tmp_path / "b.jpg")
+    with pytest.raises(TimeoutError):
+        writer.submit(image, tmp_path / "c.jpg", timeout=0.05)
+    release.set()
+    writer.close()
+    assert writer.pending == 0
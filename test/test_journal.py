@@ -0,0 +1,124 @@
+import time
+
+from rdflib.namespace import RDF
+
+from graph_manager.journal import REMOVED, GraphJournal, compact, load_journaled_graph
+from graph_manager.main import GraphManager
+
+
+def _observe(gm, start, count):
+    gm.add_observations([
+        {"observation_name": f"obs_{i}", "measurement_name": f"meas_{i}", "sensor": "lidar_1", "result": f"res_{i}"}
+        for i in range(start, start + count)
+    ])
+
+
+def test_journal_replays_session(tmp_path):
+    journal = tmp_path / "session.nq"
+    gm = GraphManager()
+    gm.enable_journal(journal, fsync_every=4)
+    _observe(gm, 0, 10)
+    gm.add_robot("robot_1")
+    gm.close_journal()
+
+    assert set(load_journaled_graph(journal_path=journal)) == set(gm.graph)
+
+    # A restarted session picks up the journal and keeps appending
+    restarted = GraphManager()
+    restarted.enable_journal(journal)
+    _observe(restarted, 10, 5)
+    restarted.close_journal()
+    assert len(restarted.graph) > len(gm.graph)
+    assert set(load_journaled_graph(journal_path=journal)) == set(restarted.graph)
+
+
+def test_compaction_and_removals(tmp_path):
+    journal = tmp_path / "session.nq"
+    snapshot = tmp_path / "session.ttl"
+    gm = GraphManager()
+    gm.enable_journal(journal)
+    _observe(gm, 0, 3)
+    gm.journal.sync()
+    assert compact(journal, snapshot) == len(gm.graph)
+    assert journal.read_text() == ""
+
+    _observe(gm, 3, 2)
+    gm.graph.remove((gm.obs_graph_base["obs_0"], None, None))
+    gm.graph.remove((gm.obs_graph_base["res_1"], RDF.type, gm.ORKA.Result))
+    gm.graph.remove((gm.obs_graph_base["res_1"], RDF.type, gm.ORKA.Result))
+    gm.close_journal()
+
+    restored = load_journaled_graph(snapshot, journal)
+    assert set(restored) == set(gm.graph)
+
+
+def test_incomplete_last_line_is_ignored(tmp_path):
+    journal = tmp_path / "session.nq"
+    gm = GraphManager()
+    gm.enable_journal(journal)
+    _observe(gm, 0, 2)
+    gm.close_journal()
+    with open(journal, "a") as f:
+        f.write("<http://example.org/orka/observation_graph/obs_9> <http://www.w3.org/1999/02/22-rdf")
+
+    assert set(load_journaled_graph(journal_path=journal)) == set(gm.graph)
+
+
+def test_plain_removals_are_journaled(tmp_path):
+    journal = tmp_path / "session.nq"
+    gm = GraphManager()
+    gm.enable_journal(journal)
+    _observe(gm, 0, 4)
+    size = len(gm.graph)
+    gm.graph -= list(gm.graph.triples((None, None, gm.obs_graph_base["res_2"])))
+    gm.graph.remove((None, RDF.type, gm.ORKA.Observation))
+    gm.graph.remove((gm.obs_graph_base["nothing"], None, None))
+    gm.close_journal()
+
+    assert (None, RDF.type, gm.ORKA.Observation) not in gm.graph
+    # Wildcard removals are written as the triples they matched
+    removals = [line for line in journal.read_text().splitlines() if line.endswith(f"{REMOVED.n3()} .")]
+    assert len(removals) == size - len(gm.graph)
+    assert set(load_journaled_graph(journal_path=journal)) == set(gm.graph)
+
+
+def test_idle_journal_is_synced(tmp_path):
+    journal = GraphJournal(tmp_path / "session.nq", fsync_every=1000, fsync_interval=0.05)
+    gm = GraphManager()
+    journal.add((gm.obs_graph_base["robot_1"], RDF.type, gm.ORKA.Robot))
+    deadline = time.monotonic() + 5
+    while not (tmp_path / "session.nq").read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert (tmp_path / "session.nq").read_text().endswith(" .\n")
+    journal.close()
+    assert journal.closed
+
+
+def test_commit_syncs_journal(tmp_path):
+    journal = tmp_path / "session.nq"
+    gm = GraphManager()
+    gm.enable_journal(journal, fsync_interval=0)
+    gm.add_robot("robot_1")
+    assert journal.read_text() == ""
+    gm.commit()
+    assert set(load_journaled_graph(journal_path=journal)) == set(gm.graph)
+    gm.close_journal()
+
+
+def test_ntriples_lines_parse_back():
+    from rdflib import BNode, Graph, Literal, URIRef
+    from rdflib.namespace import XSD
+
+    from graph_manager.ntriples import nt_lines
+
+    s = URIRef("http://example.org/s")
+    triples = {
+        (s, RDF.value, Literal('line one\nline "two" \\ end\r')),
+        (s, RDF.value, Literal("rot", lang="de")),
+        (s, RDF.value, Literal(1.5, datatype=XSD.double)),
+        (s, RDF.value, Literal("plain")),
+    }
+    text = nt_lines(triples)
+    assert text.count("\n") == len(triples)
+    assert set(Graph().parse(data=text, format="nt")) == triples
+    assert nt_lines([(BNode("b1"), RDF.type, s)]) == f"_:b1 {RDF.type.n3()} <{s}> .\n"
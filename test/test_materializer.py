@@ -0,0 +1,186 @@
+from pathlib import Path
+
+import rdflib
+from rdflib import Literal, Namespace
+from rdflib.collection import Collection
+from rdflib.namespace import OWL, RDF, RDFS
+
+from graph_manager.main import SOSA, GraphManager
+from graph_manager.materializer import Materializer
+from graph_manager.synthetic import FleetGenerator
+
+PELLET_OUTPUT = Path(__file__).resolve().parent.parent / "owl" / "orka-inferred.owl"
+EX = Namespace("http://example.org/")
+
+
+def _pellet_graph():
+    g = rdflib.Graph()
+    g.parse(PELLET_OUTPUT)
+    return g
+
+
+def test_pellet_output_is_a_fixpoint():
+    g = _pellet_graph()
+    materializer = Materializer([g], g)
+    materializer.materialize(list(g))
+    # Pellet's output already holds every type and object property the rules
+    # derive; only hasValue restrictions on data properties add values
+    assert all(isinstance(o, Literal) for _, _, o in materializer.inferred)
+
+
+def test_recovers_pellet_types_from_most_specific_types():
+    g = _pellet_graph()
+    individuals = set(g.subjects(RDF.type, OWL.NamedIndividual))
+    schema, abox = rdflib.Graph(), rdflib.Graph()
+    for triple in g:
+        (abox if triple[0] in individuals else schema).add(triple)
+
+    hierarchy = Materializer([schema], rdflib.Graph()).superclasses
+    reduced = rdflib.Graph()
+    for s, p, o in abox:
+        if p == RDF.type and any(o in hierarchy.get(t, ()) for t in abox.objects(s, RDF.type)):
+            continue
+        reduced.add((s, p, o))
+    assert len(reduced) < len(abox)
+
+    materializer = Materializer([schema], reduced)
+    materializer.materialize(list(reduced))
+    derived = set(reduced.triples((None, RDF.type, None))) | set(materializer.inferred.triples((None, RDF.type, None)))
+    assert derived == set(abox.triples((None, RDF.type, None)))
+
+
+def test_rules():
+    schema = rdflib.Graph()
+    schema.add((EX.partOf, RDF.type, OWL.TransitiveProperty))
+    schema.add((EX.near, RDF.type, OWL.SymmetricProperty))
+    schema.add((EX.hasPart, OWL.inverseOf, EX.partOf))
+    schema.add((EX.hosts, RDFS.domain, EX.Platform))
+    schema.add((EX.hosts, RDFS.range, EX.Sensor))
+    head = rdflib.BNode()
+    Collection(schema, head, [EX.hosts, EX.observes])
+    schema.add((EX.platformObserves, OWL.propertyChainAxiom, head))
+    restriction = rdflib.BNode()
+    schema.add((restriction, OWL.onProperty, EX.observes))
+    schema.add((restriction, OWL.hasValue, EX.Light))
+    schema.add((EX.Camera, RDFS.subClassOf, restriction))
+
+    data = rdflib.Graph()
+    m = Materializer([schema], data)
+    for triple in [(EX.a, EX.partOf, EX.b), (EX.b, EX.partOf, EX.c), (EX.a, EX.near, EX.d),
+                   (EX.robot, EX.hosts, EX.cam), (EX.cam, RDF.type, EX.Camera)]:
+        data.add(triple)
+        m.notify(triple)
+    m.run()
+
+    inferred = m.inferred
+    assert (EX.a, EX.partOf, EX.c) in inferred
+    assert (EX.c, EX.hasPart, EX.a) in inferred
+    assert (EX.d, EX.near, EX.a) in inferred
+    assert (EX.robot, RDF.type, EX.Platform) in inferred
+    assert (EX.cam, RDF.type, EX.Sensor) in inferred
+    assert (EX.cam, EX.observes, EX.Light) in inferred
+    assert (EX.robot, EX.platformObserves, EX.Light) in inferred
+    assert not any(isinstance(s, rdflib.BNode) or isinstance(o, rdflib.BNode) for s, _, o in inferred)
+
+
+def test_incremental_matches_full_materialization():
+    gm = GraphManager()
+    gm.enable_reasoning()
+    generator = FleetGenerator(gm, seed=5)
+    generator.populate(300, batch_size=50)
+    gm.update_graph_with_observation("obs_x", "meas_x", "camera_x", "res_x")
+    gm.add_sensor("camera_x", gm.ORKA.Camera)
+
+    sensors = {row[0] for row in gm.query("SELECT ?s WHERE { ?s a sosa:Sensor }", initNs={"sosa": SOSA})}
+    assert gm.obs_graph_base["camera_x"] in sensors
+    assert {gm.obs_graph_base[name] for name, *_ in generator.sensors} <= sensors
+
+    full = Materializer([gm.ontology], gm.graph)
+    full.materialize(list(gm.graph))
+    assert set(gm.inferred) == set(full.inferred)
+    assert not set(gm.inferred) & set(gm.graph)
+
+
+def _chain_schema():
+    schema = rdflib.Graph()
+    schema.add((EX.partOf, RDF.type, OWL.TransitiveProperty))
+    schema.add((EX.hasPart, OWL.inverseOf, EX.partOf))
+    return schema
+
+
+def test_retract_rederives_what_still_follows():
+    data = rdflib.Graph()
+    m = Materializer([_chain_schema()], data)
+    for triple in [(EX.a, EX.partOf, EX.b), (EX.b, EX.partOf, EX.c), (EX.c, EX.partOf, EX.d),
+                   (EX.a, EX.partOf, EX.x), (EX.x, EX.partOf, EX.c)]:
+        data.add(triple)
+    m.materialize(list(data))
+    assert (EX.a, EX.partOf, EX.d) in m.inferred
+
+    # b -> c goes, but a still reaches c and d through x
+    gone = (EX.b, EX.partOf, EX.c)
+    m.retract([gone])
+    data.remove(gone)
+    m.run()
+    assert (EX.b, EX.partOf, EX.d) not in m.inferred
+    assert (EX.c, EX.hasPart, EX.b) not in m.inferred
+    assert (EX.a, EX.partOf, EX.d) in m.inferred
+    assert (EX.d, EX.hasPart, EX.a) in m.inferred
+
+    full = Materializer([_chain_schema()], data)
+    full.materialize(list(data))
+    assert set(m.inferred) == set(full.inferred)
+
+
+def test_eviction_drops_unsupported_inferences():
+    gm = GraphManager()
+    gm.graph.add((EX.partOf, RDF.type, OWL.TransitiveProperty))
+    gm.enable_reasoning()
+    gm.update_graph_with_observation("obs_0", "meas_0", "camera", "res_0", timestamp=1000)
+    # The result is part of a surviving node that is part of another one
+    gm.graph.add((gm.obs_graph_base["res_0"], EX.partOf, EX.kept))
+    gm.graph.add((EX.kept, EX.partOf, EX.top))
+    gm.graph.add((EX.below, EX.partOf, gm.obs_graph_base["res_0"]))
+    gm.materializer.run()
+    assert (EX.below, EX.partOf, EX.top) in gm.inferred
+
+    gm.enable_retention(max_observations=0)
+    assert (EX.below, EX.partOf, EX.top) not in gm.inferred
+    assert (EX.below, EX.partOf, EX.kept) not in gm.inferred
+    full = Materializer([gm.ontology, gm.graph], gm.graph)
+    full.materialize(list(gm.graph))
+    assert set(gm.inferred) == set(full.inferred)
+
+
+def test_runtime_schema_axioms():
+    gm = GraphManager()
+    gm.enable_reasoning()
+    gm.graph.add((EX.a, EX.partOf, EX.b))
+    gm.graph.add((EX.b, EX.partOf, EX.c))
+    gm.graph.add((EX.cam, RDF.type, EX.Webcam))
+    gm.materializer.run()
+    assert (EX.a, EX.partOf, EX.c) not in gm.inferred
+
+    gm.graph.add((EX.partOf, RDF.type, OWL.TransitiveProperty))
+    gm.graph.add((EX.Webcam, RDFS.subClassOf, gm.ORKA.Camera))
+    sensors = {row[0] for row in gm.query("SELECT ?s WHERE { ?s a sosa:Sensor }", initNs={"sosa": SOSA})}
+    assert EX.cam in sensors
+    assert (EX.a, EX.partOf, EX.c) in gm.inferred
+
+    gm.graph.remove((EX.partOf, RDF.type, None))
+    gm.materializer.run()
+    assert (EX.a, EX.partOf, EX.c) not in gm.inferred
+    assert (EX.cam, RDF.type, SOSA.Sensor) in gm.inferred
+
+
+def test_plain_removals_are_retracted():
+    gm = GraphManager()
+    gm.graph.add((EX.partOf, RDF.type, OWL.TransitiveProperty))
+    gm.enable_reasoning()
+    for triple in [(EX.a, EX.partOf, EX.b), (EX.b, EX.partOf, EX.c), (EX.c, EX.partOf, EX.d)]:
+        gm.graph.add(triple)
+    gm.materializer.run()
+    gm.graph.remove((EX.b, None, None))
+    gm.materializer.run()
+    assert (EX.a, EX.partOf, EX.c) not in gm.inferred
+    assert (EX.a, EX.partOf, EX.d) not in gm.inferred
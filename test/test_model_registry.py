@@ -0,0 +1,47 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "evaluation" / "use-case"))
+
+from model_registry import ModelRegistry  # noqa: E402
+
+
+def test_models_load_once_on_first_use(tmp_path):
+    calls, warmed = [], []
+
+    def loader(weights_dir, device):
+        calls.append((weights_dir, device))
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry(tmp_path / "models", device="cpu")
+    registry.register("fake", loader, warmed.append)
+    assert not registry.loaded("fake") and calls == []
+
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(registry.get("fake"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [(tmp_path / "models", "cpu")]
+    assert all(m is models[0] for m in models)
+
+    registry.warm_up()
+    assert warmed == [models[0]] and len(calls) == 1
+
+    registry.unload("fake")
+    assert registry.get("fake") is not models[0]
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_module_registry_loads_nothing_on_import():
+    import model_registry
+
+    assert not any(model_registry.registry.loaded(name) for name in ("maskrcnn", "yolov5s"))
+    assert model_registry.registry._device is None
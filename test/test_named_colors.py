@@ -0,0 +1,103 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+USE_CASE = Path(__file__).resolve().parent.parent / "evaluation" / "use-case"
+sys.path.insert(0, str(USE_CASE))
+
+from named_colors import NamedColorIndex, parse_rgb, srgb_to_lab  # noqa: E402
+
+ORKA = Namespace("https://w3id.org/def/orka#")
+
+PALETTE = {
+    "ochre": "CC7722",
+    "copper": "B87333",
+    "honey": "BC9337",
+    "olive": "808000",
+    "white": "FFFFFF",
+    "black": "000000",
+    "crimson": "DC143C",
+    "navy": "000080",
+}
+
+
+def _reference(index, colors):
+    lab = srgb_to_lab(np.asarray(colors, dtype=np.float64))
+    return ((lab[:, None, :] - index.lab[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+
+
+def test_lab_conversion():
+    assert np.allclose(srgb_to_lab([255, 255, 255]), [100, 0, 0], atol=1e-3)
+    assert np.allclose(srgb_to_lab([0, 0, 0]), [0, 0, 0], atol=1e-9)
+    assert np.allclose(srgb_to_lab([255, 0, 0]), [53.24, 80.09, 67.20], atol=0.05)
+
+
+def test_parse_rgb():
+    assert parse_rgb("#cc7722") == parse_rgb("CC7722") == [204, 119, 34]
+    assert parse_rgb((1, 2, 3)) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        parse_rgb("CC77")
+
+
+def test_use_case_colours():
+    index = NamedColorIndex.from_mapping(PALETTE, {"ochre": "http://www.wikidata.org/entity/Q1426482"})
+    matches = index.query([[202, 128, 35], [179, 95, 53], [190, 186, 76]])
+    assert matches.names[:2] == ["ochre", "copper"]
+    assert matches.uris[0] == "http://www.wikidata.org/entity/Q1426482"
+    assert matches.uris[1] is None
+    name, _, distance = index.nearest([204, 119, 34])
+    assert name == "ochre" and distance == pytest.approx(0)
+
+
+def test_batch_matches_brute_force():
+    rng = np.random.default_rng(0)
+    palette = {f"c{i}": rng.integers(0, 256, 3) for i in range(300)}
+    index = NamedColorIndex.from_mapping(palette)
+    colors = rng.integers(0, 256, size=(10000, 3))
+    matches = index.query(colors)
+    assert np.array_equal(matches.indices, _reference(index, colors))
+    expected = np.sqrt(((srgb_to_lab(colors) - index.lab[matches.indices]) ** 2).sum(axis=1))
+    assert np.allclose(matches.distances, expected)
+    assert matches.names[:5] == [index.names[i] for i in matches.indices[:5]]
+
+
+def test_lookup_table_is_close_to_exact():
+    rng = np.random.default_rng(1)
+    palette = {f"c{i}": rng.integers(0, 256, 3) for i in range(300)}
+    index = NamedColorIndex.from_mapping(palette, lut_bits=5)
+    colors = rng.integers(0, 256, size=(20000, 3))
+    exact = index.query(colors)
+    approximate = index.query(colors, approximate=True)
+    assert np.mean(exact.indices == approximate.indices) > 0.75
+    # A miss only picks a palette color a few Delta E further away
+    assert np.all(approximate.distances - exact.distances < 10)
+
+    start = time.perf_counter()
+    index.query(colors, approximate=True)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_from_graph():
+    g = Graph()
+    g.add((ORKA.Ochre, RDF.type, OWL.Class))
+    g.add((ORKA.Ochre, RDFS.subClassOf, ORKA.Color))
+    g.add((ORKA.Ochre, RDFS.label, Literal("ochre")))
+    for prop, value in ((ORKA.hasRGBvalue, Literal("CC7722")),
+                        (ORKA.hasWikiDataURI, URIRef("http://www.wikidata.org/entity/Q1426482"))):
+        restriction = BNode()
+        g.add((restriction, RDF.type, OWL.Restriction))
+        g.add((restriction, OWL.onProperty, prop))
+        g.add((restriction, OWL.hasValue, value))
+        g.add((ORKA.Ochre, RDFS.subClassOf, restriction))
+    g.add((ORKA.Navy, RDFS.subClassOf, ORKA.Color))
+    g.add((ORKA.Navy, ORKA.hasRGBvalue, Literal("#000080")))
+
+    index = NamedColorIndex.from_graph(g)
+    assert len(index) == 2
+    assert index.nearest([200, 120, 40])[:2] == ("ochre", "http://www.wikidata.org/entity/Q1426482")
+    assert index.nearest([0, 0, 120])[:2] == ("Navy", str(ORKA.Navy))
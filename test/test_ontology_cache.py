@@ -0,0 +1,124 @@
+import shutil
+
+import pytest
+from rdflib.graph import ModificationException
+
+from graph_manager import ontology
+from graph_manager.main import GraphManager
+
+
+def _copy_owl(tmp_path):
+    owl = tmp_path / "orka.owl"
+    shutil.copy(ontology.DEFAULT_ONTOLOGY_PATH, owl)
+    return owl
+
+
+def test_snapshot_written_and_reused(tmp_path):
+    owl = _copy_owl(tmp_path)
+    cache_dir = tmp_path / "cache"
+    ontology.clear_loaded_ontologies()
+
+    parsed = ontology.load_ontology(owl, cache_dir=cache_dir)
+    snap = ontology.snapshot_path(ontology.file_digest(owl), cache_dir)
+    assert snap.exists()
+
+    # Same process shares the graph
+    assert ontology.load_ontology(owl, cache_dir=cache_dir) is parsed
+
+    ontology.clear_loaded_ontologies()
+    restored = ontology.load_ontology(owl, cache_dir=cache_dir)
+    assert restored is not parsed
+    assert set(restored) == set(parsed)
+    assert dict(restored.namespaces()) == dict(parsed.namespaces())
+    ontology.clear_loaded_ontologies()
+
+
+def test_snapshot_keyed_by_content(tmp_path):
+    owl = _copy_owl(tmp_path)
+    cache_dir = tmp_path / "cache"
+    before = ontology.file_digest(owl)
+    ontology.load_ontology(owl, cache_dir=cache_dir, share=False)
+
+    with open(owl, "a") as f:
+        f.write("\n<!-- edited -->\n")
+    after = ontology.file_digest(owl)
+    assert after != before
+    assert not ontology.snapshot_path(after, cache_dir).exists()
+    ontology.load_ontology(owl, cache_dir=cache_dir, share=False)
+    assert ontology.snapshot_path(after, cache_dir).exists()
+
+
+def test_graph_managers_share_read_only_ontology(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORKA_CACHE_DIR", str(tmp_path))
+    ontology.clear_loaded_ontologies()
+    shared = ontology.load_ontology()
+    size = len(shared)
+
+    gm = GraphManager()
+    gm.add_robot("robot_1")
+    assert gm.ontology is shared
+    assert len(shared) == size
+    assert len(gm.graph) == 1
+    assert len(gm.union) == size + 1
+    ontology.clear_loaded_ontologies()
+
+
+def test_shared_ontology_rejects_writes(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORKA_CACHE_DIR", str(tmp_path))
+    ontology.clear_loaded_ontologies()
+    first, second = GraphManager(), GraphManager()
+    size = len(second.ontology)
+    triple = (first.ORKA.robot_1, ontology.rdflib.RDF.type, first.ORKA.Robot)
+
+    with pytest.raises(ModificationException):
+        first.ontology.add(triple)
+    with pytest.raises(ModificationException):
+        first.ontology += [triple]
+    with pytest.raises(ModificationException):
+        first.ontology.remove((None, None, None))
+    assert triple not in second.ontology
+    assert len(second.ontology) == size
+
+    # A private copy stays writable
+    private = ontology.load_ontology(share=False)
+    private.add(triple)
+    assert triple in private and triple not in second.ontology
+    ontology.clear_loaded_ontologies()
+
+
+def test_saved_graph_holds_only_observations(tmp_path):
+    gm = GraphManager()
+    sensor = gm.add_sensor("camera_1", gm.ORKA.Camera)
+    gm.update_graph_with_observation("obs_1", "meas_1", sensor, "res_1")
+
+    path = tmp_path / "obs.ttl"
+    gm.save_graph(str(path))
+    saved = ontology.rdflib.Graph().parse(str(path))
+    assert set(saved) == set(gm.graph)
+
+    full = tmp_path / "full.ttl"
+    gm.save_graph(str(full), include_ontology=True)
+    assert len(ontology.rdflib.Graph().parse(str(full))) == len(gm.union)
+
+    rows = gm.query(
+        "SELECT ?o WHERE { ?o a orka:Observation . orka:Robot a owl:Class }",
+        initNs={"orka": gm.ORKA, "owl": ontology.rdflib.OWL},
+    )
+    assert [row.o for row in rows] == [gm.obs_graph_base["obs_1"]]
+
+
+def test_snapshot_is_plain_json(tmp_path):
+    import json
+
+    owl = _copy_owl(tmp_path)
+    cache_dir = tmp_path / "cache"
+    parsed = ontology.load_ontology(owl, cache_dir=cache_dir, share=False)
+    snap = ontology.snapshot_path(ontology.file_digest(owl), cache_dir)
+    with open(snap, encoding="utf-8") as f:
+        payload = json.load(f)
+    assert payload["version"] == ontology.SNAPSHOT_VERSION
+    assert len(payload["triples"]) == len(parsed)
+
+    # A damaged snapshot is ignored and the ontology parsed again
+    snap.write_text("not json")
+    assert len(ontology.load_ontology(owl, cache_dir=cache_dir, share=False)) == len(parsed)
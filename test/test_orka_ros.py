@@ -1,11 +1,10 @@
-from pathlib import Path
 from PIL import Image
 
 from graph_manager.main import GraphManager
 from orka_ros.vision_sensor import initiate_sensor, add_vision_sensor_observation
 
 
-def test_vision_sensor_observation_graph():
+def test_vision_sensor_observation_graph(tmp_path):
     gm = GraphManager()
 
     sensor_name = "vision_sensor"
@@ -18,7 +17,8 @@ def test_vision_sensor_observation_graph():
     measurement_name = "meas_vision_1"
     result_name = "res_vision_1"
 
-    output_dir = Path("observation_graph")
+    # The checked-in observation_graph/ example stays untouched
+    output_dir = tmp_path / "observation_graph"
     output_dir.mkdir(parents=True, exist_ok=True)
 
     image_path = add_vision_sensor_observation(
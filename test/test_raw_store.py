@@ -0,0 +1,108 @@
+import hashlib
+
+import pytest
+from PIL import Image
+from rdflib import Graph
+
+from graph_manager.main import GraphManager
+from orka_ros.image_writer import AsyncImageWriter
+from orka_ros.raw_store import RawDataStore, blob_uri, digest_from_uri, image_digest, pixels_uri
+from orka_ros.vision_sensor import add_vision_sensor_observation, initiate_sensor
+
+
+def test_blobs_are_sharded_and_deduplicated(tmp_path):
+    store = RawDataStore(tmp_path / "store")
+    first = store.put_bytes(b"payload", mime="text/plain", observation="obs_1")
+    again = store.put_bytes(b"payload", observation="obs_2")
+
+    assert first.created and not again.created
+    assert first.uri == again.uri == blob_uri(first.digest)
+    assert digest_from_uri(first.uri) == first.digest
+    assert first.path.relative_to(store.root).parts == ("objects", first.digest[:2], first.digest[2:4], first.digest)
+    assert first.path.read_bytes() == b"payload"
+    assert store.lookup(first.digest) == {
+        "digest": first.digest, "size": 7, "sha256": first.digest, "mime": "text/plain", "observation": "obs_1",
+    }
+    # The ni URI names the stored bytes
+    assert hashlib.sha256(store.resolve(first.uri).read_bytes()).hexdigest() == digest_from_uri(first.uri)
+    store.close()
+
+    reopened = RawDataStore(tmp_path / "store")
+    assert first.digest in reopened and len(reopened) == 1
+    assert reopened.resolve(first.uri) == first.path
+    reopened.close()
+
+
+def test_observations_record_blob_uris(tmp_path):
+    gm = GraphManager()
+    initiate_sensor(gm, "vision_sensor", "/camera/image")
+    store = RawDataStore(tmp_path / "store")
+    frame = Image.new("RGB", (32, 24), color=(200, 10, 10))
+
+    with AsyncImageWriter() as writer:
+        refs = [
+            add_vision_sensor_observation(
+                gm, "vision_sensor", f"obs_{i}", f"meas_{i}", f"res_{i}", image=frame.copy(), writer=writer, store=store,
+            )
+            for i in range(3)
+        ]
+    assert [ref.created for ref in refs] == [True, False, False]
+    assert len({ref.uri for ref in refs}) == 1
+    assert len(list((tmp_path / "store" / "objects").rglob("*"))) == 3  # two shard dirs + one blob
+    assert store.lookup(refs[0].digest)["mime"] == "image/jpeg"
+    assert store.lookup(refs[0].digest)["observation"] == str(gm.obs_graph_base["obs_0"])
+
+    obs = gm.obs_graph_base["obs_2"]
+    assert (obs, gm.ORKA.hasRawObservation, refs[0].uri) in gm.graph
+    path = tmp_path / "obs.ttl"
+    gm.save_graph(str(path))
+    assert (obs, gm.ORKA.hasRawObservation, refs[0].uri) in Graph().parse(str(path))
+    store.close()
+
+
+def test_images_are_written_from_worker_processes(tmp_path):
+    store = RawDataStore(tmp_path / "store")
+    frames = [Image.new("RGB", (16, 16), color=(i, 0, 0)) for i in range(3)]
+    with AsyncImageWriter(max_workers=2, use_processes=True) as writer:
+        refs = [store.put_image(frame, observation=f"obs_{i}", writer=writer) for i, frame in enumerate(frames)]
+        paths = [ref.future.result(timeout=60) for ref in refs]
+    assert paths == [ref.path for ref in refs]
+    assert all(path.stat().st_size == store.lookup(ref.digest)["size"] for path, ref in zip(paths, refs))
+    store.close()
+
+
+class _FailingWriter(AsyncImageWriter):
+    def run(self, fn, *args, **kwargs):
+        def fail(*_):
+            raise OSError("disk full")
+        return super().run(fail, *args, **kwargs)
+
+
+def test_failed_write_is_not_deduplicated(tmp_path):
+    store = RawDataStore(tmp_path / "store")
+    frame = Image.new("RGB", (8, 8), color=(1, 2, 3))
+    with _FailingWriter() as writer:
+        failed = store.put_image(frame, writer=writer)
+        with pytest.raises(OSError):
+            failed.future.result(timeout=10)
+    assert failed.digest not in store
+
+    retried = store.put_image(frame)
+    assert retried.created and retried.path.is_file()
+    assert retried.digest in store
+    store.close()
+
+
+def test_image_uris_name_pixels_not_bytes(tmp_path):
+    store = RawDataStore(tmp_path / "store")
+    frame = Image.new("RGB", (16, 8), color=(9, 99, 199))
+    jpeg = store.put_image(frame)
+    assert jpeg.uri == pixels_uri(jpeg.digest) and not str(jpeg.uri).startswith("ni:")
+    data = store.resolve(jpeg.uri).read_bytes()
+    assert hashlib.sha256(data).hexdigest() == store.lookup(jpeg.digest)["sha256"] != jpeg.digest
+
+    # Losslessly stored pixels hash back to the URI
+    png = store.put_image(Image.new("RGB", (16, 8), color=(1, 2, 3)), format="PNG")
+    with Image.open(store.resolve(png.uri)) as stored:
+        assert image_digest(stored) == digest_from_uri(png.uri)
+    store.close()
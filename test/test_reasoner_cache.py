@@ -0,0 +1,63 @@
+from graph_manager.reasoner_cache import ReasonerCache, import_closure, reasoning_key
+
+CATALOG = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<catalog prefer="public" xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+    <uri name="http://example.org/missing" uri="missing.owl"/>
+    <uri name="http://example.org/base/" uri="base.owl"/>
+</catalog>
+"""
+
+ROOT = """<?xml version="1.0"?>
+<!DOCTYPE rdf:RDF [ <!ENTITY ex "http://example.org/" > ]>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:owl="http://www.w3.org/2002/07/owl#">
+    <owl:Ontology rdf:about="http://example.org/root">
+        <owl:imports rdf:resource="&ex;base"/>
+        <owl:imports rdf:resource="http://example.org/missing"/>
+    </owl:Ontology>
+</rdf:RDF>
+"""
+
+
+def _ontology(tmp_path):
+    (tmp_path / "catalog-v001.xml").write_text(CATALOG)
+    (tmp_path / "root.owl").write_text(ROOT)
+    (tmp_path / "base.owl").write_text("@prefix owl: <http://www.w3.org/2002/07/owl#> .\n<http://example.org/base/> a owl:Ontology .\n")
+    return tmp_path / "root.owl"
+
+
+def test_import_closure_uses_catalog(tmp_path):
+    root = _ontology(tmp_path)
+    assert import_closure(root) == [
+        (str(root), root),
+        ("http://example.org/base", tmp_path / "base.owl"),
+        ("http://example.org/missing", None),
+    ]
+
+
+def test_reasoner_runs_only_when_inputs_change(tmp_path):
+    root = _ontology(tmp_path)
+    output = tmp_path / "inferred.owl"
+    calls = []
+
+    def reason(path, out, **settings):
+        calls.append(settings)
+        out.write_text(f"inferred {len(calls)}")
+
+    cache = ReasonerCache(tmp_path / "cache")
+    settings = {"infer_property_values": True}
+    assert not cache.run(root, output, reason, "fake", settings)
+    output.unlink()
+    assert cache.run(root, output, reason, "fake", settings)
+    assert output.read_text() == "inferred 1" and len(calls) == 1
+
+    key = reasoning_key(root, "fake", settings)[0]
+    assert reasoning_key(root, "fake", {"infer_property_values": False})[0] != key
+    assert not cache.run(root, output, reason, "fake", {"infer_property_values": False})
+
+    # Editing an imported file invalidates the entry
+    with open(tmp_path / "base.owl", "a") as f:
+        f.write("<http://example.org/A> a owl:Class .\n")
+    assert reasoning_key(root, "fake", settings)[0] != key
+    assert not cache.run(root, output, reason, "fake", settings)
+    assert output.read_text() == "inferred 3"
+    assert (cache.hits, cache.misses) == (1, 3)
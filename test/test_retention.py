@@ -0,0 +1,70 @@
+import rdflib
+from rdflib.namespace import RDF
+
+from graph_manager.main import SOSA, GraphManager
+from graph_manager.journal import replay_journal
+from graph_manager.retention import epoch_seconds, load_archive
+from graph_manager.synthetic import FleetGenerator
+
+
+def _fleet(seed=3):
+    gm = GraphManager()
+    generator = FleetGenerator(gm, seed=seed)
+    gm.graph.addN((s, p, o, gm.graph) for s, p, o in generator.static_triples())
+    return gm, generator
+
+
+def test_evicted_observations_are_archived(tmp_path):
+    full, generator = _fleet()
+    full.add_observations(generator.records(500))
+
+    gm, generator = _fleet()
+    static = set(gm.graph)
+    gm.enable_retention(max_observations=100, archive_dir=tmp_path)
+    for batch in generator.batches(500, 50):
+        gm.add_observations(batch)
+
+    assert len(list(gm.graph.subjects(RDF.type, gm.ORKA.Observation))) == 100
+    assert len(list(gm.graph.subjects(RDF.type, gm.ORKA.Result))) == 100
+    assert static <= set(gm.graph)
+    assert gm.retention.evicted == 400
+
+    archived = load_archive(tmp_path)
+    assert len(list(archived.subjects(RDF.type, gm.ORKA.Observation))) == 400
+    assert set(gm.graph) | set(archived) == set(full.graph)
+    assert not set(gm.graph) & set(archived)
+
+
+def test_max_age_keeps_recent_observations():
+    gm, generator = _fleet()
+    gm.enable_retention(max_age=60)
+    gm.add_observations(generator.records(1000))
+    times = [epoch_seconds(t) for t in gm.graph.objects(None, SOSA.resultTime)]
+    assert times and max(times) - min(times) <= 60
+    assert len(times) == len(gm.retention)
+
+
+def test_max_triples_bounds_graph_and_journal(tmp_path):
+    gm, generator = _fleet()
+    static = set(gm.graph)
+    gm.enable_journal(tmp_path / "session.nq")
+    gm.enable_reasoning()
+    gm.enable_retention(max_triples=3000)
+    for batch in generator.batches(1000, 100):
+        gm.add_observations(batch)
+    gm.close_journal()
+
+    assert 2900 < len(gm.graph) <= 3000
+    assert set(replay_journal(tmp_path / "session.nq")) == set(gm.graph) - static
+    nodes = set(gm.graph.subjects()) | set(gm.graph.objects())
+    assert all(s in nodes for s in gm.inferred.subjects())
+
+
+def test_existing_observations_are_indexed():
+    gm = GraphManager()
+    for i in range(10):
+        gm.update_graph_with_observation(f"obs_{i}", f"meas_{i}", "sensor", f"res_{i}", timestamp=1000 + i)
+    gm.enable_retention(max_observations=4)
+    remaining = sorted(str(o) for o in gm.graph.subjects(RDF.type, gm.ORKA.Observation))
+    assert remaining == [str(gm.obs_graph_base[f"obs_{i}"]) for i in range(6, 10)]
+    assert (gm.obs_graph_base["meas_0"], None, None) not in gm.graph
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "evaluation" / "use-case"))
+
+from segmentation import segment_images  # noqa: E402
+
+
+class FakeRunner:
+    """One instance per image covering the rows whose brightness matches the image id."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, images):
+        self.batches.append(len(images))
+        outputs = []
+        for image in images:
+            value = image[0, 0, 0]
+            soft = (image[:, :, 1] == value).astype(np.float32)[None, None]
+            outputs.append({
+                "scores": np.array([0.9, 0.3], dtype=np.float32),
+                "labels": np.array([53, 55]),
+                "boxes": np.zeros((2, 4), dtype=np.float32),
+                "masks": np.concatenate([soft, soft]),
+            })
+        return outputs
+
+
+def _image(i):
+    image = np.zeros((8, 6, 3), dtype=np.uint8)
+    image[:, :, 0] = i
+    image[: i % 8 + 1, :, 1] = i
+    return image
+
+
+def test_batches_stream_in_input_order(tmp_path):
+    Image.fromarray(_image(3)).save(tmp_path / "frame.png")
+    consumed = []
+
+    def frames():
+        yield tmp_path / "frame.png"
+        for i in range(4, 34):
+            consumed.append(i)
+            yield _image(i)
+
+    runner = FakeRunner()
+    results = segment_images(frames(), threshold=0.5, batch_size=4, workers=3, runner=runner)
+    first = next(results)
+    # The input is read at most two batches ahead of the results
+    assert len(consumed) < 3 * 4
+    rest = list(results)
+
+    assert runner.batches == [4] * 7 + [3]
+    assert [seg.index for seg in [first] + rest] == list(range(31))
+    for i, seg in enumerate([first] + rest, start=3):
+        assert seg.labels == ["apple"] and seg.masks.shape == (1, 8, 6)
+        assert seg.masks[0].sum() == (i % 8 + 1) * 6
@@ -0,0 +1,208 @@
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+USE_CASE = Path(__file__).resolve().parent.parent / "evaluation" / "use-case"
+sys.path.insert(0, str(USE_CASE))
+
+from sparql_client import SparqlClient, SparqlError, items_query, normalize_query  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent / "data" / "wikidata-colors.json"
+
+
+class _Endpoint(ThreadingHTTPServer):
+    """Stand-in SPARQL endpoint answering with the canned color results."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        with open(FIXTURE) as f:
+            self.canned = json.load(f)
+        self.queries = []
+        self.connections = set()
+        self.failures = []  # statuses to answer with before succeeding; "truncated" is a bad 200
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/sparql"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        query = parse_qs(urlsplit(self.path).query)["query"][0]
+        with server.lock:
+            server.queries.append(query)
+            server.connections.add(self.client_address)
+            status = server.failures.pop(0) if server.failures else 200
+        time.sleep(server.delay)
+        if status == "truncated":
+            status, body = 200, b'{"head": {"vars": '
+        elif status != 200:
+            body = b"busy"
+        else:
+            rows = server.canned["results"]["bindings"]
+            page = re.search(r"LIMIT (\d+) OFFSET (\d+)\s*$", query)
+            if page:
+                limit, offset = int(page.group(1)), int(page.group(2))
+                rows = rows[offset:offset + limit]
+            body = json.dumps({"head": server.canned["head"], "results": {"bindings": rows}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def endpoint():
+    server = _Endpoint()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(endpoint, tmp_path, monkeypatch):
+    monkeypatch.delenv("ORKA_OFFLINE", raising=False)
+    with SparqlClient(endpoint.url, cache_dir=tmp_path, backoff=0.01, rate=None) as client:
+        yield client
+
+
+def test_normalize_query():
+    a = """
+    PREFIX ex: <http://example.org/ns#>
+    SELECT ?x WHERE {   # all things
+      ?x ex:label "a # b" .
+    }
+    """
+    b = 'PREFIX ex: <http://example.org/ns#> SELECT ?x WHERE { ?x ex:label "a # b" . }'
+    assert normalize_query(a) == b
+    assert normalize_query("FILTER(?a < 3) # c") == "FILTER(?a < 3)"
+
+
+def test_normalize_query_keeps_literals():
+    assert normalize_query('?c rdfs:label "dark  red" .') == '?c rdfs:label "dark  red" .'
+    assert normalize_query('?c rdfs:label "dark  red"') != normalize_query('?c rdfs:label "dark red"')
+    assert normalize_query("FILTER(?l = 'a\tb'   )") == "FILTER(?l = 'a\tb' )"
+    # An escaped backslash does not escape the closing quote
+    assert normalize_query('?x ex:p "a\\\\"   .  # c\n ?y  ex:q "b" .') == '?x ex:p "a\\\\" . ?y ex:q "b" .'
+    assert normalize_query('?x ex:p "say \\"hi  # there\\""  # c') == '?x ex:p "say \\"hi  # there\\""'
+
+
+def test_success_is_not_retried(client, endpoint):
+    rows = client.bindings(items_query("Q1075"))
+    assert len(rows) == len(endpoint.canned["results"]["bindings"])
+    assert len(endpoint.queries) == 1 and client.requests == 1
+
+
+def test_cache_by_normalized_query(client, endpoint, tmp_path):
+    query = items_query("Q1075")
+    first = client.query(query)
+    assert client.query("  " + query.replace("\n", "\n   ") + "# again") == first
+    assert len(endpoint.queries) == 1 and client.cache_hits == 1
+    client.query(query, refresh=True)
+    assert len(endpoint.queries) == 2
+    # A new client reuses the cache on disk
+    with SparqlClient(endpoint.url, cache_dir=tmp_path, rate=None) as other:
+        assert other.query(query) == first and other.requests == 0
+
+
+def test_offline_uses_cache_only(client, endpoint, monkeypatch):
+    client.query(items_query("Q1075"))
+    monkeypatch.setenv("ORKA_OFFLINE", "1")
+    client.query(items_query("Q1075"))
+    with pytest.raises(SparqlError):
+        client.query(items_query("Q5"))
+    assert len(endpoint.queries) == 1
+
+
+def test_backoff_on_failure_only(client, endpoint):
+    endpoint.failures = [503, 429]
+    assert client.bindings(items_query("Q1075"))
+    assert len(endpoint.queries) == 3
+
+    endpoint.failures = [400]
+    with pytest.raises(SparqlError) as e:
+        client.query(items_query("Q5"))
+    assert e.value.status == 400 and len(endpoint.queries) == 4
+
+    client.retries = 2
+    endpoint.failures = [500, 500, 500]
+    with pytest.raises(SparqlError) as e:
+        client.query(items_query("Q6"))
+    assert e.value.status == 500 and len(endpoint.queries) == 6
+
+
+def test_invalid_json_is_retried(client, endpoint):
+    endpoint.failures = ["truncated"]
+    assert client.bindings(items_query("Q1075"))
+    assert len(endpoint.queries) == 2
+
+    client.retries = 2
+    endpoint.failures = ["truncated", "truncated"]
+    with pytest.raises(SparqlError) as e:
+        client.query(items_query("Q5"))
+    assert e.value.status == 200 and len(endpoint.queries) == 4
+    assert client.cache.get(client.endpoint, items_query("Q5"), client.max_age) is None
+
+
+def test_connection_errors_are_retried(tmp_path, monkeypatch):
+    monkeypatch.delenv("ORKA_OFFLINE", raising=False)
+    client = SparqlClient("http://127.0.0.1:9/sparql", cache_dir=tmp_path, retries=2, backoff=0.01, timeout=1)
+    with pytest.raises(SparqlError) as e:
+        client.query(items_query("Q1075"))
+    assert e.value.status is None and client.requests == 0
+
+
+def test_connections_are_reused(client, endpoint):
+    for i in range(5):
+        client.query(items_query(f"Q{i}"))
+    assert len(endpoint.queries) == 5
+    assert len(endpoint.connections) == 1
+
+
+def test_paginate(client, endpoint):
+    rows = list(client.paginate("SELECT ?color WHERE { ?color ?p ?o } ORDER BY ?color", page_size=7))
+    assert rows == endpoint.canned["results"]["bindings"]
+    total = len(rows)
+    assert len(endpoint.queries) == total // 7 + 1
+    assert list(client.paginate("SELECT ?color WHERE { ?color ?p ?o }", page_size=7, max_pages=1)) == rows[:7]
+    with pytest.raises(ValueError):
+        next(client.paginate(items_query("Q1075")))
+
+
+def test_map_runs_concurrently(client, endpoint):
+    endpoint.delay = 0.1
+    queries = [items_query(f"Q{i}") for i in range(8)]
+    start = time.perf_counter()
+    results = client.map(queries, workers=8)
+    elapsed = time.perf_counter() - start
+    assert len(results) == 8 and sorted(endpoint.queries) == sorted(queries)
+    assert elapsed < 0.5
+
+
+def test_rate_limit(endpoint, tmp_path, monkeypatch):
+    monkeypatch.delenv("ORKA_OFFLINE", raising=False)
+    with SparqlClient(endpoint.url, cache_dir=tmp_path, rate=20) as client:
+        start = time.perf_counter()
+        client.map([items_query(f"Q{i}") for i in range(6)], workers=6)
+        # Six requests at most 20 per second are spread over at least 0.25 s
+        assert time.perf_counter() - start >= 0.24
@@ -0,0 +1,142 @@
+import datetime
+
+import pytest
+import rdflib
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import XSD
+
+from graph_manager.main import GraphManager
+from graph_manager.sqlite_store import decode_term, encode_term
+from graph_manager.synthetic import FleetGenerator
+
+
+def test_terms_round_trip():
+    terms = [
+        URIRef("http://example.org/a"),
+        BNode("b1"),
+        Literal("plain"),
+        Literal("line one\nline two \"quoted\""),
+        Literal("Farbe", lang="de"),
+        Literal(3),
+        Literal(0.25),
+        Literal(datetime.datetime(2024, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)),
+        Literal("x", datatype=XSD.string),
+    ]
+    for term in terms:
+        decoded = decode_term(encode_term(term))
+        assert decoded == term and type(decoded) is type(term)
+
+
+def test_sqlite_manager_matches_memory(tmp_path):
+    path = tmp_path / "observations.sqlite"
+    memory = GraphManager()
+    disk = GraphManager(store="SQLite", store_path=path)
+    for gm in (memory, disk):
+        FleetGenerator(gm, seed=1).populate(300, batch_size=100)
+        gm.update_graph_with_observation("obs_x", "meas_x", "sensor_x", "res_x", entity_name="ent", characteristic_name="size", value=1.5, timestamp=1700000000)
+        gm.graph.add((gm.obs_graph_base["obs_x"], gm.ORKA.hasValue, Literal(1.5)))
+
+    assert len(disk.graph) == len(memory.graph)
+    assert set(disk.graph) == set(memory.graph)
+    query = "SELECT ?s ?v WHERE { ?s orka:hasResult/orka:hasValue ?v } ORDER BY ?s"
+    assert list(disk.query(query)) == list(memory.query(query))
+
+    disk.graph.remove((None, memory.ORKA.hasValue, None))
+    memory.graph.remove((None, memory.ORKA.hasValue, None))
+    assert len(disk.graph) == len(memory.graph)
+    disk.close()
+
+    reopened = GraphManager(store="SQLite", store_path=path)
+    assert set(reopened.graph) == set(memory.graph)
+    assert dict(reopened.graph.namespaces())["orka"] == URIRef(str(reopened.ORKA))
+    reopened.close()
+
+
+def test_sqlite_manager_requires_path():
+    with pytest.raises(ValueError, match="requires store_path"):
+        GraphManager(store="SQLite")
+
+
+def test_sqlite_store_feeds_journal(tmp_path):
+    gm = GraphManager(store="SQLite", store_path=tmp_path / "observations.sqlite")
+    gm.enable_journal(tmp_path / "observations.nq")
+    FleetGenerator(gm).populate(20)
+    gm.close()
+
+    replayed = rdflib.Graph()
+    replayed.parse(tmp_path / "observations.nq", format="nquads")
+    reopened = GraphManager(store="SQLite", store_path=tmp_path / "observations.sqlite")
+    assert len(replayed) == len(reopened.graph)
+    reopened.close()
+
+
+def _store_graph(path):
+    graph = rdflib.Graph(store="SQLite")
+    graph.open(str(path), create=True)
+    return graph
+
+
+def test_events_only_for_new_triples(tmp_path):
+    from rdflib.store import TripleAddedEvent
+
+    graph = _store_graph(tmp_path / "g.sqlite")
+    added = []
+    graph.store.dispatcher.subscribe(TripleAddedEvent, lambda event: added.append(event.triple))
+    a, b = URIRef("http://example.org/a"), URIRef("http://example.org/b")
+    graph.addN([(a, a, b, graph), (a, a, b, graph), (b, a, a, graph)])
+    graph.addN([(a, a, b, graph)])
+    graph.add((a, a, b))
+    assert added == [(a, a, b), (b, a, a)]
+    assert len(graph) == 2
+    graph.close()
+
+
+def test_failed_addn_dispatches_nothing(tmp_path):
+    from rdflib.store import TripleAddedEvent
+
+    graph = _store_graph(tmp_path / "g.sqlite")
+    added = []
+    graph.store.dispatcher.subscribe(TripleAddedEvent, lambda event: added.append(event.triple))
+    a = URIRef("http://example.org/a")
+
+    def quads():
+        yield a, a, a, graph
+        raise RuntimeError("broken input")
+
+    try:
+        graph.addN(quads())
+    except RuntimeError:
+        pass
+    assert added == [] and len(graph) == 0 and set(graph) == set()
+    graph.close()
+
+
+def test_single_adds_are_committed(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "g.sqlite"
+    graph = _store_graph(path)
+    a = URIRef("http://example.org/a")
+    graph.add((a, a, Literal(1)))
+    # Another connection sees the write without commit() or close()
+    assert sqlite3.connect(str(path)).execute("SELECT COUNT(*) FROM triples").fetchone()[0] == 1
+    graph.close()
+
+
+def test_concurrent_writers(tmp_path):
+    import threading
+
+    graph = _store_graph(tmp_path / "g.sqlite")
+    base = "http://example.org/"
+
+    def write(thread):
+        for i in range(200):
+            graph.add((URIRef(f"{base}t{thread}"), URIRef(f"{base}p"), Literal(i)))
+
+    threads = [threading.Thread(target=write, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(graph) == 800 == len(set(graph))
+    graph.close()
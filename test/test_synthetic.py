@@ -0,0 +1,52 @@
+import datetime
+
+import rdflib
+
+from graph_manager.main import SOSA, GraphManager
+from graph_manager.synthetic import CHARACTERISTIC_PROFILES, FleetGenerator
+
+
+def test_stream_is_deterministic_and_ordered():
+    gm = GraphManager()
+    first = list(FleetGenerator(gm, seed=7).records(500))
+    second = list(FleetGenerator(gm, seed=7).records(500))
+    other = list(FleetGenerator(gm, seed=8).records(500))
+
+    assert first == second
+    assert first != other
+    timestamps = [r["timestamp"] for r in first]
+    assert timestamps == sorted(timestamps)
+    assert len({r["sensor"] for r in first}) == 8
+    for record in first:
+        _, _, low, high = CHARACTERISTIC_PROFILES[record["characteristic_name"]]
+        assert low <= record["value"] <= high
+
+
+def test_fleet_uses_ontology_classes():
+    gm = GraphManager()
+    generator = FleetGenerator(gm, robots=3, sensors_per_robot=2, entities=5)
+    sensors = gm.closure.subclasses(SOSA.Sensor)
+    assert len(generator.sensors) == 6
+    assert all(cls in sensors for _, cls, _, _, _ in generator.sensors)
+    assert all(cls in gm.closure.subclasses(gm.ORKA.PhysicalEntity) for _, cls in generator.entities)
+
+
+def test_populate_matches_ntriples(tmp_path):
+    gm = GraphManager()
+    generator = FleetGenerator(gm, seed=3)
+    assert generator.populate(250, batch_size=100) == 250
+
+    path = tmp_path / "fleet.nt"
+    count = FleetGenerator(GraphManager(), seed=3).write_ntriples(path, 250, batch_size=100)
+    written = rdflib.Graph()
+    written.parse(path, format="nt")
+    assert set(written) == set(gm.graph)
+    # No triple is written twice
+    lines = path.read_text(encoding="utf-8").count("\n")
+    assert lines == count == len(written)
+
+    observation = gm.obs_graph_base["syn_obs_0"]
+    timestamp = gm.graph.value(observation, SOSA.resultTime)
+    assert isinstance(timestamp.toPython(), datetime.datetime)
+    result = gm.obs_graph_base["syn_res_0"]
+    assert isinstance(gm.graph.value(result, gm.ORKA.hasValue).toPython(), float)
@@ -0,0 +1,96 @@
+import datetime
+
+from rdflib import Literal
+
+from graph_manager.main import GraphManager
+from graph_manager.retention import epoch_seconds
+from graph_manager.synthetic import FleetGenerator
+
+LATEST = """
+    SELECT ?obs ?t WHERE {
+      ?obs orka:ofEntity ?entity ; sosa:resultTime ?t .
+    } ORDER BY DESC(?t) LIMIT 1"""
+
+BETWEEN = """
+    SELECT ?obs WHERE {
+      ?obs orka:hasMeasurement/orka:madeBySensor ?sensor ; sosa:resultTime ?t .
+      FILTER (?t >= ?start && ?t <= ?end)
+    }"""
+
+
+def _fleet():
+    gm = GraphManager()
+    generator = FleetGenerator(gm, seed=7)
+    generator.populate(2000, batch_size=250)
+    return gm, generator
+
+
+def test_index_agrees_with_sparql():
+    gm, generator = _fleet()
+    entity = gm.obs_graph_base[generator.entities[3][0]]
+    (obs, t), = gm.query(LATEST, initBindings={"entity": entity})
+    latest = gm.latest_observation(entity=entity)
+    assert latest.observation == obs and latest.time == epoch_seconds(t)
+
+    sensor = generator.sensors[1][0]
+    start = generator.start + datetime.timedelta(seconds=2)
+    end = start + datetime.timedelta(seconds=3)
+    bindings = {"sensor": gm.obs_graph_base[sensor], "start": Literal(start), "end": Literal(end)}
+    expected = {row[0] for row in gm.query(BETWEEN, initBindings=bindings)}
+    found = gm.observations_between(start, end, sensor=sensor)
+    assert expected and {u.observation for u in found} == expected
+    assert [u.time for u in found] == sorted(u.time for u in found)
+
+
+def test_index_follows_new_and_evicted_observations():
+    gm, generator = _fleet()
+    sensor = generator.sensors[0][0]
+    before = gm.latest_observation(sensor=sensor)
+
+    gm.update_graph_with_observation("late", "late_m", sensor, "late_r", timestamp=before.time - 0.5)
+    gm.update_graph_with_observation("new", "new_m", sensor, "new_r", entity_name="fresh")
+    assert gm.latest_observation(sensor=sensor).observation == gm.obs_graph_base["new"]
+    assert gm.latest_observation(entity="fresh").observation == gm.obs_graph_base["new"]
+    since = [u.observation for u in gm.observations_since(before.time - 1, sensor=sensor)]
+    assert since[-2:] == [before.observation, gm.obs_graph_base["new"]]
+    assert gm.obs_graph_base["late"] in since[:-2]
+
+    gm.enable_retention(max_observations=10)
+    for name, *_ in generator.sensors:
+        for unit in gm.observations_between(sensor=name):
+            assert (unit.observation, None, None) in gm.graph
+    assert sum(len(gm.observations_between(entity=name)) for name, _ in generator.entities) < 10
+
+
+CURRENT = """
+    SELECT ?entity ?char ?value WHERE {
+      ?obs orka:ofEntity ?entity ; sosa:resultTime ?t ;
+           orka:hasMeasurement ?m .
+      ?m orka:ofCharacteristic ?char ; orka:hasResult/orka:hasValue ?value .
+      FILTER NOT EXISTS {
+        ?newer orka:ofEntity ?entity ; sosa:resultTime ?t2 ;
+               orka:hasMeasurement/orka:ofCharacteristic ?char .
+        FILTER (?t2 > ?t)
+      }
+    }"""
+
+
+def test_current_values_agree_with_sparql():
+    gm = GraphManager()
+    generator = FleetGenerator(gm, entities=5, seed=11)
+    generator.populate(300)
+    expected = {(e, c): v.toPython() for e, c, v in gm.query(CURRENT)}
+    assert len(expected) > 5
+
+    for (entity, characteristic), value in expected.items():
+        assert gm.current_value(entity, characteristic) == value
+    assert (gm.latest.hits, gm.latest.misses) == (len(expected), 0)
+
+    # Later observations replace the cached result directly
+    entity, characteristic = next(iter(expected))
+    gm.update_graph_with_observation("obs_new", "meas_new", "sensor", "res_new", entity_name=entity,
+                                     characteristic_name=characteristic, value=-1.0)
+    assert gm.current_result(entity, characteristic).unit.result == gm.obs_graph_base["res_new"]
+    assert dict(((e, c), v.toPython()) for e, c, v in gm.query(CURRENT))[(entity, characteristic)] == -1.0
+    assert gm.current_value(entity, "no_such_characteristic") is None
+    assert gm.latest.misses == 1
@@ -1,4 +1,8 @@
-import requests
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "evaluation" / "use-case"))
+from sparql_client import SparqlClient, SparqlError  # noqa: E402
 
 # Define the SPARQL query
 query = """
@@ -12,23 +16,16 @@ SELECT ?entity ?entityLabel WHERE {
 }
 """
 
-# Specify the URL of the Wikidata Query Service
-url = 'https://query.wikidata.org/sparql'
-
-# Set the headers to accept JSON format
-headers = {
-    'Accept': 'application/sparql-results+json'
-}
+# Wikidata Query Service client with a timeout, retries on failure and an on-disk cache
+client = SparqlClient(timeout=60)
 
 # Send the request
-response = requests.get(url, headers=headers, params={'query': query, 'format': 'json'})
-
-# Check if the request was successful
-if response.ok:
-    data = response.json()
+try:
+    data = client.query(query)
+except SparqlError as e:
+    print("Failed to fetch data: {}".format(e))
+else:
     entities = [(result['entity']['value'], result['entityLabel']['value'])
                 for result in data['results']['bindings']]
     for entity in entities:
         print(f"Entity: {entity[0]}, Label: {entity[1]}")
-else:
-    print("Failed to fetch data")